@@ -0,0 +1,242 @@
+"""
+factor 선택/가중치 비교 (what-if)
+
+같은 명단에 대해 factor 조합·가중치만 바꾼 여러 변형을 프로세스 풀에서 동시에 배정하고
+변형별 실패 좌석 수, 방 유사도(평균/최소), 실행 시간을 비교합니다.
+모든 변형은 같은 난수 시드로 실행하므로 결과 차이는 factor 선택에서만 생깁니다.
+
+변형 문자열 형식 (parse_variant_spec):
+    "factor1, factor2*2, factor3*0.5"   ← factor 이름 뒤 *숫자는 가중치 (생략 시 1)
+    ""                                  ← 유사도 미사용
+"""
+import concurrent.futures
+import importlib
+import os
+import random as rd
+import time
+
+import numpy as np
+
+from result_io import rooms_to_matrix
+from similarity_engine import room_pair_similarities
+
+# 배정 정책 → 엔진 모듈
+ENGINE_MODULES = {
+    "regular": "allocation_engine",
+    "third_grade": "allocation_engine_third_grade",
+}
+
+DEFAULT_SEED = 0
+
+# 작업 프로세스마다 한 번만 전달받아 두는 명단 (변형마다 명단을 다시 보내지 않음)
+_worker_roster = None
+
+
+def parse_variant_spec(spec):
+    """
+    변형 문자열을 (factor 리스트, 가중치 딕셔너리)로 변환
+
+    Args:
+        spec: "factor1, factor2*2" 형식 문자열
+
+    Returns:
+        tuple: (selected_factors, factor_weights) - 가중치가 모두 1이면 factor_weights는 None
+    """
+    factors = []
+    weights = {}
+    for token in str(spec).replace(";", ",").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        name, _, weight = token.partition("*")
+        name = name.strip()
+        try:
+            weight = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise ValueError(f"가중치가 숫자가 아닙니다: {token}")
+        if weight < 0:
+            raise ValueError(f"가중치는 0 이상이어야 합니다: {token}")
+        if name not in factors:
+            factors.append(name)
+        weights[name] = weight
+
+    if all(w == 1.0 for w in weights.values()):
+        weights = None
+    return factors, weights
+
+
+def format_variant_spec(selected_factors, factor_weights=None):
+    """(factor 리스트, 가중치) → 변형 문자열 (parse_variant_spec의 반대 - 가중치는 자릿수 손실 없이 기록)"""
+    parts = []
+    for name in selected_factors or []:
+        weight = float((factor_weights or {}).get(name, 1.0))
+        if weight == 1.0:
+            parts.append(name)
+        else:
+            # 짧게 쓸 수 있으면 2, 0.5처럼, 아니면 repr로 (1.2345678이 1.23457로 바뀌지 않도록)
+            text = f"{weight:g}"
+            parts.append(f"{name}*{text if float(text) == weight else repr(weight)}")
+    return ", ".join(parts)
+
+
+def evaluate_rooms(roster, room_id, evaluation_factors):
+    """
+    배정 결과의 방 유사도 평균/최소 계산 (모든 변형을 같은 factor 기준으로 평가)
+
+    Returns:
+        tuple: (평균 방 유사도, 최소 방 유사도) - 평가할 factor나 방이 없으면 (nan, nan)
+    """
+    used_factors, feature_matrix = roster.factor_matrix(evaluation_factors)
+    if not used_factors:
+        return float("nan"), float("nan")
+
+    matrix = rooms_to_matrix(room_id)
+    member_rows = roster.indices_of(matrix)
+    member_rows[matrix == 0] = -1
+    similarities = room_pair_similarities(feature_matrix, member_rows)
+    similarities = similarities[~np.isnan(similarities)]
+    if len(similarities) == 0:
+        return float("nan"), float("nan")
+    return float(similarities.mean()), float(similarities.min())
+
+
+def _init_worker(roster):
+    global _worker_roster
+    _worker_roster = roster
+
+
+def run_variant(policy, spec, blacklist_pairs=None, seed=DEFAULT_SEED, evaluation_factors=None, roster=None,
+                progress_callback=None, cancel_token=None, history_pairs=None, selected_factors=None,
+                factor_weights=None):
+    """
+    변형 하나를 배정하고 비교 지표 계산 (프로세스 풀 작업 함수)
+
+    Args:
+        policy: "regular" 또는 "third_grade"
+        spec: 변형 문자열
+        blacklist_pairs: 블랙리스트 조합 리스트
+        seed: 난수 시드
+        evaluation_factors: 방 유사도 평가에 사용할 factor 리스트
+        roster: CompiledRoster (None이면 작업 프로세스에 전달된 명단 사용)
+        progress_callback: 엔진 진행 보고 함수 (allocate_rooms와 같음)
+        cancel_token: 엔진 취소 토큰 (allocate_rooms와 같음)
+        history_pairs: 지난 학기 룸메이트 조합 배열 (allocate_rooms와 같음)
+        selected_factors: 이미 정한 factor 리스트 (주면 spec은 표시용으로만 쓰고 다시 파싱하지 않음)
+        factor_weights: selected_factors와 함께 쓰는 factor별 가중치 dict
+
+    Returns:
+        dict: spec, factors, weights, seed, room_id, failed_students, failed, mean_similarity,
+              min_similarity, seconds
+    """
+    roster = roster if roster is not None else _worker_roster
+    engine = importlib.import_module(ENGINE_MODULES[policy])
+    if selected_factors is None:
+        selected_factors, factor_weights = parse_variant_spec(spec)
+    else:
+        selected_factors = list(selected_factors)
+
+    start = time.perf_counter()
+    room_id, failed_students = engine.allocate_rooms(
+        roster,
+        blacklist_pairs,
+        selected_factors if selected_factors else None,
+        progress_callback=progress_callback,
+        cancel_token=cancel_token,
+        factor_weights=factor_weights,
+        rng=rd.Random(seed),
+        history_pairs=history_pairs
+    )
+    seconds = time.perf_counter() - start
+
+    mean_similarity, min_similarity = evaluate_rooms(roster, room_id, evaluation_factors)
+    return {
+        "spec": spec,
+        "factors": selected_factors,
+        "weights": factor_weights,
+        "seed": seed,
+        "room_id": room_id,
+        "failed_students": failed_students,
+        "failed": len(failed_students),
+        "mean_similarity": mean_similarity,
+        "min_similarity": min_similarity,
+        "seconds": seconds,
+    }
+
+
+def compare_variants(roster, specs, policy="regular", blacklist_pairs=None, seed=DEFAULT_SEED,
+                     evaluation_factors=None, max_workers=None, progress_callback=None, cancel_event=None,
+                     history_pairs=None):
+    """
+    여러 변형을 프로세스 풀에서 동시에 배정하여 비교
+
+    Args:
+        roster: CompiledRoster
+        specs: 변형 문자열 리스트
+        policy: "regular" 또는 "third_grade"
+        blacklist_pairs: 블랙리스트 조합 리스트 (모든 변형에 공통)
+        seed: 난수 시드 (모든 변형에 공통)
+        evaluation_factors: 방 유사도 평가 factor (None이면 모든 변형의 factor 합집합)
+        max_workers: 프로세스 수 (None이면 CPU 수와 변형 수 중 작은 값)
+        progress_callback: progress_callback(message, fraction)
+        cancel_event: 설정되면 아직 시작하지 않은 변형은 취소
+        history_pairs: 지난 학기 룸메이트 조합 배열 (모든 변형에 공통)
+
+    Returns:
+        list: 변형 순서대로 run_variant 결과
+            (취소되어 실행하지 않은 변형은 None, 오류가 난 변형은 {"spec", "error"} - 나머지 변형 결과는 그대로)
+    """
+    specs = list(specs)
+    if policy not in ENGINE_MODULES:
+        raise ValueError(f"알 수 없는 배정 정책입니다: {policy}")
+
+    if evaluation_factors is None:
+        evaluation_factors = []
+        for spec in specs:
+            for name in parse_variant_spec(spec)[0]:
+                if name not in evaluation_factors:
+                    evaluation_factors.append(name)
+
+    results = [None] * len(specs)
+    if not specs:
+        return results
+
+    if max_workers is None:
+        max_workers = min(len(specs), os.cpu_count() or 1)
+
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(roster,)
+    )
+    try:
+        futures = {
+            executor.submit(
+                run_variant, policy, spec, blacklist_pairs, seed, evaluation_factors, history_pairs=history_pairs
+            ): index
+            for index, spec in enumerate(specs)
+        }
+        done_count = 0
+        pending = set(futures)
+        while pending:
+            finished, pending = concurrent.futures.wait(
+                pending, timeout=0.2, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in finished:
+                index = futures[future]
+                if not future.cancelled():
+                    try:
+                        results[index] = future.result()
+                    except Exception as e:
+                        # 변형 하나가 실패해도 나머지 변형 결과는 살림
+                        results[index] = {"spec": specs[index], "error": f"{type(e).__name__}: {e}"}
+                done_count += 1
+                if progress_callback is not None:
+                    progress_callback(f"비교 중... {done_count}/{len(specs)}개 변형 완료", done_count / len(specs))
+
+            if cancel_event is not None and cancel_event.is_set():
+                for future in pending:
+                    future.cancel()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    return results
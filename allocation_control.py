@@ -0,0 +1,68 @@
+"""
+배정 실행 중 진행 상황 보고 및 취소를 위한 공용 도구
+
+배치 스크립트 예시:
+    token = CancellationToken()
+    room_id, failed = allocate_rooms(roster, progress_callback=print, cancel_token=token)
+    if token.cancelled:
+        ...  # 중간에 취소됨 - room_id에는 그때까지 채운 방만 들어 있음
+"""
+import threading
+import time
+
+# 진행 보고 최소 간격 (초) - 배정 루프가 느려지지 않도록 이보다 자주 호출하지 않음
+PROGRESS_INTERVAL_SEC = 0.1
+
+
+class CancellationToken:
+    """
+    배정 취소 요청 토큰 (다른 스레드에서 cancel()을 호출하면 엔진이 다음 방을 채우기 전에 중단)
+    threading.Event와 같은 is_set() 인터페이스를 제공하므로 Event를 그대로 넘겨도 됨
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """취소 요청"""
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def is_set(self):
+        return self._event.is_set()
+
+
+class ProgressReporter:
+    """
+    progress_callback 호출 빈도를 제한하는 래퍼
+    마지막 방(완료) 보고는 간격과 관계없이 항상 전달
+    """
+
+    def __init__(self, callback, min_interval=PROGRESS_INTERVAL_SEC):
+        self.callback = callback
+        self.min_interval = min_interval
+        self._last_time = None
+
+    def __call__(self, rooms_filled, total_rooms, students_remaining):
+        now = time.perf_counter()
+        if (
+            rooms_filled < total_rooms
+            and self._last_time is not None
+            and now - self._last_time < self.min_interval
+        ):
+            return
+        self._last_time = now
+        self.callback(rooms_filled, total_rooms, students_remaining)
+
+
+def format_eta(seconds):
+    """남은 시간(초)을 '약 1분 5초' 형태 문자열로 변환"""
+    if seconds is None:
+        return "계산 중"
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"약 {seconds}초"
+    return f"약 {seconds // 60}분 {seconds % 60}초"
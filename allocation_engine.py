@@ -1,219 +1,276 @@
+import itertools
 import random as rd
-import pandas as pd
 import numpy as np
-from similarity_engine import calculate_room_similarity_score, get_student_features
+from allocation_control import ProgressReporter
+from result_io import SEAT_NAMES, SEATS_PER_ROOM, matrix_to_rooms
+from roster import CompiledRoster, load_roster
+from similarity_cache import default_similarity_cache
+from similarity_engine import factor_weight_vector, room_similarity_scores
 
 
-def allocate_rooms(excel_file_path, blacklist_pairs=None, selected_factors=None):
+def allocate_rooms(excel_file_path, blacklist_pairs=None, selected_factors=None,
+                   progress_callback=None, cancel_token=None, factor_weights=None, rng=None,
+                   history_pairs=None, similarity_cache=None, phase_callback=None):
     """
     기숙사 방 배정 알고리즘
-    
+
     Args:
-        excel_file_path: xlsx 파일 경로
+        excel_file_path: xlsx 파일 경로 또는 미리 불러온 CompiledRoster
         blacklist_pairs: 블랙리스트 조합 리스트 [(학생1, 학생2), ...] - 이 학생들은 같은 방에 배정되지 않음
         selected_factors: 선택된 factor 컬럼 리스트 (예: ['factor1', 'factor2']) - None이면 유사도 미사용
-        
+        progress_callback: progress_callback(rooms_filled, total_rooms, students_remaining)
+            - 방을 채우는 동안 최대 PROGRESS_INTERVAL_SEC마다 한 번, 완료 시 한 번 호출
+        cancel_token: CancellationToken 또는 threading.Event
+            - 설정되면 다음 방을 채우기 전에 중단하고 그때까지의 결과를 반환
+        factor_weights: factor별 가중치 {factor: 가중치} - None이면 모든 factor 동일 가중치
+        rng: random.Random 인스턴스 - None이면 random 모듈의 전역 상태 사용
+            (여러 스레드에서 동시에 배정할 때 시드별 결과를 재현하려면 스레드마다 따로 전달)
+        history_pairs: 지난 학기 룸메이트 조합 (n x 2) 배열 - 블랙리스트처럼 같은 방에 배정되지 않음
+        similarity_cache: SimilarityCache - None이면 프로세스 공용 캐시 사용
+            (같은 명단·factor로 다시 배정하면 유사도 표를 다시 계산하지 않음)
+        phase_callback: phase_callback(phase) - 배정 단계가 바뀔 때 호출 (메모리/시간 측정용)
+            - "compile" (금지 관계·유사도 표 준비), "seed" (방마다 첫 학생), "fill" (나머지 좌석),
+              "optimize" (좌석 위치 재배치)
+
     Returns:
         tuple: (room_id, failed_students) - 방 배정 결과와 실패한 좌석 목록
+            (취소된 경우 채우지 못한 좌석은 빈자리로 남고 실패 목록에는 포함되지 않음)
     """
-    if blacklist_pairs is None:
-        blacklist_pairs = []
-    
-    # 블랙리스트를 집합으로 변환 (양방향 체크를 위해)
-    blacklist_set = set()
-    for pair in blacklist_pairs:
-        # 정렬하여 양방향 체크 가능하도록
-        sorted_pair = tuple(sorted(pair))
-        blacklist_set.add(sorted_pair)
-    
-    # 엑셀 파일 읽기
-    df = pd.read_excel(excel_file_path)
-    
-    # "학번" 컬럼에서 학생 ID 리스트 읽기
-    std_id = df["학번"].dropna().tolist()
-    std_id = [int(x) for x in std_id if pd.notna(x)]
-    rd.shuffle(std_id)
-
-    # ----- 배려 학생 컬럼 동적 감지 -----
-    # 예: "배려 학생 1", "배려 학생 2", ..., "배려 학생 5"
-    # 또는 사용자가 공백 없이 "배려학생1" 등으로 입력한 경우도 허용
-    avoid_columns = []
-    for col in df.columns:
-        normalized = str(col).replace(" ", "")
-        if normalized.startswith("배려학생"):
-            avoid_columns.append(col)
+    # 엑셀 파일 읽기 (이미 불러온 명단이면 그대로 사용)
+    if isinstance(excel_file_path, CompiledRoster):
+        roster = excel_file_path
+    else:
+        roster = load_roster(excel_file_path)
+
+    if phase_callback is not None:
+        phase_callback("compile")
+
+    # 같은 방 금지 관계 (현재 룸메이트 + 배려 학생 + 블랙리스트 + 룸메이트 기록, CSR)
+    # 방에 학생이 들어올 때마다 그 학생과 안 되는 후보를 blocked에 표시 → 후보 확인은 배열 조회 한 번
+    conflicts = roster.conflict_graph(blacklist_pairs, history_pairs)
+    blocked = np.zeros(roster.num_students, dtype=bool)
+
+    if rng is None:
+        rng = rd
+
+    # 학생 순서를 섞음 (명단의 행 번호 기준)
+    ids = roster.ids.tolist()
+    order = list(range(len(ids)))
+    rng.shuffle(order)
 
     # 방 개수 계산: len(std_id)/4 (나머지가 있으면 +1)
-    num_rooms = len(std_id) // 4
-    if len(std_id) % 4 != 0:
+    num_rooms = len(order) // 4
+    if len(order) % 4 != 0:
         num_rooms += 1
 
-    room_id = []
-    for _ in range(num_rooms):
-        room_id.append({"seat1": "", "seat2": "", "seat3": "", "seat4": ""})
-
-    # 유사도 계산에 사용할 factor 컬럼 확인
-    similarity_features = []
-    if selected_factors:
-        # 선택된 factor 컬럼들만 사용
-        for factor in selected_factors:
-            if factor in df.columns:
-                similarity_features.append(factor)
-    
-    hallway_seats = ["seat1", "seat4"]  # 1,4번
-    window_seats = ["seat2", "seat3"]  # 2,3번
-
-    for i in range(min(num_rooms, len(std_id))):
-        student = std_id[i]
-
-        prev_loc_row = df.loc[df["학번"] == student, "현재 좌석 번호"]
-        if prev_loc_row.empty:
-            prev_loc = 0
-        else:
-            prev_loc = prev_loc_row.values[0]
-            if pd.isna(prev_loc):
-                prev_loc = 0
-            else:
-                prev_loc = int(prev_loc)
-
-        # 이전에 복도(1,4) 라면 이번엔 창가(2,3)
-        if prev_loc in [1, 4]:
-            candidate_seats = window_seats
-
-        # 이전에 창가(2,3) 라면 이번엔 복도(1,4)
-        else:
-            candidate_seats = hallway_seats
-
-        assigned = False
-        for seat in candidate_seats:
-            if room_id[i][seat] == "":
-                room_id[i][seat] = student
-                assigned = True
-                break
-
-        # 예외 상황: 만약 candidate 좌석 다 차 있으면 아무 빈자리 fallback
-        if not assigned:
-            for seat in ["seat1", "seat2", "seat3", "seat4"]:
-                if room_id[i][seat] == "":
-                    room_id[i][seat] = student
-                    break
+    # 유사도 계산에 사용할 factor 값 행렬 (선택된 factor 컬럼들만 사용)
+    similarity_features, feature_matrix = roster.factor_matrix(selected_factors)
+    similarity_weights = factor_weight_vector(similarity_features, factor_weights)
+    similarity_table = None
+    if similarity_features:
+        if similarity_cache is None:
+            similarity_cache = default_similarity_cache()
+        similarity_table = similarity_cache.get(roster, similarity_features, feature_matrix, similarity_weights)
+
+    if phase_callback is not None:
+        phase_callback("seed")
+
+    # 방 별 구성원 (행 번호)
+    room_members = [[] for _ in range(num_rooms)]
+    taken = np.zeros(len(order), dtype=bool)
+
+    # 방마다 첫 학생 (좌석 위치는 방을 다 채운 뒤 arrange_seats에서 이전 좌석 번호 기준으로 정함)
+    for i in range(min(num_rooms, len(order))):
+        row = order[i]
+        room_members[i].append(row)
+        taken[row] = True
 
-    failed_students = []  # 배정 실패 좌석 기록
+    if phase_callback is not None:
+        phase_callback("fill")
 
-    # 이미 배정된 학생 목록
-    assigned = set()
-    for room in room_id:
-        for seat in room.values():
-            if seat != "":
-                assigned.add(seat)
+    failed_rooms = []  # 배정 실패 좌석이 생긴 방 번호 (좌석 이름은 좌석 배치 후 빈자리로 정함)
 
-    # 아직 배정 안된넘들
-    remaining = [s for s in std_id if s not in assigned]
+    # 아직 배정 안된넘들 (섞인 순서 유지, 배정되면 taken 표시만 하고 주기적으로 정리)
+    remaining = [row for row in order if not taken[row]]
+    head = 0  # remaining에서 처음으로 배정 안 된 학생 위치
+    dead = 0  # head 이후에 남아 있는 이미 배정된 학생 수
 
-    # 좌석 순서
-    seat_order = ["seat1", "seat2", "seat3", "seat4"]
+    # 진행 보고 빈도 제한 (콜백이 없으면 아무 비용도 들지 않음)
+    report_progress = ProgressReporter(progress_callback) if progress_callback is not None else None
 
     for room_idx in range(num_rooms):
-        room = room_id[room_idx]
+        # 취소 요청 확인 - 그때까지 채운 결과를 그대로 반환
+        if cancel_token is not None and cancel_token.is_set():
+            break
 
         # 현재 방에 있는 사람
-        current_members = [p for p in room.values() if p != ""]
-
-        # seat2 → seat3 → seat4 순서
-        for seat in seat_order:
-            if room[seat] != "":
-                continue  # 이미 할당된 자리면
-
-            assigned_flag = False
-
-            # 유사도 기반 배정을 위한 후보 학생 리스트
-            candidate_students = []
-            
-            # 배정 가능 여부 췤
-            for student in remaining:
-                row = df.loc[df["학번"] == student]
-                if row.empty:
-                    continue
-
-                # 현재 룸메이트 1~3 데이터 읽기
-                prev_list_raw = row[["현재 룸메이트 1", "현재 룸메이트 2", "현재 룸메이트 3"]].values[0]
-
-                # 배려 학생 1~5(또는 더 많은) 컬럼들을 모두 사용
-                if avoid_columns:
-                    avoid_list_raw = row[avoid_columns].values[0]
-                else:
-                    avoid_list_raw = []
-
-                # NaN/빈칸 제거 및 정수 변환
-                prev_list = [
-                    int(x)
-                    for x in prev_list_raw
-                    if not (pd.isna(x) or x == "" or x == 0)
-                ]
-                avoid_list = [
-                    int(x)
-                    for x in np.atleast_1d(avoid_list_raw)
-                    if not (pd.isna(x) or x == "" or x == 0)
-                ]
-
-                # 조건
-
-                # 같이 하기 싫은 애
-                avoid_conflict = any(a in current_members for a in avoid_list)
-                if avoid_conflict:
-                    continue
-
-                # 이전 룸메 회피
-                prev_conflict = any(p in current_members for p in prev_list)
-                if prev_conflict:
-                    continue
-                
-                # 블랙리스트 체크 - 현재 학생과 방의 다른 학생이 블랙리스트에 있는지 확인
-                blacklist_conflict = False
-                for member in current_members:
-                    pair = tuple(sorted([student, member]))
-                    if pair in blacklist_set:
-                        blacklist_conflict = True
-                        break
-                if blacklist_conflict:
-                    continue
-
-                # 조건을 만족하는 학생을 후보 리스트에 추가
-                candidate_students.append(student)
-            
-            # 후보 학생이 있으면 유사도 기반으로 선택
-            if candidate_students:
-                if similarity_features and current_members:
-                    # 방 구성원들의 특성 벡터 추출
-                    room_members_features = []
-                    for member in current_members:
-                        member_features = get_student_features(df, member, similarity_features)
-                        room_members_features.append(member_features)
-                    
-                    # 각 후보 학생의 유사도 점수 계산
-                    candidate_scores = []
-                    for candidate in candidate_students:
-                        candidate_features = get_student_features(df, candidate, similarity_features)
-                        similarity_score = calculate_room_similarity_score(room_members_features, candidate_features)
-                        candidate_scores.append((candidate, similarity_score))
-                    
-                    # 유사도 점수가 높은 순으로 정렬
-                    candidate_scores.sort(key=lambda x: x[1], reverse=True)
-                    selected_student = candidate_scores[0][0]
+        member_rows = room_members[room_idx]
+        blocked_parts = [conflicts.blocked_rows(ids[r]) for r in member_rows]
+        for rows in blocked_parts:
+            blocked[rows] = True
+
+        # 남은 자리 수만큼 한 명씩 선택
+        for _ in range(SEATS_PER_ROOM - len(member_rows)):
+            selected_pos = -1
+
+            if similarity_features and member_rows:
+                # 유사도 점수가 높은 순서대로 조건을 확인하여 첫 번째로 조건을 만족하는 학생 선택
+                # (점수가 같으면 remaining 순서가 앞선 학생)
+                positions = np.arange(head, len(remaining))
+                candidate_rows = np.asarray(remaining[head:], dtype=np.int64)
+                alive = ~taken[candidate_rows]
+                positions = positions[alive]
+                candidate_rows = candidate_rows[alive]
+
+                if similarity_table is not None:
+                    scores = similarity_table.room_scores(member_rows, candidate_rows)
                 else:
-                    # 유사도 기반 배정을 사용하지 않으면 첫 번째 후보 선택
-                    selected_student = candidate_students[0]
-                
-                # 배정
-                room[seat] = selected_student
-                assigned.add(selected_student)
-                remaining.remove(selected_student)
-                current_members.append(selected_student)
-                assigned_flag = True
+                    scores = room_similarity_scores(
+                        feature_matrix[member_rows], feature_matrix[candidate_rows], similarity_weights
+                    )
+                ranked = np.argsort(-scores, kind="stable")
+                allowed = ~blocked[candidate_rows[ranked]]
+                if allowed.any():
+                    selected_pos = int(positions[ranked[int(np.argmax(allowed))]])
+            else:
+                # 유사도 기반 배정을 사용하지 않으면 조건을 만족하는 첫 번째 후보 선택
+                for pos in range(head, len(remaining)):
+                    row = remaining[pos]
+                    if taken[row]:
+                        continue
+
+                    # 같이 하기 싫은 애 / 이전 룸메 / 블랙리스트 체크
+                    if blocked[row]:
+                        continue
+
+                    selected_pos = pos
+                    break
 
             # fail
-            if not assigned_flag:
-                failed_students.append(f"{room_idx+1}번방 {seat}")
+            if selected_pos < 0:
+                failed_rooms.append(room_idx)
+                continue
+
+            # 배정
+            selected_row = remaining[selected_pos]
+            taken[selected_row] = True
+            member_rows.append(selected_row)
+            rows = conflicts.blocked_rows(ids[selected_row])
+            blocked[rows] = True
+            blocked_parts.append(rows)
+
+            if selected_pos == head:
+                while head < len(remaining) and taken[remaining[head]]:
+                    head += 1
+                    if head < len(remaining) and taken[remaining[head]]:
+                        dead -= 1
+            else:
+                dead += 1
+                # 중간에 배정된 학생이 절반 이상 쌓이면 remaining 정리
+                if dead * 2 > len(remaining) - head:
+                    remaining = [r for r in remaining[head:] if not taken[r]]
+                    head = 0
+                    dead = 0
+
+        # 다음 방을 위해 금지 표시 지우기
+        for rows in blocked_parts:
+            blocked[rows] = False
+
+        # 진행 상황 보고 (채운 방 수, 전체 방 수, 아직 배정 안 된 학생 수)
+        if report_progress is not None:
+            report_progress(room_idx + 1, num_rooms, len(remaining) - head - dead)
+
+    if phase_callback is not None:
+        phase_callback("optimize")
+
+    # 방 구성원이 정해진 뒤 방 안의 좌석 위치를 이전 좌석 번호 기준으로 배치
+    room_id = arrange_seats(room_members, roster.ids, roster.seat_codes)
+    failed_students = [
+        f"{room_idx+1}번방 {seat}"
+        for room_idx in dict.fromkeys(failed_rooms)
+        for seat in SEAT_NAMES
+        if room_id[room_idx][seat] == ""
+    ]
 
     return room_id, failed_students
 
+
+# 좌석 재배치 순서: 복도(seat1, seat4) → 창가(seat2, seat3)
+SEAT_COLUMNS_BY_PREFERENCE = [0, 3, 1, 2]
+
+
+def seat_arrangement(previous_seats):
+    """
+    방마다 구성원을 앉힐 순서 (모든 방을 numpy로 한 번에 계산)
+
+    이전에 창가(2,3)였던 학생은 복도(1,4)로, 복도였던 학생은 창가로 가야 하므로
+    "복도로 갈 학생 → 이전 좌석 없음/빈자리 → 창가로 갈 학생" 순서로 정렬해
+    seat1, seat4, seat2, seat3에 차례로 앉힙니다. 복도로 갈 학생은 앞에서부터, 창가로 갈 학생은
+    뒤에서부터 채워지므로 방마다 min(복도로 갈 학생, 2) + min(창가로 갈 학생, 2)명 - 가능한 최대 인원이
+    좌석 교대를 지킵니다. 같은 조건의 학생끼리는 원래 순서를 유지합니다.
+
+    Args:
+        previous_seats: (방 수 x 4) 구성원별 이전 좌석 번호 (0=없음/빈자리)
+
+    Returns:
+        np.ndarray: (방 수 x 4) 열 순서 - arranged[:, SEAT_COLUMNS_BY_PREFERENCE] = take_along_axis(원래, 순서)
+    """
+    preference = np.ones(previous_seats.shape, dtype=np.int8)
+    preference[(previous_seats == 2) | (previous_seats == 3)] = 0  # 창가였음 → 복도로
+    preference[(previous_seats == 1) | (previous_seats == 4)] = 2  # 복도였음 → 창가로
+    return np.argsort(preference, axis=1, kind="stable")
+
+
+def arrange_seats(room_members, ids, seat_codes):
+    """
+    방 구성원(행 번호 리스트)을 좌석 교대를 최대한 지키도록 좌석에 앉힌 방 배정 결과 생성
+
+    Args:
+        room_members: 방별 구성원 행 번호 리스트 (들어온 순서)
+        ids: 학번 배열 (roster.ids)
+        seat_codes: 이전 좌석 번호 배열 (roster.seat_codes)
+
+    Returns:
+        list: 방 배정 결과 [{"seat1": 학번, ..., 빈자리는 ""}, ...]
+    """
+    num_rooms = len(room_members)
+    counts = np.fromiter(map(len, room_members), dtype=np.int64, count=num_rooms)
+    flat = np.fromiter(itertools.chain.from_iterable(room_members), dtype=np.int64, count=int(counts.sum()))
+
+    # (방 수 x 4) 구성원 행 번호 (-1=빈자리) - 방에 들어온 순서대로 앞 열부터
+    members = np.full((num_rooms, len(SEAT_NAMES)), -1, dtype=np.int64)
+    starts = np.cumsum(counts) - counts
+    members[np.repeat(np.arange(num_rooms), counts), np.arange(len(flat)) - np.repeat(starts, counts)] = flat
+
+    occupied = members >= 0
+    previous = np.zeros(members.shape, dtype=np.int8)
+    previous[occupied] = seat_codes[members[occupied]]
+
+    arranged = np.full(members.shape, -1, dtype=np.int64)
+    arranged[:, SEAT_COLUMNS_BY_PREFERENCE] = np.take_along_axis(members, seat_arrangement(previous), axis=1)
+
+    matrix = np.zeros(arranged.shape, dtype=np.int64)
+    matrix[arranged >= 0] = ids[arranged[arranged >= 0]]
+    return matrix_to_rooms(matrix)
+
+
+def allocate_sheets(rosters, blacklist_pairs=None, selected_factors=None, factor_weights=None, history_pairs=None):
+    """
+    여러 시트(학년)의 명단을 한 번에 배정 (load_workbook으로 한 번 읽은 명단을 그대로 사용)
+
+    Args:
+        rosters: {시트 이름: CompiledRoster} (roster.load_workbook 결과)
+        blacklist_pairs: 블랙리스트 조합 리스트 - 모든 시트에 공통 적용
+        selected_factors: 선택된 factor 컬럼 리스트 - 시트에 없는 factor는 무시
+        factor_weights: factor별 가중치 {factor: 가중치}
+        history_pairs: 지난 학기 룸메이트 조합 배열 - 모든 시트에 공통 적용
+
+    Returns:
+        dict: {시트 이름: (room_id, failed_students)}
+    """
+    results = {}
+    for sheet_name, roster in rosters.items():
+        results[sheet_name] = allocate_rooms(
+            roster, blacklist_pairs, selected_factors, factor_weights=factor_weights, history_pairs=history_pairs
+        )
+    return results
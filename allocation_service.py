@@ -0,0 +1,604 @@
+"""
+로컬 배정 서비스 (HTTP, 표준 라이브러리만 사용)
+
+여러 자리에서 같은 명단을 각자 다시 읽지 않도록, 한 PC에서 서비스를 띄워 두고
+명단 업로드 → 배정 작업 등록 → 진행 상황 확인 → 결과 다운로드를 HTTP로 처리합니다.
+업로드한 명단은 파일 내용의 해시로 캐시하므로 같은 파일을 다시 올리면 분석을 건너뜁니다.
+배정 작업은 크기가 정해진 대기열에 들어가고, 정해진 수의 작업 스레드가 차례로 실행합니다.
+
+실행:
+    python allocation_service.py --port 8765 --workers 2
+
+엔드포인트 (모든 응답은 JSON, 결과 다운로드 제외):
+    GET    /health                        서비스 상태 (대기/실행 중 작업 수, 캐시된 명단 수)
+    POST   /rosters?filename=명단.xlsx     본문 = 파일 내용 → {"roster_id", "cached", "sheets": [...]}
+    POST   /jobs                          본문 = {"roster_id", "sheet", "policy", "factors", "weights",
+                                                 "blacklist_pairs", "seed"} → 202 {"job_id", ...}
+    GET    /jobs/<job_id>                 상태 (queued/running/done/failed/cancelled)와 진행률
+    DELETE /jobs/<job_id>                 작업 취소 (실행 중이면 다음 방을 채우기 전에 중단)
+    GET    /jobs/<job_id>/result?format=  결과 다운로드 (csv, jsonl, parquet, json)
+
+GUI나 스크립트에서는 AllocationServiceClient로 같은 기능을 사용할 수 있습니다.
+"""
+import argparse
+import collections
+import hashlib
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from allocation_compare import DEFAULT_SEED, ENGINE_MODULES, format_variant_spec, parse_variant_spec
+from allocation_control import CancellationToken
+from cli import json_number
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+
+MAX_QUEUED_JOBS = 32  # 대기열이 가득 차면 503 응답
+MAX_CACHED_ROSTERS = 16  # 캐시할 명단 파일 수 (가장 오래 쓰지 않은 것부터 제거)
+MAX_KEPT_JOBS = 200  # 끝난 작업 기록 보관 수
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+
+ROSTER_EXTENSIONS = (".xlsx", ".xls", ".csv", ".parquet")
+
+RESULT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+    "parquet": "application/octet-stream",
+    "json": "application/json; charset=utf-8",
+}
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class ServiceError(Exception):
+    """HTTP 오류 응답으로 바꿔서 돌려줄 예외"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_default(value):
+    # numpy 정수/실수 등
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    raise TypeError(f"JSON으로 바꿀 수 없는 값입니다: {type(value)}")
+
+
+class RosterCache:
+    """파일 내용 해시(SHA-256) → {시트 이름: CompiledRoster} LRU 캐시"""
+
+    def __init__(self, max_entries=MAX_CACHED_ROSTERS):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, roster_id):
+        with self._lock:
+            rosters = self._entries.get(roster_id)
+            if rosters is not None:
+                self._entries.move_to_end(roster_id)
+            return rosters
+
+    def load(self, content, filename):
+        """
+        업로드된 파일 내용을 명단으로 분석 (같은 내용이면 캐시 사용)
+
+        Returns:
+            tuple: (roster_id, rosters, cached)
+        """
+        roster_id = hashlib.sha256(content).hexdigest()
+        rosters = self.get(roster_id)
+        if rosters is not None:
+            return roster_id, rosters, True
+
+        from roster import load_workbook
+
+        ext = os.path.splitext(filename)[1].lower() or ".xlsx"
+        if ext not in ROSTER_EXTENSIONS:
+            raise ServiceError(400, f"지원하지 않는 명단 파일 형식입니다: {ext}")
+
+        fd, temp_path = tempfile.mkstemp(suffix=ext)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            rosters = load_workbook(temp_path)
+        except ValueError as e:
+            raise ServiceError(400, str(e))
+        finally:
+            os.remove(temp_path)
+
+        for roster in rosters.values():
+            roster.source = filename
+
+        with self._lock:
+            self._entries[roster_id] = rosters
+            self._entries.move_to_end(roster_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return roster_id, rosters, False
+
+
+class Job:
+    """배정 작업 하나의 상태"""
+
+    def __init__(self, roster_id, sheet_name, roster, policy, selected_factors, factor_weights, blacklist_pairs, seed):
+        self.job_id = uuid.uuid4().hex
+        self.roster_id = roster_id
+        self.sheet_name = sheet_name
+        self.roster = roster
+        self.policy = policy
+        # 엔진에는 factor/가중치를 그대로 넘기고, 변형 문자열은 표시용으로만 사용
+        self.selected_factors = selected_factors
+        self.factor_weights = factor_weights
+        self.spec = format_variant_spec(selected_factors, factor_weights)
+        self.blacklist_pairs = blacklist_pairs
+        self.seed = seed
+
+        self.status = QUEUED
+        self.progress = {"rooms_filled": 0, "total_rooms": None, "students_remaining": None, "fraction": 0.0}
+        self.result = None
+        self.error = None
+        self.cancel_token = CancellationToken()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def on_progress(self, rooms_filled, total_rooms, students_remaining):
+        self.progress = {
+            "rooms_filled": rooms_filled,
+            "total_rooms": total_rooms,
+            "students_remaining": students_remaining,
+            "fraction": rooms_filled / total_rooms if total_rooms else 1.0,
+        }
+
+    def to_dict(self):
+        info = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "roster_id": self.roster_id,
+            "sheet": self.sheet_name,
+            "policy": self.policy,
+            "factors": self.spec,
+            "weights": self.factor_weights,
+            "seed": self.seed,
+            "progress": self.progress,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.error:
+            info["error"] = self.error
+        if self.result is not None:
+            info["result"] = {
+                "rooms": len(self.result["room_id"]),
+                "failed": self.result["failed"],
+                "failed_students": self.result["failed_students"],
+                # factor 없이 배정하면 NaN - 표준 JSON에는 NaN이 없으므로 null로 보냄
+                "mean_similarity": json_number(self.result["mean_similarity"]),
+                "min_similarity": json_number(self.result["min_similarity"]),
+                "seconds": self.result["seconds"],
+            }
+        return info
+
+
+class AllocationService:
+    """
+    명단 캐시 + 배정 작업 대기열 + 작업 스레드
+
+    Args:
+        workers: 동시에 실행할 배정 작업 수
+        max_queued_jobs: 대기열 크기 (가득 차면 새 작업 거절)
+        max_cached_rosters: 캐시할 명단 파일 수
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_queued_jobs=MAX_QUEUED_JOBS,
+                 max_cached_rosters=MAX_CACHED_ROSTERS):
+        self.workers = workers
+        self.cache = RosterCache(max_cached_rosters)
+        self.jobs = collections.OrderedDict()
+        self._jobs_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queued_jobs)
+        self._threads = []
+
+    # ----- 시작/종료 -----
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"allocation-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """실행 중인 작업은 취소하고 작업 스레드 종료"""
+        with self._jobs_lock:
+            for job in self.jobs.values():
+                if not job.finished:
+                    job.cancel_token.cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    # ----- 명단 -----
+    def upload_roster(self, content, filename):
+        if not content:
+            raise ServiceError(400, "업로드된 파일 내용이 없습니다.")
+        roster_id, rosters, cached = self.cache.load(content, filename)
+        return {
+            "roster_id": roster_id,
+            "cached": cached,
+            "sheets": [
+                {
+                    "name": sheet_name,
+                    "students": roster.num_students,
+                    "factors": roster.factor_ranges or {},
+                    "summary": roster.summary,
+                }
+                for sheet_name, roster in rosters.items()
+            ],
+        }
+
+    # ----- 작업 -----
+    def submit(self, params):
+        """배정 작업 등록 (검증 실패 시 ServiceError)"""
+        rosters = self.cache.get(params.get("roster_id", ""))
+        if rosters is None:
+            raise ServiceError(404, "명단을 찾을 수 없습니다. 먼저 /rosters로 업로드해주세요.")
+
+        sheet_name = params.get("sheet") or next(iter(rosters))
+        if sheet_name not in rosters:
+            raise ServiceError(400, f"명단에 없는 시트입니다: {sheet_name}")
+        roster = rosters[sheet_name]
+
+        policy = params.get("policy", "regular")
+        if policy not in ENGINE_MODULES:
+            raise ServiceError(400, f"알 수 없는 배정 정책입니다: {policy}")
+
+        try:
+            selected_factors, factor_weights = parse_variant_spec(params.get("factors", ""))
+            factor_weights = dict(factor_weights or {})
+            factor_weights.update({k: float(v) for k, v in (params.get("weights") or {}).items()})
+            unknown_weights = [name for name in factor_weights if name not in selected_factors]
+            if unknown_weights:
+                raise ValueError(f"factors에 없는 factor의 가중치입니다: {', '.join(unknown_weights)}")
+            blacklist_pairs = [(int(a), int(b)) for a, b in params.get("blacklist_pairs") or []]
+            seed = int(params.get("seed", DEFAULT_SEED))
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ServiceError(400, f"잘못된 작업 설정입니다: {e}")
+
+        job = Job(
+            params["roster_id"], sheet_name, roster, policy, selected_factors, factor_weights or None,
+            blacklist_pairs, seed
+        )
+        # 대기열에 넣기 전에 먼저 등록 - 작업 스레드가 꺼내 실행하는 작업은 항상 get_job으로 조회 가능
+        with self._jobs_lock:
+            self.jobs[job.job_id] = job
+            self._forget_old_jobs()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._jobs_lock:
+                self.jobs.pop(job.job_id, None)
+            raise ServiceError(503, "대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+        return job.to_dict()
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(self.jobs) - MAX_KEPT_JOBS)]:
+            del self.jobs[job_id]
+
+    def get_job(self, job_id):
+        with self._jobs_lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            raise ServiceError(404, "작업을 찾을 수 없습니다.")
+        return job
+
+    def cancel_job(self, job_id):
+        job = self.get_job(job_id)
+        if not job.finished:
+            job.cancel_token.cancel()
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        return job.to_dict()
+
+    def job_result(self, job_id, fmt="csv"):
+        """
+        끝난 작업의 결과 내용
+
+        Returns:
+            tuple: (내용 bytes, Content-Type, 파일 이름)
+        """
+        job = self.get_job(job_id)
+        if job.status != DONE:
+            raise ServiceError(409, f"작업이 완료되지 않았습니다 (상태: {job.status}).")
+
+        fmt = (fmt or "csv").lower()
+        if fmt not in RESULT_CONTENT_TYPES:
+            raise ServiceError(400, f"지원하지 않는 결과 형식입니다: {fmt}")
+
+        if fmt == "json":
+            from result_io import rooms_to_matrix
+            content = json.dumps({
+                "rooms": rooms_to_matrix(job.result["room_id"]).tolist(),
+                "failed_students": job.result["failed_students"],
+            }, ensure_ascii=False).encode("utf-8")
+        else:
+            from result_io import result_bytes
+            try:
+                content = result_bytes(job.result["room_id"], fmt, job.roster.name_map())
+            except ImportError as e:
+                raise ServiceError(501, str(e))
+        return content, RESULT_CONTENT_TYPES[fmt], f"{job.job_id}.{fmt}"
+
+    def status(self):
+        with self._jobs_lock:
+            counts = collections.Counter(job.status for job in self.jobs.values())
+        return {
+            "workers": self.workers,
+            "queued": counts.get(QUEUED, 0),
+            "running": counts.get(RUNNING, 0),
+            "cached_rosters": len(self.cache),
+        }
+
+    # ----- 작업 스레드 -----
+    def _worker_loop(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            if job.status == CANCELLED:
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job):
+        from allocation_compare import run_variant
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            result = run_variant(
+                job.policy,
+                job.spec,
+                job.blacklist_pairs,
+                job.seed,
+                job.selected_factors,
+                job.roster,
+                progress_callback=job.on_progress,
+                cancel_token=job.cancel_token,
+                selected_factors=job.selected_factors,
+                factor_weights=job.factor_weights
+            )
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        else:
+            job.result = result
+            job.status = CANCELLED if job.cancel_token.cancelled else DONE
+        job.finished_at = time.time()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server_version = "DormitoryAllocationService/1.0"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, content, content_type, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _send_json(self, status, payload):
+        content = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        self._send(status, content, "application/json; charset=utf-8")
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_UPLOAD_BYTES:
+            raise ServiceError(413, "업로드 파일이 너무 큽니다.")
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self, method):
+        url = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(p) for p in url.path.strip("/").split("/") if p]
+        query = dict(urllib.parse.parse_qsl(url.query))
+        try:
+            if method == "GET" and parts == ["health"]:
+                return self._send_json(200, self.service.status())
+            if method == "POST" and parts == ["rosters"]:
+                filename = query.get("filename") or self.headers.get("X-Filename") or "roster.xlsx"
+                return self._send_json(200, self.service.upload_roster(self._read_body(), filename))
+            if method == "POST" and parts == ["jobs"]:
+                try:
+                    params = json.loads(self._read_body() or b"{}")
+                except json.JSONDecodeError:
+                    raise ServiceError(400, "요청 본문이 올바른 JSON이 아닙니다.")
+                return self._send_json(202, self.service.submit(params))
+            if len(parts) == 2 and parts[0] == "jobs":
+                if method == "GET":
+                    return self._send_json(200, self.service.get_job(parts[1]).to_dict())
+                if method == "DELETE":
+                    return self._send_json(200, self.service.cancel_job(parts[1]))
+            if method == "GET" and len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+                content, content_type, filename = self.service.job_result(parts[1], query.get("format"))
+                return self._send(200, content, content_type, {
+                    "Content-Disposition": f'attachment; filename="{filename}"'
+                })
+            raise ServiceError(404, "알 수 없는 요청 경로입니다.")
+        except ServiceError as e:
+            self._send_json(e.status, {"error": e.message})
+        except Exception as e:
+            self._send_json(500, {"error": f"서버 오류: {e}"})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, service=None, verbose=False):
+    """
+    HTTP 서버 생성 (serve_forever는 호출하지 않음 - 테스트에서는 port=0으로 빈 포트 사용)
+
+    Returns:
+        ThreadingHTTPServer: server.service에 AllocationService가 연결되어 있음
+    """
+    server = ThreadingHTTPServer((host, port), _RequestHandler)
+    server.daemon_threads = True
+    server.service = service if service is not None else AllocationService().start()
+    server.verbose = verbose
+    return server
+
+
+class AllocationServiceClient:
+    """
+    배정 서비스 HTTP 클라이언트 (GUI/스크립트에서 원격 배정에 사용)
+
+    예:
+        client = AllocationServiceClient("http://127.0.0.1:8765")
+        roster_id = client.upload_roster("명단.xlsx")["roster_id"]
+        job = client.submit_job(roster_id, factors="factor1, factor2")
+        client.wait(job["job_id"])
+        client.download_result(job["job_id"], "결과.csv")
+    """
+
+    def __init__(self, base_url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=60):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method, path, body=None, headers=None, raw=False):
+        request = urllib.request.Request(self.base_url + path, data=body, method=method, headers=headers or {})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content = response.read()
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", str(e))
+            except ValueError:
+                message = str(e)
+            raise ServiceError(e.code, message) from None
+        return content if raw else json.loads(content)
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def upload_roster(self, file_path):
+        with open(file_path, "rb") as f:
+            content = f.read()
+        filename = urllib.parse.quote(os.path.basename(file_path))
+        return self._request("POST", f"/rosters?filename={filename}", content,
+                             {"Content-Type": "application/octet-stream"})
+
+    def submit_job(self, roster_id, sheet=None, policy="regular", factors="", weights=None,
+                   blacklist_pairs=None, seed=DEFAULT_SEED):
+        params = {
+            "roster_id": roster_id,
+            "sheet": sheet,
+            "policy": policy,
+            "factors": factors,
+            "weights": weights or {},
+            "blacklist_pairs": [list(pair) for pair in blacklist_pairs or []],
+            "seed": seed,
+        }
+        return self._request("POST", "/jobs", json.dumps(params).encode("utf-8"),
+                             {"Content-Type": "application/json"})
+
+    def job_status(self, job_id):
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def cancel_job(self, job_id):
+        return self._request("DELETE", f"/jobs/{job_id}")
+
+    def wait(self, job_id, poll_interval=0.2, timeout=None, progress_callback=None):
+        """작업이 끝날 때까지 상태를 주기적으로 확인 (끝난 상태 반환)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            status = self.job_status(job_id)
+            if progress_callback is not None:
+                progress_callback(status)
+            if status["status"] in (DONE, FAILED, CANCELLED):
+                return status
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"작업이 {timeout}초 안에 끝나지 않았습니다: {job_id}")
+            time.sleep(poll_interval)
+
+    def download_result(self, job_id, file_path=None, fmt=None):
+        """결과 내용(bytes) 반환, file_path가 있으면 파일로도 저장 (형식은 확장자로 판단)"""
+        if fmt is None:
+            fmt = os.path.splitext(file_path)[1].lstrip(".") if file_path else "csv"
+        content = self._request("GET", f"/jobs/{job_id}/result?format={fmt}", raw=True)
+        if file_path:
+            with open(file_path, "wb") as f:
+                f.write(content)
+        return content
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 방 배정 서비스 (HTTP)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"바인딩 주소 (기본 {DEFAULT_HOST} - 이 PC에서만 접속)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본 {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"동시 배정 작업 수 (기본 {DEFAULT_WORKERS})")
+    parser.add_argument("--max-queued", type=int, default=MAX_QUEUED_JOBS, help=f"대기열 크기 (기본 {MAX_QUEUED_JOBS})")
+    parser.add_argument("-v", "--verbose", action="store_true", help="요청 로그 출력")
+    args = parser.parse_args(argv)
+
+    service = AllocationService(workers=args.workers, max_queued_jobs=args.max_queued).start()
+    server = create_server(args.host, args.port, service, verbose=args.verbose)
+    host, port = server.server_address[:2]
+    print(f"배정 서비스 실행 중: http://{host}:{port} (작업 스레드 {args.workers}개, 종료: Ctrl+C)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
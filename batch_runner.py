@@ -0,0 +1,451 @@
+"""
+여러 명단 파일 일괄 배정 (학기 초 생활관/학년별 파일을 한 번에 처리)
+
+폴더 또는 목록 파일(manifest)에 있는 명단 파일들을 작업 프로세스에서 동시에 배정하고
+파일별 결과와 전체 요약(batch_summary.json / batch_summary.csv)을 저장합니다.
+중간에 중단되어도 같은 명령을 다시 실행하면 이미 끝난 파일은 건너뛰고 이어서 처리합니다
+(파일 내용이나 배정 설정이 바뀐 파일은 다시 배정).
+
+사용 예:
+    python batch_runner.py 명단폴더 -o 결과 --workers 4
+    python batch_runner.py manifest.csv -o 결과 --factors "factor1, factor2"
+    python batch_runner.py 명단폴더 -o 결과 --restart-all     # 이전 진행 기록 무시
+
+목록 파일 (CSV 또는 JSON 리스트) 컬럼:
+    path (필수), policy, factors, blacklist, seed
+    - 비어 있는 값은 명령줄 옵션 값을 사용
+    - path/blacklist의 상대 경로는 목록 파일 위치 기준
+
+배정 정책은 목록 파일의 policy → 파일 이름에 '3학년'이 있으면 third_grade → --policy 순서로 정합니다.
+
+종료 코드는 cli.py와 같습니다 (0 성공, 1 입력 오류/파일 처리 실패, 2 실패 좌석 수 초과).
+"""
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+
+from allocation_compare import DEFAULT_SEED, ENGINE_MODULES, format_variant_spec, parse_variant_spec
+from cli import (EXIT_ERROR, EXIT_OK, EXIT_TOO_MANY_FAILURES, json_number, output_stem, parse_formats,
+                 parse_weights, quality_summary, run_allocations, write_outputs)
+
+ROSTER_EXTENSIONS = (".xlsx", ".xls", ".csv", ".parquet")
+THIRD_GRADE_MARKER = "3학년"
+
+STATE_FILE = "batch_state.json"
+SUMMARY_JSON = "batch_summary.json"
+SUMMARY_CSV = "batch_summary.csv"
+
+SUMMARY_COLUMNS = ["file", "sheet", "policy", "students", "rooms", "failed", "mean_similarity", "seed", "seconds", "status"]
+
+
+def file_digest(path):
+    """파일 내용 SHA-256 (이어서 실행할 때 바뀐 파일인지 확인용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def guess_policy(path, default_policy):
+    """파일 이름에 '3학년'이 있으면 3학년용 정책"""
+    return "third_grade" if THIRD_GRADE_MARKER in os.path.basename(path) else default_policy
+
+
+def scan_directory(directory, exclude_dir=None):
+    """폴더 안의 명단 파일 목록 (엑셀 임시 파일 '~$...'과 결과 폴더는 제외, 이름 순)"""
+    exclude_dir = os.path.abspath(exclude_dir) if exclude_dir else None
+    paths = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.startswith("~$") or not os.path.isfile(path):
+            continue
+        if os.path.splitext(name)[1].lower() not in ROSTER_EXTENSIONS:
+            continue
+        if exclude_dir and os.path.dirname(os.path.abspath(path)) == exclude_dir:
+            continue
+        paths.append(path)
+    return paths
+
+
+def read_manifest(manifest_path):
+    """목록 파일(CSV/JSON)을 [{path, policy, factors, blacklist, seed}, ...]로 읽기"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+    if manifest_path.lower().endswith(".json"):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        rows = [{"path": row} if isinstance(row, str) else row for row in rows]
+    else:
+        with open(manifest_path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+
+    entries = []
+    for line_no, row in enumerate(rows, start=1):
+        row = {str(k).strip(): (str(v).strip() if v is not None else "") for k, v in row.items()}
+        if not row.get("path"):
+            raise ValueError(f"목록 파일 {line_no}번째 항목에 path가 없습니다.")
+        entry = {"path": os.path.join(base_dir, row["path"])}
+        for key in ("policy", "factors", "blacklist", "seed"):
+            if row.get(key):
+                entry[key] = row[key]
+        if "blacklist" in entry:
+            entry["blacklist"] = os.path.join(base_dir, entry["blacklist"])
+        entries.append(entry)
+    return entries
+
+
+def build_tasks(entries, defaults):
+    """
+    목록 항목 + 명령줄 기본값 → 파일별 배정 작업
+
+    Args:
+        entries: [{path, policy?, factors?, blacklist?, seed?}, ...]
+        defaults: policy, spec, blacklist, seed, restarts, formats, output_dir
+
+    Returns:
+        list: 작업 딕셔너리 리스트 (key: 파일 + 설정 지문, 바뀌면 다시 배정)
+    """
+    tasks = []
+    seen = set()
+    for entry in entries:
+        path = entry["path"]
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"명단 파일을 찾을 수 없습니다: {path}")
+
+        policy = entry.get("policy") or guess_policy(path, defaults["policy"])
+        if policy not in ENGINE_MODULES:
+            raise ValueError(f"알 수 없는 배정 정책입니다: {policy} ({path})")
+        spec = format_variant_spec(*parse_variant_spec(entry["factors"])) if "factors" in entry else defaults["spec"]
+        blacklist = entry.get("blacklist") or defaults["blacklist"]
+        if blacklist and not os.path.exists(blacklist):
+            raise FileNotFoundError(f"블랙리스트 파일을 찾을 수 없습니다: {blacklist}")
+        try:
+            seed = int(entry.get("seed", defaults["seed"]))
+        except ValueError:
+            raise ValueError(f"시드가 정수가 아닙니다: {entry.get('seed')} ({path})")
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem in seen:
+            raise ValueError(f"파일 이름이 같은 명단이 여러 개입니다 (결과 파일이 겹침): {stem}")
+        seen.add(stem)
+
+        settings = {
+            "policy": policy,
+            "spec": spec,
+            "seed": seed,
+            "restarts": defaults["restarts"],
+            "formats": defaults["formats"],
+            "input_sha256": file_digest(path),
+            "blacklist_sha256": file_digest(blacklist) if blacklist else None,
+        }
+        tasks.append({
+            "path": path,
+            "blacklist": blacklist,
+            "output_dir": defaults["output_dir"],
+            "settings": settings,
+            "fingerprint": hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest(),
+        })
+    return tasks
+
+
+def process_file(task):
+    """
+    명단 파일 하나 배정 + 결과 저장 (작업 프로세스에서 실행)
+
+    Returns:
+        dict: 파일 처리 기록 (시트별 결과, 시간, 저장한 파일)
+    """
+    from quality_report import compute_quality_report
+    from roster import load_workbook
+
+    start = time.perf_counter()
+    settings = task["settings"]
+    path = task["path"]
+
+    blacklist_pairs = []
+    if task["blacklist"]:
+        from blacklist_io import read_blacklist_file
+        blacklist_pairs = [tuple(pair) for pair in read_blacklist_file(task["blacklist"]).tolist()]
+
+    rosters = [(path, sheet_name, roster) for sheet_name, roster in load_workbook(path).items()]
+    if not rosters:
+        raise ValueError("'학번' 컬럼이 있는 시트가 없습니다.")
+    load_seconds = time.perf_counter() - start
+
+    selected = run_allocations(
+        rosters, settings["policy"], settings["spec"], blacklist_pairs,
+        settings["seed"], settings["restarts"], 1, lambda message: None
+    )
+
+    sheets = []
+    for (_, sheet_name, roster), (result, restart_seconds) in zip(rosters, selected):
+        stem = output_stem(path, sheet_name, len(rosters))
+        quality = compute_quality_report(
+            result["room_id"], roster, result["factors"], blacklist_pairs,
+            failed_students=result["failed_students"], seat_rotation=settings["policy"] == "regular"
+        )
+        outputs = write_outputs(result, roster, task["output_dir"], stem, settings["formats"], quality)
+        sheets.append({
+            "sheet": sheet_name,
+            "students": roster.num_students,
+            "rooms": len(result["room_id"]),
+            "failed": result["failed"],
+            "failed_seats": result["failed_students"],
+            "mean_similarity": json_number(result["mean_similarity"]),
+            "min_similarity": json_number(result["min_similarity"]),
+            "seed": result["seed"],
+            "allocate_sec": sum(restart_seconds),
+            "quality": quality_summary(quality),
+            "outputs": outputs,
+        })
+
+    return {
+        "file": path,
+        "policy": settings["policy"],
+        "factors": settings["spec"],
+        "blacklist_pairs": len(blacklist_pairs),
+        "load_sec": load_seconds,
+        "seconds": time.perf_counter() - start,
+        "sheets": sheets,
+    }
+
+
+class BatchState:
+    """
+    진행 기록 파일 (output_dir/batch_state.json)
+
+    파일마다 마지막으로 끝난 처리 기록과 설정 지문을 저장합니다.
+    한 파일이 끝날 때마다 임시 파일에 쓰고 교체하므로 중간에 끊겨도 기록이 깨지지 않습니다.
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, STATE_FILE)
+        self.records = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.records = json.load(f).get("files", {})
+
+    def _key(self, task):
+        return os.path.abspath(task["path"])
+
+    def is_done(self, task):
+        """같은 설정으로 이미 끝났고 결과 파일이 모두 남아 있으면 True"""
+        record = self.records.get(self._key(task))
+        if not record or record.get("fingerprint") != task["fingerprint"] or record.get("status") != "done":
+            return False
+        return all(os.path.exists(p) for sheet in record["result"]["sheets"] for p in sheet["outputs"])
+
+    def record(self, task, status, result=None, error=None):
+        self.records[self._key(task)] = {
+            "fingerprint": task["fingerprint"],
+            "status": status,
+            "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "result": result,
+            "error": error,
+        }
+        self.save()
+
+    def get(self, task):
+        return self.records.get(self._key(task))
+
+    def reset(self):
+        self.records = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"files": self.records}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def run_batch(tasks, state, workers, log):
+    """
+    아직 끝나지 않은 작업을 프로세스 풀에서 실행 (하나 끝날 때마다 진행 기록 저장)
+
+    Returns:
+        tuple: (이번에 처리한 파일 수, 건너뛴 파일 수)
+    """
+    pending = []
+    skipped = 0
+    for task in tasks:
+        if state.is_done(task):
+            skipped += 1
+            log(f"건너뜀 (이미 완료): {task['path']}")
+        else:
+            pending.append(task)
+
+    def finish(task, future_or_result, error=None):
+        if error is not None:
+            state.record(task, "failed", error=str(error))
+            log(f"실패: {task['path']} - {error}")
+            return
+        state.record(task, "done", result=future_or_result)
+        failed = sum(sheet["failed"] for sheet in future_or_result["sheets"])
+        log(f"완료: {task['path']} ({task['settings']['policy']}) - 실패 좌석 {failed}개, "
+            f"{future_or_result['seconds']:.2f}초")
+
+    if workers > 1 and len(pending) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+            futures = {executor.submit(process_file, task): task for task in pending}
+            for future in concurrent.futures.as_completed(futures):
+                task = futures[future]
+                try:
+                    finish(task, future.result())
+                except Exception as e:
+                    finish(task, None, e)
+    else:
+        for task in pending:
+            try:
+                finish(task, process_file(task))
+            except Exception as e:
+                finish(task, None, e)
+
+    return len(pending), skipped
+
+
+def write_summary(tasks, state, output_dir, max_failures, total_seconds):
+    """
+    전체 요약 저장 (batch_summary.json / batch_summary.csv)
+
+    Returns:
+        dict: 요약 (exit_code 포함)
+    """
+    rows = []
+    files = []
+    exit_code = EXIT_OK
+    for task in tasks:
+        record = state.get(task) or {"status": "pending"}
+        result = record.get("result")
+        files.append({"file": task["path"], "status": record["status"], "error": record.get("error"),
+                      "policy": task["settings"]["policy"], "result": result})
+        if record["status"] != "done":
+            exit_code = EXIT_ERROR
+            rows.append({"file": task["path"], "policy": task["settings"]["policy"], "status": record["status"]})
+            continue
+        for sheet in result["sheets"]:
+            over_limit = sheet["failed"] > max_failures
+            if over_limit and exit_code == EXIT_OK:
+                exit_code = EXIT_TOO_MANY_FAILURES
+            rows.append({
+                "file": task["path"],
+                "sheet": sheet["sheet"],
+                "policy": result["policy"],
+                "students": sheet["students"],
+                "rooms": sheet["rooms"],
+                "failed": sheet["failed"],
+                "mean_similarity": sheet["mean_similarity"],
+                "seed": sheet["seed"],
+                "seconds": sheet["allocate_sec"],
+                "status": "over_failure_limit" if over_limit else "done",
+            })
+
+    summary = {
+        "files": len(tasks),
+        "done": sum(1 for f in files if f["status"] == "done"),
+        "failed_files": [f["file"] for f in files if f["status"] != "done"],
+        "students": sum(row.get("students", 0) for row in rows),
+        "failed_seats": sum(row.get("failed", 0) for row in rows),
+        "max_failures": max_failures,
+        "total_sec": total_seconds,
+        "exit_code": exit_code,
+        "details": files,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, SUMMARY_JSON), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    with open(os.path.join(output_dir, SUMMARY_CSV), "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return summary
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="여러 명단 파일 일괄 배정 (중단 후 다시 실행하면 이어서 처리)",
+        epilog="종료 코드: 0 성공, 1 입력 오류/파일 처리 실패, 2 실패 좌석 수가 --max-failures 초과"
+    )
+    parser.add_argument("source", help="명단 파일이 있는 폴더 또는 목록 파일 (CSV/JSON)")
+    parser.add_argument("-o", "--output-dir", default="batch_results", help="결과를 저장할 폴더 (기본 batch_results)")
+    parser.add_argument("--policy", choices=sorted(ENGINE_MODULES), default="regular",
+                        help="기본 배정 정책 (파일 이름에 '3학년'이 있으면 third_grade)")
+    parser.add_argument("--factors", default="", help="유사도 배정에 사용할 factor (예: 'factor1, factor2*2')")
+    parser.add_argument("--weights", default="", help="factor 가중치 (예: 'factor1=2,factor2=0.5')")
+    parser.add_argument("--blacklist", help="모든 파일에 적용할 블랙리스트 조합 파일")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"난수 시드 (기본 {DEFAULT_SEED})")
+    parser.add_argument("--restarts", type=int, default=1, help="시트마다 시드를 바꿔 배정할 횟수 (기본 1)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="동시에 처리할 파일 수 (기본 CPU 수)")
+    parser.add_argument("--format", action="append", dest="formats", help="출력 형식 (csv, jsonl, parquet, xlsx - 기본 csv)")
+    parser.add_argument("--max-failures", type=int, default=0, help="시트별 허용 실패 좌석 수 (기본 0)")
+    parser.add_argument("--restart-all", action="store_true", help="이전 진행 기록을 무시하고 모든 파일을 다시 배정")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황을 출력하지 않음")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        if args.restarts < 1:
+            raise ValueError("--restarts는 1 이상이어야 합니다.")
+        if args.workers < 1:
+            raise ValueError("--workers는 1 이상이어야 합니다.")
+        selected_factors, factor_weights = parse_variant_spec(args.factors)
+        factor_weights = dict(factor_weights or {})
+        factor_weights.update(parse_weights(args.weights))
+        unknown_weights = [name for name in factor_weights if name not in selected_factors]
+        if unknown_weights:
+            raise ValueError(f"--factors에 없는 factor의 가중치입니다: {', '.join(unknown_weights)}")
+        defaults = {
+            "policy": args.policy,
+            "spec": format_variant_spec(selected_factors, factor_weights),
+            "blacklist": args.blacklist,
+            "seed": args.seed,
+            "restarts": args.restarts,
+            "formats": parse_formats(args.formats),
+            "output_dir": args.output_dir,
+        }
+
+        if os.path.isdir(args.source):
+            entries = [{"path": path} for path in scan_directory(args.source, args.output_dir)]
+        else:
+            entries = read_manifest(args.source)
+        if not entries:
+            raise ValueError(f"배정할 명단 파일이 없습니다: {args.source}")
+        tasks = build_tasks(entries, defaults)
+    except (ValueError, OSError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    state = BatchState(args.output_dir)
+    if args.restart_all:
+        state.reset()
+
+    log(f"명단 파일 {len(tasks)}개, 작업 프로세스 {args.workers}개")
+    processed, skipped = run_batch(tasks, state, args.workers, log)
+    summary = write_summary(tasks, state, args.output_dir, args.max_failures, time.perf_counter() - start)
+
+    print(f"일괄 배정: {summary['done']}/{summary['files']}개 파일 완료 (이번 실행 {processed}개, 건너뜀 {skipped}개), "
+          f"학생 {summary['students']}명, 실패 좌석 {summary['failed_seats']}개, {summary['total_sec']:.2f}초")
+    for path in summary["failed_files"]:
+        print(f"  처리 실패: {path}")
+    log(f"요약 저장: {os.path.join(args.output_dir, SUMMARY_JSON)}, {os.path.join(args.output_dir, SUMMARY_CSV)}")
+    return summary["exit_code"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+"""
+배정 실행 메모리 측정 (tracemalloc)
+
+명단 읽기부터 결과 저장까지 한 번 실행하면서 단계별로
+    - 최대 사용량 (peak): 그 단계 동안 단계 시작 시점보다 가장 많이 늘어난 메모리
+    - 남은 사용량 (retained): 단계가 끝난 뒤에도 남아 있는 증가분
+    - 메모리를 가장 많이 늘린 코드 위치 (파일:줄)
+를 기록합니다. 단계: load (파일 읽기), compile (명단 압축·금지 관계·유사도 표),
+seed (방마다 첫 학생), fill (나머지 좌석), optimize (배정 후 보정 단계가 있는 엔진만), export (결과 저장)
+
+결과는 benchmark_scaling.py의 시간 측정 JSON과 같은 형식(python, numpy, machine, results)으로 저장하므로
+두 파일을 나란히 두고 속도와 메모리 회귀를 같은 방식으로 추적할 수 있습니다.
+
+사용 예:
+    python benchmark_memory.py -n 200000 --json memory.json          # 생성한 명단 20만 명
+    python benchmark_memory.py 명단.xlsx --factors "factor1, factor2" --policy third_grade
+    python benchmark_memory.py -n 100000 --max-peak-mb 500             # 최대 사용량 초과 시 종료 코드 2
+
+종료 코드: 0 성공, 1 실행 오류, 2 --max-peak-mb 초과
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import random as rd
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from allocation_compare import ENGINE_MODULES, parse_variant_spec
+from result_io import export_result
+from roster import CompiledRoster, detect_factor_columns
+from similarity_cache import SimilarityCache
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_TOO_MUCH_MEMORY = 2
+
+DEFAULT_TOP_SITES = 5
+TRACE_FRAMES = 1  # 할당 위치로 기록할 호출 스택 깊이
+
+# 측정 도구 자신과 import 과정에서 생긴 할당은 위치 통계에서 제외
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class PhaseTracker:
+    """
+    단계별 tracemalloc 측정
+
+    enter(phase)를 호출하면 이전 단계를 마감하고 새 단계를 시작합니다.
+    (같은 단계 이름이 연속으로 들어오면 하나의 단계로 이어서 측정 - 예: 명단 압축 후 엔진의 compile)
+    """
+
+    def __init__(self, top_sites=DEFAULT_TOP_SITES):
+        self.top_sites = top_sites
+        self.phases = []
+        self._current = None
+        self._start_bytes = 0
+        self._start_time = 0.0
+        self._start_snapshot = None
+
+    def start(self):
+        tracemalloc.start(TRACE_FRAMES)
+
+    def enter(self, phase):
+        if self._current == phase:
+            return
+        self._finish()
+        # 기준 스냅샷을 먼저 만들어서 스냅샷 자체가 차지하는 메모리는 단계 증가분에 들어가지 않도록 함
+        self._start_snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS) if self.top_sites else None
+        tracemalloc.reset_peak()
+        self._current = phase
+        self._start_bytes = tracemalloc.get_traced_memory()[0]
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        self._finish()
+        self._current = None
+        tracemalloc.stop()
+
+    def _finish(self):
+        if self._current is None:
+            return
+        seconds = time.perf_counter() - self._start_time
+        current, peak = tracemalloc.get_traced_memory()
+
+        sites = []
+        if self.top_sites:
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            # compare_to는 증감 절댓값 순서이므로 늘어난 위치만 골라서 상위 N개
+            grown = [stat for stat in snapshot.compare_to(self._start_snapshot, "lineno") if stat.size_diff > 0]
+            for stat in grown[:self.top_sites]:
+                frame = stat.traceback[0]
+                sites.append({
+                    "file": os.path.relpath(frame.filename) if os.path.isabs(frame.filename) else frame.filename,
+                    "line": frame.lineno,
+                    "size_diff_bytes": stat.size_diff,
+                    "count_diff": stat.count_diff,
+                })
+
+        self.phases.append({
+            "phase": self._current,
+            "seconds": seconds,
+            "start_bytes": self._start_bytes,
+            "peak_bytes": peak - self._start_bytes,
+            "retained_bytes": current - self._start_bytes,
+            "top_sites": sites,
+        })
+        self._start_snapshot = None
+
+
+def _read_frame(file_path):
+    """명단 파일 → DataFrame ('학번' 컬럼이 있는 첫 시트)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".csv":
+        return pd.read_csv(file_path, encoding="utf-8-sig")
+    if ext == ".parquet":
+        return pd.read_parquet(file_path)
+    for df in pd.read_excel(file_path, sheet_name=None).values():
+        if "학번" in df.columns:
+            return df
+    raise ValueError("'학번' 컬럼이 있는 시트를 찾을 수 없습니다.")
+
+
+def profile_run(input_path, policy="regular", selected_factors=None, factor_weights=None, seed=0,
+                export_format="csv", top_sites=DEFAULT_TOP_SITES):
+    """
+    명단 하나를 읽어 배정하고 저장하는 전체 과정을 단계별로 측정
+
+    Args:
+        input_path: 명단 파일 (xlsx, csv, parquet)
+        policy: 배정 정책 (regular, third_grade)
+        selected_factors: 유사도 배정에 사용할 factor 리스트
+        factor_weights: factor별 가중치
+        seed: 난수 시드
+        export_format: 결과 저장 형식 (csv, jsonl, parquet) - 임시 폴더에 저장 후 삭제
+        top_sites: 단계별로 기록할 할당 위치 수 (0이면 위치 통계 생략 - 측정이 빨라짐)
+
+    Returns:
+        dict: input, policy, factors, students, rooms, failed, peak_bytes, phases
+    """
+    engine = importlib.import_module(ENGINE_MODULES[policy])
+    output_dir = tempfile.mkdtemp(prefix="memory_")
+    tracker = PhaseTracker(top_sites)
+    tracker.start()
+    try:
+        tracker.enter("load")
+        df = _read_frame(input_path)
+
+        tracker.enter("compile")
+        roster = CompiledRoster(df, detect_factor_columns(df), source=input_path)
+        del df
+
+        # 엔진이 compile → seed → fill (→ optimize) 순서로 알려줌
+        room_id, failed_students = engine.allocate_rooms(
+            roster, selected_factors=selected_factors, factor_weights=factor_weights, rng=rd.Random(seed),
+            similarity_cache=SimilarityCache(), phase_callback=tracker.enter
+        )
+
+        tracker.enter("export")
+        export_result(room_id, os.path.join(output_dir, f"result.{export_format}"), export_format, roster.name_map())
+    finally:
+        tracker.stop()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return {
+        "input": input_path,
+        "policy": policy,
+        "factors": list(selected_factors or []),
+        "students": int(roster.num_students),
+        "rooms": len(room_id),
+        "failed": len(failed_students),
+        "peak_bytes": max(phase["start_bytes"] + phase["peak_bytes"] for phase in tracker.phases),
+        "phases": tracker.phases,
+    }
+
+
+def _mb(num_bytes):
+    return num_bytes / (1024 * 1024)
+
+
+def format_profile(result):
+    """단계별 측정 결과 표 문자열"""
+    lines = [
+        f"{result['input']} - {result['students']}명, 방 {result['rooms']}개, 정책 {result['policy']}, "
+        f"factor {', '.join(result['factors']) or '없음'}",
+        f"  {'단계':8s} {'시간(초)':>9s} {'최대(MB)':>10s} {'남음(MB)':>10s}",
+    ]
+    for phase in result["phases"]:
+        lines.append(f"  {phase['phase']:8s} {phase['seconds']:9.3f} {_mb(phase['peak_bytes']):10.1f} "
+                     f"{_mb(phase['retained_bytes']):10.1f}")
+        for site in phase["top_sites"][:3]:
+            lines.append(f"             {site['file']}:{site['line']}  +{_mb(site['size_diff_bytes']):.1f}MB")
+    lines.append(f"  전체 최대 사용량: {_mb(result['peak_bytes']):.1f}MB")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="배정 실행 단계별 메모리 측정 (tracemalloc)",
+        epilog="종료 코드: 0 성공, 1 실행 오류, 2 --max-peak-mb 초과"
+    )
+    parser.add_argument("input", nargs="?", help="명단 파일 (생략하면 -n 명 명단을 생성해서 사용)")
+    parser.add_argument("-n", "--students", type=int, default=100000, help="생성할 명단 학생 수 (기본 100000)")
+    parser.add_argument("--policy", choices=sorted(ENGINE_MODULES), default="regular", help="배정 정책")
+    parser.add_argument("--factors", default="", help="유사도 배정에 사용할 factor (예: 'factor1, factor2*2')")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드 (기본 0)")
+    parser.add_argument("--export-format", choices=["csv", "jsonl", "parquet"], default="csv",
+                        help="export 단계에서 저장할 형식 (기본 csv)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_SITES,
+                        help=f"단계별 할당 위치 기록 수 (기본 {DEFAULT_TOP_SITES}, 0이면 생략)")
+    parser.add_argument("--max-peak-mb", type=float, help="전체 최대 사용량 허용치 (MB) - 넘으면 종료 코드 2")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    generated_dir = None
+    try:
+        selected_factors, factor_weights = parse_variant_spec(args.factors)
+        input_path = args.input
+        if input_path is None:
+            from create_test_data import generate_roster, write_roster
+            generated_dir = tempfile.mkdtemp(prefix="memory_input_")
+            input_path = os.path.join(generated_dir, f"roster_{args.students}.csv")
+            write_roster(generate_roster(args.students, seed=args.seed, names=False), input_path)
+
+        result = profile_run(
+            input_path, args.policy, selected_factors or None, factor_weights, args.seed, args.export_format, args.top
+        )
+        if generated_dir is not None:
+            result["input"] = f"생성한 명단 ({args.students}명)"
+    except (ValueError, OSError, ImportError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        if generated_dir is not None:
+            shutil.rmtree(generated_dir, ignore_errors=True)
+
+    print(format_profile(result))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "results": [result],
+            }, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+    if args.max_peak_mb is not None and _mb(result["peak_bytes"]) > args.max_peak_mb:
+        print(f"최대 사용량 {_mb(result['peak_bytes']):.1f}MB가 허용치 {args.max_peak_mb}MB를 넘었습니다.", file=sys.stderr)
+        return EXIT_TOO_MUCH_MEMORY
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
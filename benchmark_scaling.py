@@ -0,0 +1,214 @@
+"""
+배정 엔진 규모 증가 시험 (학생 수에 따른 실행 시간 증가율 확인)
+
+create_test_data.generate_roster로 여러 크기의 명단을 만들어 배정 시간을 재고,
+log(시간) - log(기준 복잡도(N)) 를 log(N)에 대해 직선으로 맞춘 기울기(초과 지수)가
+허용 오차를 넘으면 실패로 보고합니다. 반복문 안에 df.loc 같은 O(N) 작업이 들어가면
+작은 명단에서는 티가 나지 않아도 초과 지수가 약 1 늘어나므로 여기서 잡힙니다.
+
+시나리오별 기준 복잡도 (허용 초과 지수):
+    compile                     명단 압축 (CompiledRoster)          N       (0.3)
+    regular, third_grade        조건만 보고 채우기                  N       (0.3)
+    regular_similarity,         유사도 배정 - 방마다 남은 후보 전체를  N^1.75  (0.15)
+    third_grade_similarity      점수 매기므로 측정값 약 N^1.7~1.8
+유사도 시나리오는 이론상 상한(N^2)이 아니라 현재 측정값을 기준으로 삼아야
+N^1.75 → N^2 같은 회귀(초과 지수 +0.25)를 잡을 수 있으므로 허용치도 더 좁게 둡니다.
+
+인터넷·GPU 없이 CPU만 있는 리눅스에서 실행할 수 있습니다.
+
+사용 예:
+    python benchmark_scaling.py                              # 모든 시나리오, 기본 크기
+    python benchmark_scaling.py regular --sizes 5000,10000,20000,40000 --repeats 5
+    python benchmark_scaling.py --tolerance 0.2 --json scaling.json
+
+종료 코드: 0 모든 시나리오가 기준 이내, 1 실행 오류, 2 기준 복잡도 초과
+"""
+import argparse
+import gc
+import importlib
+import json
+import math
+import platform
+import random as rd
+import sys
+import time
+
+import numpy as np
+
+from allocation_compare import ENGINE_MODULES
+from create_test_data import generate_roster
+from roster import CompiledRoster, detect_factor_columns
+from similarity_cache import SimilarityCache
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_TOO_SLOW = 2
+
+# 기준 복잡도 이름 → 함수
+COMPLEXITY_MODELS = {
+    "n": lambda n: n,
+    "nlogn": lambda n: n * math.log(n),
+    "n1.75": lambda n: n ** 1.75,
+    "n2": lambda n: n * n,
+}
+
+SIMILARITY_FACTORS = ["factor1", "factor2", "factor3"]
+
+DEFAULT_TOLERANCE = 0.3  # 허용 초과 지수 (측정 잡음 포함)
+SIMILARITY_TOLERANCE = 0.15  # 유사도 시나리오 - 기준이 측정값이라 N^2 회귀를 잡도록 좁게
+
+# 시나리오: (배정 정책 (None이면 명단 압축만), 유사도 factor, 기준 복잡도, 기본 학생 수, 허용 초과 지수)
+SCENARIOS = {
+    "compile": (None, None, "n", (20000, 40000, 80000, 160000), DEFAULT_TOLERANCE),
+    "regular": ("regular", None, "n", (4000, 8000, 16000, 32000), DEFAULT_TOLERANCE),
+    "third_grade": ("third_grade", None, "n", (4000, 8000, 16000, 32000), DEFAULT_TOLERANCE),
+    "regular_similarity": ("regular", SIMILARITY_FACTORS, "n1.75", (1000, 2000, 4000, 8000), SIMILARITY_TOLERANCE),
+    "third_grade_similarity": ("third_grade", SIMILARITY_FACTORS, "n1.75", (1000, 2000, 4000, 8000),
+                               SIMILARITY_TOLERANCE),
+}
+DEFAULT_REPEATS = 3
+
+
+def make_roster(num_students, seed=0):
+    """시험용 명단 DataFrame과 CompiledRoster (명단 생성 시간은 측정에서 제외)"""
+    df = generate_roster(num_students, seed=seed, num_factors=len(SIMILARITY_FACTORS), names=False)
+    return df, CompiledRoster(df, detect_factor_columns(df))
+
+
+def time_once(scenario, df, roster, seed=0):
+    """시나리오 한 번 실행 시간 (초)"""
+    policy, factors, _, _, _ = SCENARIOS[scenario]
+    gc.collect()
+    if policy is None:
+        start = time.perf_counter()
+        CompiledRoster(df, detect_factor_columns(df))
+        return time.perf_counter() - start
+
+    engine = importlib.import_module(ENGINE_MODULES[policy])
+    # 매번 새 유사도 캐시 - 캐시 적중으로 계산을 건너뛰지 않도록
+    start = time.perf_counter()
+    engine.allocate_rooms(roster, selected_factors=factors, rng=rd.Random(seed), similarity_cache=SimilarityCache())
+    return time.perf_counter() - start
+
+
+def fit_excess_exponent(sizes, seconds, model):
+    """
+    log(시간 / 기준 복잡도(N)) 를 log(N)에 맞춘 기울기
+
+    Returns:
+        tuple: (초과 지수, 전체 지수 - log(시간)을 log(N)에 맞춘 기울기)
+    """
+    sizes = np.asarray(sizes, dtype=np.float64)
+    seconds = np.maximum(np.asarray(seconds, dtype=np.float64), 1e-9)
+    expected = np.array([COMPLEXITY_MODELS[model](n) for n in sizes])
+    excess = np.polyfit(np.log(sizes), np.log(seconds / expected), 1)[0]
+    exponent = np.polyfit(np.log(sizes), np.log(seconds), 1)[0]
+    return float(excess), float(exponent)
+
+
+def run_scenario(scenario, sizes=None, repeats=DEFAULT_REPEATS, tolerance=None, log=None):
+    """
+    시나리오 하나를 여러 크기로 측정하고 기준 복잡도와 비교
+
+    Args:
+        scenario: SCENARIOS 키
+        sizes: 학생 수 리스트 (None이면 시나리오 기본값, 3개 이상 권장)
+        repeats: 크기별 반복 횟수 (가장 짧은 시간 사용 - 다른 프로세스 영향 최소화)
+        tolerance: 허용 초과 지수 (None이면 시나리오 기본값)
+        log: log(message) 진행 상황 출력 함수
+
+    Returns:
+        dict: scenario, model, sizes, seconds, excess_exponent, exponent, tolerance, passed
+    """
+    _, _, model, default_sizes, default_tolerance = SCENARIOS[scenario]
+    if tolerance is None:
+        tolerance = default_tolerance
+    sizes = sorted(sizes or default_sizes)
+    if len(sizes) < 2:
+        raise ValueError("증가율을 맞추려면 학생 수를 2개 이상 지정해야 합니다.")
+
+    seconds = []
+    for n in sizes:
+        df, roster = make_roster(n)
+        best = min(time_once(scenario, df, roster) for _ in range(repeats))
+        seconds.append(best)
+        if log:
+            log(f"  {scenario} N={n}: {best:.4f}초")
+        del df, roster
+
+    excess, exponent = fit_excess_exponent(sizes, seconds, model)
+    return {
+        "scenario": scenario,
+        "model": model,
+        "sizes": sizes,
+        "seconds": seconds,
+        "exponent": exponent,
+        "excess_exponent": excess,
+        "tolerance": tolerance,
+        "passed": excess <= tolerance,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="배정 엔진 규모 증가 시험",
+        epilog="종료 코드: 0 기준 이내, 1 실행 오류, 2 기준 복잡도 초과"
+    )
+    parser.add_argument("scenarios", nargs="*",
+                        help=f"시나리오 (기본: 전체 - {', '.join(SCENARIOS)})")
+    parser.add_argument("--sizes", help="학생 수 (쉼표 구분, 예: 1000,2000,4000) - 지정하면 모든 시나리오에 사용")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help=f"크기별 반복 횟수 (기본 {DEFAULT_REPEATS})")
+    parser.add_argument("--tolerance", type=float,
+                        help=f"허용 초과 지수 - 지정하면 모든 시나리오에 사용 "
+                             f"(기본 {DEFAULT_TOLERANCE}, 유사도 시나리오 {SIMILARITY_TOLERANCE})")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("-q", "--quiet", action="store_true", help="크기별 측정값을 출력하지 않음")
+    args = parser.parse_args(argv)
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    try:
+        unknown = [name for name in args.scenarios if name not in SCENARIOS]
+        if unknown:
+            raise ValueError(f"알 수 없는 시나리오입니다: {', '.join(unknown)} (가능: {', '.join(SCENARIOS)})")
+        if args.repeats < 1:
+            raise ValueError("--repeats는 1 이상이어야 합니다.")
+        sizes = None
+        if args.sizes:
+            try:
+                sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+            except ValueError:
+                raise ValueError(f"학생 수가 숫자가 아닙니다: {args.sizes}")
+            if any(n < 8 for n in sizes):
+                raise ValueError("학생 수는 8 이상이어야 합니다.")
+
+        results = []
+        for scenario in args.scenarios or list(SCENARIOS):
+            results.append(run_scenario(scenario, sizes, args.repeats, args.tolerance, log))
+    except (ValueError, OSError, ImportError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    for result in results:
+        status = "통과" if result["passed"] else "기준 초과"
+        print(f"{result['scenario']}: 지수 {result['exponent']:.2f} (기준 {result['model']} 대비 초과 "
+              f"{result['excess_exponent']:+.2f}, 허용 {result['tolerance']:.2f}) - {status}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "machine": platform.machine(),
+                "processor": platform.processor(),
+                "results": results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+    return EXIT_OK if all(result["passed"] for result in results) else EXIT_TOO_SLOW
+
+
+if __name__ == "__main__":
+    sys.exit(main())
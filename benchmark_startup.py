@@ -0,0 +1,160 @@
+"""
+프로그램 시작 시간 측정 (첫 창이 화면에 뜰 때까지)
+
+GUI를 새 프로세스로 여러 번 실행하여 "프로세스 시작 → 첫 창(메인 창 또는 비밀번호 창)이 그려짐"까지의
+시간을 재고, 그 시점에 pandas/numpy 같은 무거운 모듈이 이미 불러와졌는지도 함께 보고합니다.
+GUI는 DORMITORY_STARTUP_REPORT 환경 변수가 있으면 첫 창을 그린 직후 기록을 남기고 스스로 종료합니다.
+
+사용 예:
+    python benchmark_startup.py                         # 두 GUI 스크립트를 각각 5회 측정
+    python benchmark_startup.py --runs 10 gui_app.py
+    python benchmark_startup.py --exe dist/gui_app.exe  # PyInstaller로 만든 실행 파일 측정
+    python benchmark_startup.py --json startup.json     # 결과를 JSON으로 저장
+
+화면(디스플레이)이 있는 환경에서 실행해야 합니다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from gui_tasks import STARTUP_REPORT_ENV
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCRIPTS = ["gui_app.py", "gui_app_third_grade.py"]
+
+# 첫 창이 뜨지 않을 때 기다리는 최대 시간 (초)
+RUN_TIMEOUT_SEC = 120
+
+
+def measure_once(command):
+    """
+    GUI를 한 번 실행하여 첫 창이 뜰 때까지의 시간 측정
+
+    Args:
+        command: 실행할 명령 리스트
+
+    Returns:
+        dict: seconds (첫 창까지 걸린 시간), heavy_modules_loaded, window_title
+    """
+    fd, report_path = tempfile.mkstemp(suffix=".json", prefix="startup_")
+    os.close(fd)
+    os.remove(report_path)
+
+    env = dict(os.environ)
+    env[STARTUP_REPORT_ENV] = report_path
+
+    try:
+        start = time.time()
+        completed = subprocess.run(
+            command,
+            cwd=BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=RUN_TIMEOUT_SEC
+        )
+        if not os.path.exists(report_path):
+            detail = (completed.stderr or completed.stdout or "").strip().splitlines()
+            raise RuntimeError(
+                f"첫 창이 기록되지 않았습니다 (종료 코드 {completed.returncode}): "
+                + (detail[-1] if detail else "출력 없음")
+            )
+
+        with open(report_path, "r", encoding="utf-8") as f:
+            report = json.load(f)
+    finally:
+        if os.path.exists(report_path):
+            os.remove(report_path)
+
+    return {
+        "seconds": report["first_window_time"] - start,
+        "heavy_modules_loaded": report["heavy_modules_loaded"],
+        "window_title": report["window_title"],
+    }
+
+
+def measure_import(module_name):
+    """새 인터프리터에서 GUI 모듈 import에 걸리는 시간 (초)"""
+    code = (
+        "import time; t = time.perf_counter(); "
+        f"import {module_name}; print(time.perf_counter() - t)"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return float(completed.stdout.strip())
+
+
+def benchmark(name, command, runs, module_name=None):
+    """대상 하나를 여러 번 측정하여 요약"""
+    samples = [measure_once(command) for _ in range(runs)]
+    seconds = [sample["seconds"] for sample in samples]
+
+    result = {
+        "target": name,
+        "runs": runs,
+        "first_window_sec": {
+            "min": min(seconds),
+            "median": statistics.median(seconds),
+            "max": max(seconds),
+        },
+        "window_title": samples[-1]["window_title"],
+        "heavy_modules_loaded": samples[-1]["heavy_modules_loaded"],
+    }
+    if module_name:
+        result["import_sec"] = statistics.median(measure_import(module_name) for _ in range(runs))
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="GUI 시작 시간(첫 창까지) 측정")
+    parser.add_argument("scripts", nargs="*", help=f"측정할 GUI 스크립트 (기본: {', '.join(DEFAULT_SCRIPTS)})")
+    parser.add_argument("--exe", action="append", default=[], help="측정할 실행 파일 (여러 번 지정 가능)")
+    parser.add_argument("--runs", type=int, default=5, help="대상별 실행 횟수 (기본 5)")
+    parser.add_argument("--json", dest="json_path", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    targets = []
+    scripts = args.scripts or ([] if args.exe else DEFAULT_SCRIPTS)
+    for script in scripts:
+        module_name = os.path.splitext(os.path.basename(script))[0]
+        targets.append((script, [sys.executable, script], module_name))
+    for exe in args.exe:
+        targets.append((exe, [os.path.abspath(exe)], None))
+
+    results = []
+    for name, command, module_name in targets:
+        try:
+            result = benchmark(name, command, args.runs, module_name)
+        except (RuntimeError, subprocess.SubprocessError, OSError) as e:
+            print(f"{name}: 측정 실패 - {e}", file=sys.stderr)
+            return 1
+        results.append(result)
+
+        window = result["first_window_sec"]
+        print(f"{name}")
+        print(f"  첫 창까지: 중앙값 {window['median']:.3f}초 (최소 {window['min']:.3f} / 최대 {window['max']:.3f}, {args.runs}회)")
+        if "import_sec" in result:
+            print(f"  모듈 import: {result['import_sec']:.3f}초")
+        loaded = ", ".join(result["heavy_modules_loaded"]) or "없음"
+        print(f"  첫 창 시점에 불러온 무거운 모듈: {loaded}")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
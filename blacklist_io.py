@@ -0,0 +1,96 @@
+"""
+배려 학생(블랙리스트) 조합 파일 불러오기 (CSV, Excel)
+
+파일 형식: 한 행에 학번을 두 개 이상 적습니다. 첫 번째 학번이 기준 학생이고,
+같은 행의 나머지 학번들은 모두 기준 학생과 같은 방에 배정되지 않습니다.
+
+    학번1,학번2,학번3
+    20230001,20230002
+    20230005,20230007,20230009      ← 20230005 ↔ 20230007, 20230005 ↔ 20230009
+
+머리글 행이나 숫자가 아닌 칸은 무시합니다. 수천 개의 조합도 numpy 연산으로 한 번에 처리합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+BLACKLIST_FILE_TYPES = [
+    ("CSV / Excel 파일", "*.csv *.xlsx *.xls"),
+    ("CSV 파일", "*.csv"),
+    ("Excel 파일", "*.xlsx *.xls"),
+    ("모든 파일", "*.*")
+]
+
+
+def _read_cells(file_path):
+    """파일의 모든 칸을 머리글 없이 읽기 (Excel은 모든 시트)"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".csv":
+        try:
+            return [pd.read_csv(file_path, header=None, dtype=str, encoding="utf-8-sig")]
+        except UnicodeDecodeError:
+            # 엑셀에서 저장한 CSV (cp949)
+            return [pd.read_csv(file_path, header=None, dtype=str, encoding="cp949")]
+    if ext in (".xlsx", ".xls"):
+        sheets = pd.read_excel(file_path, sheet_name=None, header=None, dtype=str)
+        return list(sheets.values())
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
+
+
+def blacklist_pairs_from_frame(frame):
+    """
+    한 행 = 기준 학번 + 대상 학번들인 표를 정렬된 (학번1, 학번2) 조합 배열로 변환
+
+    Args:
+        frame: 칸 값이 학번(문자열/숫자)인 DataFrame
+
+    Returns:
+        np.ndarray: (조합 수 x 2) int64 배열 - 학번1 < 학번2, 중복 없음
+    """
+    if frame.shape[0] == 0 or frame.shape[1] < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    values = frame.apply(lambda col: pd.to_numeric(col, errors="coerce")).to_numpy(dtype=float)
+    base = np.repeat(values[:, :1], values.shape[1] - 1, axis=1).reshape(-1)
+    targets = values[:, 1:].reshape(-1)
+
+    valid = ~np.isnan(base) & ~np.isnan(targets) & (base > 0) & (targets > 0) & (base != targets)
+    pairs = np.column_stack([base[valid], targets[valid]]).astype(np.int64)
+    pairs.sort(axis=1)
+    return np.unique(pairs, axis=0)
+
+
+def read_blacklist_file(file_path):
+    """
+    CSV/Excel 파일에서 블랙리스트 조합 읽기
+
+    Args:
+        file_path: 파일 경로 (.csv, .xlsx, .xls)
+
+    Returns:
+        np.ndarray: (조합 수 x 2) int64 배열 - 학번1 < 학번2, 중복 없음
+    """
+    pairs = [blacklist_pairs_from_frame(frame) for frame in _read_cells(file_path)]
+    pairs = np.vstack(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+    return np.unique(pairs, axis=0)
+
+
+def split_known_pairs(pairs, roster=None):
+    """
+    조합을 명단에 있는 학번끼리의 조합과 명단에 없는 학번이 포함된 조합으로 나누기
+
+    Args:
+        pairs: (조합 수 x 2) 학번 배열
+        roster: CompiledRoster (없으면 모두 유효한 것으로 간주)
+
+    Returns:
+        tuple: (valid_pairs, unknown_ids) - 유효한 조합 배열, 명단에 없는 학번 배열
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if roster is None or len(pairs) == 0:
+        return pairs, np.zeros(0, dtype=np.int64)
+
+    known = roster.indices_of(pairs) >= 0
+    valid = known.all(axis=1)
+    return pairs[valid], np.unique(pairs[~known])
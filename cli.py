@@ -0,0 +1,408 @@
+"""
+명령줄 방 배정 (GUI 없이 서버/배치에서 실행)
+
+사용 예:
+    python cli.py 명단.xlsx
+    python cli.py 1학년.xlsx 2학년.xlsx --factors "factor1, factor2" --weights factor2=2 --format csv,xlsx -o 결과
+    python cli.py 3학년.xlsx --policy third_grade --blacklist 배려학생.csv --restarts 20 --workers 4 --stats stats.json
+    python cli.py 명단.xlsx --history --semester 2025-2   # 결과를 배정 기록(SQLite)에도 저장
+    python cli.py 명단.xlsx --avoid-history 4 --history   # 최근 4학기 룸메이트와 다시 같은 방 금지
+    python cli.py 명단.xlsx --verify                      # 저장한 결과를 검증기(verifier.py)로 다시 확인
+
+입력 파일의 '학번' 컬럼이 있는 모든 시트를 각각 배정합니다 (CSV/Parquet 명단도 가능).
+--restarts N 이면 시드를 seed, seed+1, ... 로 바꿔 N번 배정하고 실패 좌석이 가장 적은
+(같으면 평균 방 유사도가 가장 높은) 결과를 저장합니다.
+
+종료 코드:
+    0 - 성공
+    1 - 입력/옵션 오류
+    2 - 어떤 시트의 실패 좌석 수가 --max-failures를 넘음 (결과 파일은 저장됨)
+    3 - --verify 검증에서 규칙 위반(error)이 발견됨 (결과 파일은 저장됨)
+"""
+import argparse
+import concurrent.futures
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+
+from allocation_compare import DEFAULT_SEED, ENGINE_MODULES, format_variant_spec, parse_variant_spec, run_variant
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_TOO_MANY_FAILURES = 2
+EXIT_VERIFY_FAILED = 3
+
+OUTPUT_FORMATS = ("csv", "jsonl", "parquet", "xlsx")
+
+
+def parse_weights(text):
+    """'factor1=2,factor2=0.5' → {'factor1': 2.0, 'factor2': 0.5}"""
+    weights = {}
+    for token in (text or "").split(","):
+        token = token.strip()
+        if not token:
+            continue
+        name, sep, value = token.partition("=")
+        if not sep:
+            raise ValueError(f"가중치는 factor=숫자 형식이어야 합니다: {token}")
+        try:
+            weights[name.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f"가중치가 숫자가 아닙니다: {token}")
+    return weights
+
+
+def parse_formats(values):
+    """['csv,xlsx', 'jsonl'] → ['csv', 'xlsx', 'jsonl']"""
+    formats = []
+    for value in values or ["csv"]:
+        for fmt in value.split(","):
+            fmt = fmt.strip().lower()
+            if not fmt:
+                continue
+            if fmt == "json":
+                fmt = "jsonl"
+            if fmt not in OUTPUT_FORMATS:
+                raise ValueError(f"지원하지 않는 출력 형식입니다: {fmt} (가능: {', '.join(OUTPUT_FORMATS)})")
+            if fmt not in formats:
+                formats.append(fmt)
+    return formats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="생활관 호실 배정 (명령줄)",
+        epilog="종료 코드: 0 성공, 1 입력/옵션 오류, 2 실패 좌석 수가 --max-failures 초과, 3 --verify 규칙 위반"
+    )
+    parser.add_argument("inputs", nargs="+", help="학생 명단 파일 (xlsx, csv, parquet)")
+    parser.add_argument("--policy", choices=sorted(ENGINE_MODULES), default="regular",
+                        help="배정 정책: regular (이전 좌석 번호 고려), third_grade (3학년용)")
+    parser.add_argument("--factors", default="",
+                        help="유사도 배정에 사용할 factor (예: 'factor1, factor2*2' - *숫자는 가중치)")
+    parser.add_argument("--weights", default="", help="factor 가중치 (예: 'factor1=2,factor2=0.5')")
+    parser.add_argument("--blacklist", help="블랙리스트 조합 파일 (CSV/Excel, 한 행 = 기준 학번 + 대상 학번들)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"난수 시드 (기본 {DEFAULT_SEED})")
+    parser.add_argument("--restarts", type=int, default=1, help="시드를 바꿔 다시 배정할 횟수 - 가장 좋은 결과 사용 (기본 1)")
+    parser.add_argument("--workers", type=int, default=1, help="동시에 실행할 프로세스 수 (기본 1)")
+    parser.add_argument("-o", "--output-dir", default=".", help="결과 파일을 저장할 폴더 (기본: 현재 폴더)")
+    parser.add_argument("--format", action="append", dest="formats",
+                        help=f"출력 형식 ({', '.join(OUTPUT_FORMATS)}), 쉼표로 여러 개 지정 가능 (기본 csv)")
+    parser.add_argument("--stats", help="단계별 시간과 배정 결과 요약을 저장할 JSON 파일 경로")
+    parser.add_argument("--max-failures", type=int, default=0,
+                        help="시트별 허용 실패 좌석 수 - 넘으면 종료 코드 2 (기본 0)")
+    parser.add_argument("--avoid-history", type=int, default=0, metavar="K",
+                        help="배정 기록(--history DB 또는 기본 기록 파일)의 최근 K학기 룸메이트와 다시 같은 방 금지")
+    parser.add_argument("--avoid-results", nargs="+", default=[], metavar="FILE",
+                        help="지난 배정 결과 파일(엑셀/CSV/JSON Lines/Parquet)의 룸메이트와 다시 같은 방 금지")
+    parser.add_argument("--similarity-cache", metavar="DIR",
+                        help="유사도 표를 저장해 두고 다음 실행/작업 프로세스에서 재사용할 폴더")
+    parser.add_argument("--history", nargs="?", const="", metavar="DB",
+                        help="배정 기록(SQLite)에 결과 저장 - 경로를 생략하면 기본 기록 파일")
+    parser.add_argument("--semester", help="배정 기록에 저장할 학기 이름 (기본: 오늘 날짜 기준, 예: 2025-1)")
+    parser.add_argument("--verify", action="store_true",
+                        help="배정 결과를 검증기로 다시 확인 (중복/미배정/금지 조합/좌석 교대) - 위반 시 종료 코드 3")
+    parser.add_argument("-q", "--quiet", action="store_true", help="진행 상황을 출력하지 않음")
+    return parser
+
+
+def load_inputs(paths, log):
+    """입력 파일들을 읽어 [(파일, 시트, CompiledRoster), ...] 반환"""
+    from roster import load_workbook
+
+    rosters = []
+    for path in paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"입력 파일을 찾을 수 없습니다: {path}")
+        for sheet_name, roster in load_workbook(path).items():
+            log(f"불러옴: {path} [{sheet_name}] - 학생 {roster.num_students}명")
+            rosters.append((path, sheet_name, roster))
+    return rosters
+
+
+def _score(result):
+    """재시작 결과 비교 기준: 실패 좌석이 적을수록, 평균 방 유사도가 높을수록 좋음"""
+    mean_similarity = result["mean_similarity"]
+    if mean_similarity is None or math.isnan(mean_similarity):
+        mean_similarity = -math.inf
+    return (result["failed"], -mean_similarity)
+
+
+def run_allocations(rosters, policy, spec, blacklist_pairs, seed, restarts, workers, log, history_pairs=None):
+    """
+    시트마다 restarts번 배정하여 가장 좋은 결과 선택 (history_pairs: 지난 학기 룸메이트 조합 배열)
+
+    Returns:
+        list: 시트별 (best_result, 재시작별 실행 시간 리스트)
+    """
+    evaluation_factors = parse_variant_spec(spec)[0]
+    jobs = [
+        (index, seed + restart)
+        for index in range(len(rosters))
+        for restart in range(restarts)
+    ]
+    results = [[None] * restarts for _ in rosters]
+
+    def collect(index, job_seed, result):
+        results[index][job_seed - seed] = result
+        path, sheet_name, _ = rosters[index]
+        log(f"배정 완료: {path} [{sheet_name}] 시드 {job_seed} - 실패 {result['failed']}개, {result['seconds']:.2f}초")
+
+    if workers > 1 and len(jobs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    run_variant, policy, spec, blacklist_pairs, job_seed, evaluation_factors, rosters[index][2],
+                    history_pairs=history_pairs
+                ): (index, job_seed)
+                for index, job_seed in jobs
+            }
+            for future in concurrent.futures.as_completed(futures):
+                index, job_seed = futures[future]
+                collect(index, job_seed, future.result())
+    else:
+        for index, job_seed in jobs:
+            result = run_variant(policy, spec, blacklist_pairs, job_seed, evaluation_factors, rosters[index][2],
+                                 history_pairs=history_pairs)
+            collect(index, job_seed, result)
+
+    selected = []
+    for runs in results:
+        best = min(runs, key=_score)  # 같으면 먼저 실행한(작은) 시드
+        best = dict(best, seed=seed + runs.index(best))
+        selected.append((best, [run["seconds"] for run in runs]))
+    return selected
+
+
+def output_stem(path, sheet_name, sheet_count):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if sheet_count > 1:
+        stem = f"{stem}_{sheet_name}"
+    return f"{stem}_배정결과"
+
+
+def write_outputs(result, roster, output_dir, stem, formats, quality_report=None):
+    """배정 결과를 지정한 형식들로 저장하고 저장한 파일 경로 리스트 반환 (xlsx에는 품질 보고서 시트 포함)"""
+    import pandas as pd
+    from quality_report import quality_report_frames
+    from result_io import export_result, result_to_frame
+
+    os.makedirs(output_dir, exist_ok=True)
+    name_map = roster.name_map()
+    written = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{stem}.{fmt}")
+        if fmt == "xlsx":
+            with pd.ExcelWriter(path, engine="openpyxl") as writer:
+                result_to_frame(result["room_id"], name_map).to_excel(writer, sheet_name="방 배정 결과", index=False)
+                pd.DataFrame({"실패 좌석": result["failed_students"]}).to_excel(writer, sheet_name="배정 실패", index=False)
+                if quality_report is not None:
+                    quality_df, distribution_df, rooms_df = quality_report_frames(quality_report)
+                    quality_df.to_excel(writer, sheet_name="배정 품질", index=False)
+                    distribution_df.to_excel(writer, sheet_name="배정 품질", index=False, startrow=len(quality_df) + 2)
+                    rooms_df.to_excel(writer, sheet_name="방별 품질", index=False)
+        else:
+            export_result(result["room_id"], path, fmt=fmt, student_name_map=name_map)
+        written.append(path)
+    return written
+
+
+def json_number(value):
+    """JSON에 쓸 숫자 (NaN/None → None - 표준 JSON에는 NaN이 없으므로 null로 저장)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def quality_summary(report):
+    """품질 보고서 요약을 JSON으로 저장할 수 있게 변환 (NaN → null)"""
+    summary = dict(report["summary"])
+    summary["similarity_percentiles"] = {
+        str(p): json_number(v) for p, v in summary["similarity_percentiles"].items()
+    }
+    for key, value in summary.items():
+        if isinstance(value, float):
+            summary[key] = json_number(value)
+    summary["violations"] = report["violations"]
+    summary["similarity_distribution"] = report["distribution"]["counts"]
+    return summary
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    def log(message):
+        if not args.quiet:
+            print(message, file=sys.stderr)
+
+    total_start = time.perf_counter()
+    timings = {}
+
+    if args.similarity_cache:
+        # 작업 프로세스도 같은 폴더를 쓰도록 환경 변수로 전달
+        from similarity_cache import SIMILARITY_CACHE_DIR_ENV
+        os.environ[SIMILARITY_CACHE_DIR_ENV] = os.path.abspath(args.similarity_cache)
+
+    try:
+        if args.restarts < 1:
+            raise ValueError("--restarts는 1 이상이어야 합니다.")
+        if args.workers < 1:
+            raise ValueError("--workers는 1 이상이어야 합니다.")
+        formats = parse_formats(args.formats)
+        selected_factors, factor_weights = parse_variant_spec(args.factors)
+        factor_weights = dict(factor_weights or {})
+        factor_weights.update(parse_weights(args.weights))
+        unknown_weights = [name for name in factor_weights if name not in selected_factors]
+        if unknown_weights:
+            raise ValueError(f"--factors에 없는 factor의 가중치입니다: {', '.join(unknown_weights)}")
+        spec = format_variant_spec(selected_factors, factor_weights)
+
+        start = time.perf_counter()
+        rosters = load_inputs(args.inputs, log)
+        timings["load_sec"] = time.perf_counter() - start
+
+        for path, sheet_name, roster in rosters:
+            missing = [name for name in selected_factors if name not in roster.factor_names]
+            if missing:
+                log(f"경고: {path} [{sheet_name}]에 없는 factor는 무시합니다: {', '.join(missing)}")
+
+        blacklist_pairs = []
+        if args.blacklist:
+            from blacklist_io import read_blacklist_file
+            start = time.perf_counter()
+            blacklist_pairs = [tuple(pair) for pair in read_blacklist_file(args.blacklist).tolist()]
+            timings["blacklist_sec"] = time.perf_counter() - start
+            log(f"블랙리스트 {len(blacklist_pairs)}개 조합")
+
+        history_pairs = None
+        if args.avoid_history < 0:
+            raise ValueError("--avoid-history는 0 이상이어야 합니다.")
+        if args.avoid_history or args.avoid_results:
+            from history_store import previous_roommate_pairs
+            start = time.perf_counter()
+            history_pairs = previous_roommate_pairs(
+                args.avoid_history, args.avoid_results, args.history or None, args.semester
+            )
+            timings["history_sec"] = time.perf_counter() - start
+            log(f"이전 룸메이트 {len(history_pairs)}개 조합 (최근 {args.avoid_history}학기 기록, 결과 파일 {len(args.avoid_results)}개)")
+    except (ValueError, OSError, ImportError, sqlite3.Error) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    start = time.perf_counter()
+    selected = run_allocations(
+        rosters, args.policy, spec, blacklist_pairs, args.seed, args.restarts, args.workers, log, history_pairs
+    )
+    timings["allocate_sec"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sheet_counts = {}
+    for path, _, _ in rosters:
+        sheet_counts[path] = sheet_counts.get(path, 0) + 1
+
+    exit_code = EXIT_OK
+    input_stats = []
+    history = None
+    try:
+        from quality_report import compute_quality_report
+
+        if args.history is not None:
+            from history_store import HistoryStore, file_sha256
+            history = HistoryStore(args.history or None)
+
+        for (path, sheet_name, roster), (result, restart_seconds) in zip(rosters, selected):
+            stem = output_stem(path, sheet_name, sheet_counts[path])
+            quality = compute_quality_report(
+                result["room_id"], roster, result["factors"], blacklist_pairs, history_pairs,
+                result["failed_students"], seat_rotation=args.policy == "regular"
+            )
+            outputs = write_outputs(result, roster, args.output_dir, stem, formats, quality)
+
+            over_limit = result["failed"] > args.max_failures
+            if over_limit:
+                exit_code = EXIT_TOO_MANY_FAILURES
+
+            verification = None
+            if args.verify:
+                from verifier import format_findings, verify_assignment
+                verification = verify_assignment(
+                    roster, result["room_id"], blacklist_pairs, history_pairs,
+                    seat_rotation=args.policy == "regular", max_findings=100
+                )
+                log(format_findings(verification, limit=10))
+                if not verification["ok"] and exit_code == EXIT_OK:
+                    exit_code = EXIT_VERIFY_FAILED
+
+            print(f"{path} [{sheet_name}]: 방 {len(result['room_id'])}개, 실패 {result['failed']}개 (시드 {result['seed']})"
+                  + (" - 허용 실패 수 초과" if over_limit else ""))
+            for failed in result["failed_students"]:
+                print(f"  - {failed}")
+
+            if history is not None:
+                run_id = history.record_run(
+                    result["room_id"],
+                    semester=args.semester,
+                    source=path,
+                    sheet=sheet_name,
+                    input_sha256=file_sha256(path),
+                    policy=args.policy,
+                    factors=spec,
+                    seed=result["seed"],
+                    params={"blacklist_pairs": len(blacklist_pairs), "restarts": args.restarts},
+                    timings={"allocate_sec": restart_seconds},
+                    failed_students=result["failed_students"]
+                )
+                log(f"배정 기록 저장: {history.path} (실행 {run_id})")
+
+            input_stats.append({
+                "file": path,
+                "sheet": sheet_name,
+                "students": roster.num_students,
+                "rooms": len(result["room_id"]),
+                "failed": result["failed"],
+                "failed_seats": result["failed_students"],
+                "over_failure_limit": over_limit,
+                "mean_similarity": json_number(result["mean_similarity"]),
+                "min_similarity": json_number(result["min_similarity"]),
+                "seed": result["seed"],
+                "restart_seconds": restart_seconds,
+                "quality": quality_summary(quality),
+                "verification": verification,
+                "outputs": outputs,
+            })
+    except (ValueError, OSError, ImportError, sqlite3.Error) as e:
+        print(f"오류: 결과 저장 실패 - {e}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        if history is not None:
+            history.close()
+    timings["export_sec"] = time.perf_counter() - start
+    timings["total_sec"] = time.perf_counter() - total_start
+
+    if args.stats:
+        stats = {
+            "policy": args.policy,
+            "factors": selected_factors,
+            "weights": factor_weights or None,
+            "blacklist_pairs": len(blacklist_pairs),
+            "history_pairs": len(history_pairs) if history_pairs is not None else 0,
+            "seed": args.seed,
+            "restarts": args.restarts,
+            "workers": args.workers,
+            "max_failures": args.max_failures,
+            "exit_code": exit_code,
+            "timings": timings,
+            "inputs": input_stats,
+        }
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2)
+        log(f"통계 저장: {args.stats}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
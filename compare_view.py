@@ -0,0 +1,274 @@
+"""
+factor 비교 모드 창
+
+여러 factor 조합/가중치를 한 줄에 하나씩 입력하면 같은 명단으로 동시에 배정해 보고
+실패 좌석 수, 방 유사도(평균/최소), 실행 시간을 나란히 보여줍니다.
+마음에 드는 변형을 선택해 현재 배정 결과로 적용할 수 있습니다.
+"""
+import math
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext
+
+from allocation_compare import compare_variants, format_variant_spec, parse_variant_spec
+from gui_tasks import BackgroundTask
+
+# (컬럼 키, 헤더 텍스트, 폭)
+COMPARE_COLUMNS = [
+    ("spec", "변형 (factor*가중치)", 320),
+    ("failed", "실패 좌석", 90),
+    ("mean_similarity", "평균 방 유사도", 120),
+    ("min_similarity", "최소 방 유사도", 120),
+    ("seconds", "실행 시간(초)", 110),
+]
+
+
+def default_variant_specs(available_factors, selected_factors=None):
+    """기본 비교 변형: 현재 선택, 모든 factor, factor 하나씩"""
+    specs = []
+    if selected_factors:
+        specs.append(format_variant_spec(selected_factors))
+    if available_factors:
+        specs.append(format_variant_spec(available_factors))
+        specs.extend(available_factors)
+    # 중복 제거 (순서 유지)
+    return list(dict.fromkeys(specs))
+
+
+def _fmt_similarity(value):
+    return "-" if value is None or math.isnan(value) else f"{value:.3f}"
+
+
+def compare_table_row(result):
+    """compare_variants 결과 하나 → 비교 표 한 행 (COMPARE_COLUMNS 순서, 오류가 난 변형은 실패 행)"""
+    spec = result["spec"] or "(유사도 미사용)"
+    if "error" in result:
+        return (spec, "오류", "-", "-", "-")
+    return (
+        spec,
+        result["failed"],
+        _fmt_similarity(result["mean_similarity"]),
+        _fmt_similarity(result["min_similarity"]),
+        f"{result['seconds']:.2f}",
+    )
+
+
+def _compare_worker(roster, specs, policy, blacklist_pairs, history_semesters=0,
+                    progress_callback=None, cancel_event=None):
+    """작업 스레드에서 실행: 최근 학기 룸메이트 기록을 읽은 뒤 변형 비교 → (결과 리스트, 기록 조합)"""
+    history_pairs = None
+    if history_semesters > 0:
+        from history_store import previous_roommate_pairs
+        progress_callback(f"최근 {history_semesters}학기 룸메이트 기록 읽는 중...", 0.0)
+        history_pairs = previous_roommate_pairs(history_semesters)
+
+    results = compare_variants(
+        roster, specs, policy, blacklist_pairs,
+        progress_callback=progress_callback, cancel_event=cancel_event, history_pairs=history_pairs
+    )
+    return results, history_pairs
+
+
+class CompareWindow:
+    """
+    factor 비교 모드 창 (Toplevel)
+
+    Args:
+        root: Tk 루트 창
+        roster: 비교에 사용할 CompiledRoster
+        policy: "regular" 또는 "third_grade"
+        blacklist_pairs: 블랙리스트 조합 리스트
+        available_factors: 명단에서 사용할 수 있는 factor 리스트
+        selected_factors: 현재 체크된 factor 리스트
+        on_promote: on_promote(roster, result, history_pairs, history_semesters) - 선택한 변형을 현재 결과로 적용할 때 호출
+            (history_pairs는 그 변형을 배정할 때 피한 지난 학기 룸메이트 조합, 없으면 None)
+        history_semesters: 최근 몇 학기 룸메이트와 다시 같은 방이 되지 않게 할지 (0이면 사용 안 함)
+        font: 기본 글꼴 이름
+    """
+
+    def __init__(self, root, roster, policy, blacklist_pairs, available_factors, selected_factors,
+                 on_promote, history_semesters=0, font=("맑은 고딕",)):
+        self.root = root
+        self.roster = roster
+        self.policy = policy
+        self.blacklist_pairs = list(blacklist_pairs)
+        self.history_semesters = history_semesters
+        self.history_pairs = None  # 마지막 비교에 사용한 룸메이트 기록 조합
+        self.on_promote = on_promote
+        self.task = None
+        self.results = []
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Factor 비교 모드")
+        self.window.geometry("820x620")
+        self.window.columnconfigure(0, weight=1)
+        self.window.rowconfigure(0, weight=1)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        container = ttk.Frame(self.window, padding="20")
+        container.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        container.columnconfigure(0, weight=1)
+        container.rowconfigure(4, weight=1)
+
+        ttk.Label(
+            container,
+            text="한 줄에 변형 하나씩 입력하세요. 예) factor1, factor2*2  (*숫자는 가중치, 빈 줄은 무시)",
+            font=(font[0], 9)
+        ).grid(row=0, column=0, sticky=tk.W, pady=(0, 8))
+
+        self.spec_text = scrolledtext.ScrolledText(container, height=7, font=(font[0], 10))
+        self.spec_text.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.spec_text.insert(tk.END, "\n".join(default_variant_specs(available_factors, selected_factors)))
+
+        button_frame = ttk.Frame(container)
+        button_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(12, 12))
+        button_frame.columnconfigure(2, weight=1)
+
+        self.run_button = ttk.Button(button_frame, text="▶ 비교 실행", command=self.run, width=14)
+        self.run_button.grid(row=0, column=0, padx=(0, 10))
+
+        self.cancel_button = ttk.Button(button_frame, text="취소", command=self.cancel, width=8, state="disabled")
+        self.cancel_button.grid(row=0, column=1, padx=(0, 10))
+
+        self.progress = ttk.Progressbar(button_frame, mode="determinate", maximum=1.0)
+        self.progress.grid(row=0, column=2, sticky=(tk.W, tk.E))
+
+        self.status_var = tk.StringVar(value=f"{roster.num_students}명 명단 · 같은 시드로 변형들을 동시에 배정합니다")
+        ttk.Label(container, textvariable=self.status_var, font=(font[0], 9)).grid(row=3, column=0, sticky=tk.W)
+
+        table_frame = ttk.Frame(container)
+        table_frame.grid(row=4, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=(8, 12))
+        table_frame.columnconfigure(0, weight=1)
+        table_frame.rowconfigure(0, weight=1)
+
+        self.table = ttk.Treeview(
+            table_frame,
+            columns=[key for key, _, _ in COMPARE_COLUMNS],
+            show="headings",
+            height=10,
+            selectmode="browse"
+        )
+        for key, heading, width in COMPARE_COLUMNS:
+            self.table.heading(key, text=heading)
+            self.table.column(key, width=width, anchor=tk.W if key == "spec" else tk.CENTER)
+        self.table.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        table_scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
+        table_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.table.configure(yscrollcommand=table_scrollbar.set)
+
+        self.promote_button = ttk.Button(
+            container,
+            text="✔ 선택한 변형을 현재 배정 결과로 적용",
+            command=self.promote,
+            state="disabled",
+            width=36
+        )
+        self.promote_button.grid(row=5, column=0)
+
+    def _specs(self):
+        lines = [line.strip() for line in self.spec_text.get(1.0, tk.END).splitlines()]
+        return list(dict.fromkeys(line for line in lines if line))
+
+    def run(self):
+        if self.task is not None and self.task.running:
+            return
+
+        specs = self._specs()
+        if not specs:
+            messagebox.showwarning("경고", "비교할 변형을 입력해주세요.", parent=self.window)
+            return
+
+        # factor 이름/가중치 확인 (명단에 없는 factor는 실행 전에 알려줌)
+        for spec in specs:
+            try:
+                factors, _ = parse_variant_spec(spec)
+            except ValueError as e:
+                messagebox.showerror("오류", str(e), parent=self.window)
+                return
+            missing = [name for name in factors if name not in self.roster.factor_names]
+            if missing:
+                messagebox.showerror("오류", f"명단에 없는 factor입니다: {', '.join(missing)}", parent=self.window)
+                return
+
+        self.table.delete(*self.table.get_children())
+        self.results = []
+        self.progress["value"] = 0
+        self.run_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.promote_button.config(state="disabled")
+        self.status_var.set(f"비교 중... 0/{len(specs)}개 변형 완료")
+
+        self.task = BackgroundTask(
+            self.root,
+            _compare_worker,
+            self.roster,
+            specs,
+            self.policy,
+            self.blacklist_pairs,
+            self.history_semesters,
+            on_progress=self._on_progress,
+            on_done=self._on_done,
+            on_error=self._on_error,
+            on_cancel=self._on_done
+        ).start()
+
+    def cancel(self):
+        if self.task is not None and self.task.running:
+            self.task.cancel()
+            self.status_var.set("취소 중... (실행 중인 변형이 끝나면 중단)")
+
+    def close(self):
+        self.cancel()
+        self.window.destroy()
+
+    def _on_progress(self, message, fraction):
+        if not self.window.winfo_exists():
+            return
+        if fraction is not None:
+            self.progress["value"] = fraction
+        self.status_var.set(message)
+
+    def _on_done(self, payload):
+        if not self.window.winfo_exists():
+            return
+        self.run_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+
+        results, self.history_pairs = payload if payload is not None else (None, None)
+        self.results = [result for result in results or [] if result is not None]
+
+        for index, result in enumerate(self.results):
+            self.table.insert("", tk.END, iid=str(index), values=compare_table_row(result))
+
+        errors = [result for result in self.results if "error" in result]
+        skipped = len(results or []) - len(self.results)
+        message = f"비교 완료: {len(self.results) - len(errors)}개 변형"
+        if errors:
+            message += f" (오류 {len(errors)}개 - {errors[0]['error']})"
+        if skipped:
+            message += f" (취소되어 실행하지 않은 변형 {skipped}개)"
+        self.status_var.set(message + " - 변형을 선택한 뒤 적용할 수 있습니다")
+        if len(self.results) > len(errors):
+            self.promote_button.config(state="normal")
+
+    def _on_error(self, error):
+        if not self.window.winfo_exists():
+            return
+        self.run_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        self.progress["value"] = 0
+        self.status_var.set("오류 발생")
+        messagebox.showerror("오류", f"비교 중 오류가 발생했습니다:\n{str(error)}", parent=self.window)
+
+    def promote(self):
+        selection = self.table.selection()
+        if not selection:
+            messagebox.showwarning("경고", "적용할 변형을 선택해주세요.", parent=self.window)
+            return
+        result = self.results[int(selection[0])]
+        if "error" in result:
+            messagebox.showwarning("경고", f"오류가 난 변형은 적용할 수 없습니다:\n{result['error']}", parent=self.window)
+            return
+        if self.on_promote(self.roster, result, self.history_pairs, self.history_semesters) is False:
+            return
+        self.status_var.set(f"적용됨: {result['spec'] or '(유사도 미사용)'}")
@@ -1,67 +1,241 @@
 """
-테스트용 엑셀 파일 생성 스크립트
-100명의 학생 데이터를 생성하여 엑셀 파일로 저장
+테스트용 학생 명단 생성 스크립트
+
+실제 명단과 같은 컬럼(학번, 이름, 현재 좌석 번호, 배려 학생 N, 현재 룸메이트 1~3, factor)으로
+학생 N명(수백만 명까지)의 명단을 numpy로 한 번에 만들어 엑셀/CSV/Parquet로 저장합니다.
+벤치마크와 대용량 시험에 쓸 수 있도록 조건 밀도, factor 군집 정도, 배려 학생 컬럼 수,
+빈칸 비율, factor 척도를 조절할 수 있습니다.
+
+- 현재 룸메이트: 학생 중 --roommate-rate 비율을 지난 학기 4인실에 무작위로 넣고,
+  같은 방 학생을 현재 룸메이트로, 그 방 좌석 번호를 현재 좌석 번호로 채움 (서로 대칭)
+- 배려 학생: 컬럼마다 --avoid-rate 비율의 학생에게 무작위 학생 학번 (자기 자신 제외)
+- factor: --clusters K (0이면 균등 분포)개의 성향 중심 주위로 --cluster-spread 표준편차만큼 흩어진 1~척도 정수
 
 사용 방법:
     pip install pandas openpyxl numpy
-    python create_test_data.py
+    python create_test_data.py                                  # 100명 → test_data.xlsx
+    python create_test_data.py -n 1000000 -o 명단.csv --factors 6 --clusters 8 --avoid-columns 3
+    python create_test_data.py -n 200000 -o 명단.parquet --missing-rate 0.1 --roommate-rate 0.9
 """
-import pandas as pd
+import argparse
+import os
+import sys
+import time
+
 import numpy as np
-import random
-
-# 시드 설정 (재현 가능한 결과를 위해)
-random.seed(42)
-np.random.seed(42)
-
-# 100명의 학생 데이터 생성
-students_data = []
-
-for student_id in range(1, 101):
-    student = {
-        "StudentID": student_id,
-        "Prevloc": random.choice([1, 2, 3, 4]),  # 이전 좌석 위치
-        "Prev1": random.choice([0, random.randint(1, 100)]) if random.random() > 0.7 else 0,  # 이전 룸메이트1
-        "Prev2": random.choice([0, random.randint(1, 100)]) if random.random() > 0.8 else 0,  # 이전 룸메이트2
-        "Prev3": random.choice([0, random.randint(1, 100)]) if random.random() > 0.9 else 0,  # 이전 룸메이트3
-        "Avoid1": random.choice([0, random.randint(1, 100)]) if random.random() > 0.85 else 0,  # 회피 학생1
-        "Avoid2": random.choice([0, random.randint(1, 100)]) if random.random() > 0.9 else 0,  # 회피 학생2
-        
-        # 유사도 기반 배정을 위한 특성 (1~10 척도)
-        "ColdSensitivity": random.randint(1, 10),  # 추위 민감도 (1=추위 안탐, 10=추위 많이 탐)
-        "NoiseSensitivity": random.randint(1, 10),  # 소음 민감도 (1=소음 무관, 10=소음 매우 민감)
-        "LightSensitivity": random.randint(1, 10),  # 빛 민감도 (1=빛 무관, 10=빛 매우 민감)
-        "Cleanliness": random.randint(1, 10),  # 청결도 선호도 (1=무관, 10=매우 깔끔함)
-        "SocialLevel": random.randint(1, 10),  # 사교성 (1=내성적, 10=매우 사교적)
-        "StudyTime": random.randint(1, 10),  # 학습 시간 선호도 (1=짧음, 10=매우 길음)
-        "SleepTime": random.randint(1, 10),  # 수면 시간 선호도 (1=늦게, 10=일찍)
-    }
-    
-    # Prev1, Prev2, Prev3가 자기 자신이거나 0이 아닌 경우만 유지
-    if student["Prev1"] == student_id:
-        student["Prev1"] = 0
-    if student["Prev2"] == student_id:
-        student["Prev2"] = 0
-    if student["Prev3"] == student_id:
-        student["Prev3"] = 0
-    if student["Avoid1"] == student_id:
-        student["Avoid1"] = 0
-    if student["Avoid2"] == student_id:
-        student["Avoid2"] = 0
-    
-    students_data.append(student)
-
-# DataFrame 생성
-df = pd.DataFrame(students_data)
-
-# 엑셀 파일로 저장
-output_file = "test_data.xlsx"
-df.to_excel(output_file, index=False, engine='openpyxl')
-
-print(f"테스트 데이터 파일이 생성되었습니다: {output_file}")
-print(f"총 {len(df)}명의 학생 데이터가 포함되어 있습니다.")
-print("\n컬럼 정보:")
-print(df.columns.tolist())
-print("\n첫 5개 행 미리보기:")
-print(df.head())
+import pandas as pd
+
+# 엑셀 시트 최대 행 수 (머리글 제외)
+EXCEL_MAX_ROWS = 1048575
+
+ROOMMATE_COLUMNS = ["현재 룸메이트 1", "현재 룸메이트 2", "현재 룸메이트 3"]
+SEATS_PER_ROOM = 4
+
+DEFAULT_FIRST_ID = 20250001
+
+
+def _previous_rooms(rng, num_students, roommate_rate):
+    """
+    지난 학기 방 배정 생성
+
+    Returns:
+        tuple: (현재 좌석 번호 (0=없음), 현재 룸메이트 학생 행 번호 (학생 수 x 3, -1=없음))
+    """
+    seats = np.zeros(num_students, dtype=np.int8)
+    roommates = np.full((num_students, SEATS_PER_ROOM - 1), -1, dtype=np.int64)
+
+    returning = np.flatnonzero(rng.random(num_students) < roommate_rate)
+    rng.shuffle(returning)
+    num_rooms = -(-len(returning) // SEATS_PER_ROOM)
+    if num_rooms == 0:
+        return seats, roommates
+
+    rooms = np.full(num_rooms * SEATS_PER_ROOM, -1, dtype=np.int64)
+    rooms[:len(returning)] = returning
+    rooms = rooms.reshape(num_rooms, SEATS_PER_ROOM)
+
+    occupied = rooms >= 0
+    seats[rooms[occupied]] = (np.nonzero(occupied)[1] + 1).astype(np.int8)
+
+    # 좌석 i 학생의 룸메이트 = 같은 방의 나머지 좌석 (좌석 순서대로)
+    for seat in range(SEATS_PER_ROOM):
+        others = [s for s in range(SEATS_PER_ROOM) if s != seat]
+        students = rooms[:, seat]
+        present = students >= 0
+        roommates[students[present]] = rooms[present][:, others]
+    return seats, roommates
+
+
+def _nullable(values, missing):
+    """정수 배열 → 빈칸(missing)이 있는 pandas 정수 배열 (엑셀에서 빈 셀로 저장)"""
+    return pd.arrays.IntegerArray(np.asarray(values, dtype=np.int64), np.asarray(missing, dtype=bool))
+
+
+def _factor_values(rng, num_students, num_factors, scale, clusters, cluster_spread):
+    """1~scale 정수 factor 값 (학생 수 x factor 수, float64 - 빈칸을 NaN으로 넣을 수 있도록)"""
+    if clusters <= 0:
+        return rng.integers(1, scale + 1, size=(num_students, num_factors)).astype(np.float64)
+    centers = rng.uniform(1, scale, size=(clusters, num_factors))
+    membership = rng.integers(0, clusters, size=num_students)
+    values = centers[membership] + rng.normal(0.0, cluster_spread, size=(num_students, num_factors))
+    return np.clip(np.rint(values), 1, scale)
+
+
+def generate_roster(num_students=100, seed=42, num_factors=7, factor_names=None, factor_scale=5,
+                    clusters=0, cluster_spread=1.0, roommate_rate=0.6, avoid_columns=2, avoid_rate=0.1,
+                    missing_rate=0.05, first_id=DEFAULT_FIRST_ID, names=True):
+    """
+    테스트용 명단 DataFrame 생성
+
+    Args:
+        num_students: 학생 수
+        seed: 난수 시드 (같은 인자면 같은 명단)
+        num_factors: factor 컬럼 수 (factor_names를 주면 무시)
+        factor_names: factor 컬럼 이름 리스트 (None이면 factor1, factor2, ...)
+        factor_scale: factor 값 범위 1~factor_scale
+        clusters: factor 성향 군집 수 (0이면 균등 분포)
+        cluster_spread: 군집 중심 주위 표준편차 (작을수록 비슷한 학생끼리 뭉침)
+        roommate_rate: 지난 학기 방이 있는 학생 비율 (현재 룸메이트/현재 좌석 번호 밀도)
+        avoid_columns: 배려 학생 컬럼 수
+        avoid_rate: 배려 학생 컬럼별로 값이 있는 학생 비율
+        missing_rate: factor 값이 빈칸인 비율
+        first_id: 첫 학번 (이후 1씩 증가)
+        names: 이름 컬럼 포함 여부 (수백만 명이면 끄면 빨라짐)
+
+    Returns:
+        pd.DataFrame
+    """
+    if num_students < 1:
+        raise ValueError("학생 수는 1 이상이어야 합니다.")
+    if factor_scale < 2:
+        raise ValueError("factor 척도는 2 이상이어야 합니다.")
+    for label, rate in (("룸메이트 비율", roommate_rate), ("배려 학생 비율", avoid_rate), ("빈칸 비율", missing_rate)):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"{label}은 0~1 사이여야 합니다: {rate}")
+
+    rng = np.random.default_rng(seed)
+    ids = np.arange(first_id, first_id + num_students, dtype=np.int64)
+    if ids[-1] <= np.iinfo(np.int32).max:
+        ids = ids.astype(np.int32)
+
+    columns = {"학번": ids}
+    if names:
+        width = len(str(num_students))
+        columns["이름"] = np.char.add("학생", np.char.zfill(np.arange(1, num_students + 1).astype(str), width))
+
+    seats, roommate_rows = _previous_rooms(rng, num_students, roommate_rate)
+    columns["현재 좌석 번호"] = _nullable(seats, seats == 0)
+
+    # 배려 학생 컬럼은 '현재 룸메이트 3' 앞에 두어야 factor로 감지되지 않음
+    for k in range(1, avoid_columns + 1):
+        if num_students == 1:
+            columns[f"배려 학생 {k}"] = _nullable(ids, np.ones(1, dtype=bool))
+            continue
+        targets = rng.integers(0, num_students - 1, size=num_students)
+        targets += targets >= np.arange(num_students)  # 자기 자신 제외
+        columns[f"배려 학생 {k}"] = _nullable(ids[targets], rng.random(num_students) >= avoid_rate)
+
+    for k, name in enumerate(ROOMMATE_COLUMNS):
+        rows = roommate_rows[:, k]
+        columns[name] = _nullable(ids[np.maximum(rows, 0)], rows < 0)
+
+    # factor 컬럼은 '현재 룸메이트 3' 다음에 위치해야 자동 감지됨
+    if factor_names is None:
+        factor_names = [f"factor{k}" for k in range(1, num_factors + 1)]
+    factors = _factor_values(rng, num_students, len(factor_names), factor_scale, clusters, cluster_spread)
+    if missing_rate > 0:
+        factors[rng.random(factors.shape) < missing_rate] = np.nan
+    for k, name in enumerate(factor_names):
+        column = factors[:, k]
+        columns[name] = _nullable(np.nan_to_num(column), np.isnan(column))
+
+    return pd.DataFrame(columns)
+
+
+def _write_excel(frame, file_path, sheet_name):
+    """openpyxl write-only 모드로 저장 (pandas.to_excel보다 메모리를 적게 쓰고 빠름)"""
+    from openpyxl import Workbook
+
+    if len(frame) > EXCEL_MAX_ROWS:
+        raise ValueError(f"엑셀 시트는 최대 {EXCEL_MAX_ROWS}명까지 저장할 수 있습니다. CSV나 Parquet를 사용하세요.")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(list(frame.columns))
+    # 열 단위로 파이썬 값 리스트로 바꾼 뒤 행으로 묶음 (빈칸은 None)
+    column_values = [frame[name].astype(object).where(frame[name].notna(), None).tolist() for name in frame.columns]
+    for row in zip(*column_values):
+        sheet.append(row)
+    workbook.save(file_path)
+
+
+def write_roster(frame, file_path, sheet_name="Sheet1"):
+    """
+    명단 저장 (확장자로 형식 결정: .xlsx, .csv, .parquet)
+
+    Args:
+        frame: generate_roster 결과
+        file_path: 저장 경로
+        sheet_name: 엑셀 시트 이름
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".xlsx":
+        _write_excel(frame, file_path, sheet_name)
+    elif ext == ".csv":
+        # load_workbook이 utf-8-sig로 읽으므로 엑셀에서도 한글이 깨지지 않게 BOM 포함
+        frame.to_csv(file_path, index=False, encoding="utf-8-sig")
+    elif ext == ".parquet":
+        try:
+            frame.to_parquet(file_path, index=False)
+        except ImportError as e:
+            raise ImportError("Parquet 저장에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {ext} (.xlsx, .csv, .parquet)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="테스트용 학생 명단 생성")
+    parser.add_argument("-n", "--students", type=int, default=100, help="학생 수 (기본 100)")
+    parser.add_argument("-o", "--output", default="test_data.xlsx", help="저장 경로 (.xlsx, .csv, .parquet)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본 42)")
+    parser.add_argument("--factors", type=int, default=7, help="factor 컬럼 수 (기본 7)")
+    parser.add_argument("--factor-names", help="factor 컬럼 이름 (쉼표 구분, 지정하면 --factors 무시)")
+    parser.add_argument("--factor-scale", type=int, default=5, help="factor 값 범위 1~N (기본 5)")
+    parser.add_argument("--clusters", type=int, default=0, help="factor 성향 군집 수 (기본 0 = 균등 분포)")
+    parser.add_argument("--cluster-spread", type=float, default=1.0, help="군집 중심 주위 표준편차 (기본 1.0)")
+    parser.add_argument("--roommate-rate", type=float, default=0.6,
+                        help="지난 학기 방이 있는 학생 비율 - 현재 룸메이트 조건 밀도 (기본 0.6)")
+    parser.add_argument("--avoid-columns", type=int, default=2, help="배려 학생 컬럼 수 (기본 2)")
+    parser.add_argument("--avoid-rate", type=float, default=0.1, help="배려 학생 컬럼별 값이 있는 비율 (기본 0.1)")
+    parser.add_argument("--missing-rate", type=float, default=0.05, help="factor 빈칸 비율 (기본 0.05)")
+    parser.add_argument("--first-id", type=int, default=DEFAULT_FIRST_ID, help=f"첫 학번 (기본 {DEFAULT_FIRST_ID})")
+    parser.add_argument("--no-names", action="store_true", help="이름 컬럼 생략")
+    args = parser.parse_args(argv)
+
+    factor_names = None
+    if args.factor_names:
+        factor_names = [name.strip() for name in args.factor_names.split(",") if name.strip()]
+
+    try:
+        start = time.perf_counter()
+        df = generate_roster(
+            args.students, seed=args.seed, num_factors=args.factors, factor_names=factor_names,
+            factor_scale=args.factor_scale, clusters=args.clusters, cluster_spread=args.cluster_spread,
+            roommate_rate=args.roommate_rate, avoid_columns=args.avoid_columns, avoid_rate=args.avoid_rate,
+            missing_rate=args.missing_rate, first_id=args.first_id, names=not args.no_names
+        )
+        generated = time.perf_counter() - start
+        write_roster(df, args.output)
+        written = time.perf_counter() - start - generated
+    except (ValueError, OSError, ImportError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
+
+    print(f"테스트 데이터 파일이 생성되었습니다: {args.output}")
+    print(f"총 {len(df)}명 (생성 {generated:.2f}초, 저장 {written:.2f}초)")
+    print(f"컬럼: {df.columns.tolist()}")
+    return 0
+
 
+if __name__ == "__main__":
+    sys.exit(main())
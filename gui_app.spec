@@ -1,38 +1,91 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
 
+# 빌드 프로필 (DORMITORY_BUILD_PROFILE 환경 변수로 선택, 기본 onefile)
+#   onefile : 실행 파일 하나 - 배포가 간편하지만 실행할 때마다 임시 폴더에 압축을 풀어 시작이 느림
+#   onedir  : 폴더째 배포 - 압축 해제가 없어 시작이 가장 빠름 (dist/gui_app/gui_app.exe 실행)
+#   full    : 제외 모듈 없이 예전과 같은 onefile (문제 확인용)
+# 예) set DORMITORY_BUILD_PROFILE=onedir && pyinstaller gui_app.spec
+# 시작 시간 비교: python benchmark_startup.py --exe dist/gui_app.exe
+BUILD_PROFILE = os.environ.get('DORMITORY_BUILD_PROFILE', 'onefile')
+if BUILD_PROFILE not in ('onefile', 'onedir', 'full'):
+    raise SystemExit(f'알 수 없는 빌드 프로필입니다: {BUILD_PROFILE}')
+
+# 프로그램에서 쓰지 않는 모듈 (pandas/numpy가 선택적으로 불러오는 큰 패키지들)
+EXCLUDES = [
+    'matplotlib', 'scipy', 'IPython', 'jupyter_client', 'notebook', 'ipykernel',
+    'PyQt5', 'PyQt6', 'PySide2', 'PySide6', 'sphinx', 'pytest', 'tkinter.test',
+    'numba', 'numexpr', 'bottleneck', 'tables', 'sqlalchemy', 'psycopg2',
+    'lxml', 'bs4', 'html5lib', 'fsspec', 's3fs', 'gcsfs', 'botocore', 'boto3',
+    'zmq', 'tornado', 'jinja2', 'docutils', 'lib2to3', 'pydoc_data',
+]
+
+# 시작 시간을 줄이기 위해 GUI가 처음 파일을 불러올 때 불러오는 모듈들 (분석에서 빠지지 않도록 명시)
+HIDDEN_IMPORTS = [
+    'roster', 'result_io', 'result_search', 'blacklist_io', 'compare_view',
+    'allocation_compare', 'allocation_engine', 'allocation_engine_third_grade',
+]
 
 a = Analysis(
     ['gui_app.py'],
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=HIDDEN_IMPORTS,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=[] if BUILD_PROFILE == 'full' else EXCLUDES,
     noarchive=False,
     optimize=0,
 )
 pyz = PYZ(a.pure)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.datas,
-    [],
-    name='gui_app',
-    debug=False,
-    bootloader_ignore_signals=False,
-    strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
-    console=False,
-    disable_windowed_traceback=False,
-    argv_emulation=False,
-    target_arch=None,
-    codesign_identity=None,
-    entitlements_file=None,
-)
+if BUILD_PROFILE == 'onedir':
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name='gui_app',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,  # UPX로 압축한 DLL은 불러올 때마다 풀어야 하므로 시작이 느려짐
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='gui_app',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name='gui_app',
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=True,
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console=False,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
@@ -2,13 +2,25 @@ import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
 import sys
+import time
+import random as rd
+import multiprocessing
 import hashlib
 import base64
 import ctypes
 from ctypes import wintypes, byref, POINTER, c_char, c_void_p
-import pandas as pd
 from datetime import datetime
-from allocation_engine_third_grade import allocate_rooms
+from gui_tasks import STARTUP_REPORT_ENV, BackgroundTask, preload_modules, write_startup_report
+from allocation_control import format_eta
+from result_view import VirtualResultTable
+
+# 비교 모드에서 사용할 배정 정책 (allocation_compare.ENGINE_MODULES)
+ALLOCATION_POLICY = "third_grade"
+ENGINE_MODULE = "allocation_engine_third_grade"
+
+# pandas/numpy를 쓰는 모듈들 - 비밀번호 창과 메인 창이 바로 뜨도록 시작 시에는 불러오지 않고
+# 처음 파일을 불러올 때 작업 스레드에서 한 번에 불러옴
+DEFERRED_MODULES = ("roster", "result_io", "result_search", "blacklist_io", "compare_view", ENGINE_MODULE)
 
 # 플랫폼별 폰트 설정
 if sys.platform == "win32":
@@ -387,19 +399,39 @@ class DormitoryAllocationGUI:
         # 선택된 파일 경로
         self.selected_file = None
         
-        # 블랙리스트 조합 저장 (튜플의 리스트)
-        self.blacklist_pairs = []
+        # 배정 작업 (작업 스레드에서 실행)
+        self.allocation_task = None
+        
+        # 미리 분석해 둔 학생 명단 (불러오기 완료 후 설정됨)
+        self.rosters = {}  # 시트 이름 → 명단 (여러 시트 통합 문서 지원)
+        self.roster = None  # 현재 선택된 시트의 명단
+        self.load_task = None
+
+        # 블랙리스트 조합 저장 ((작은 학번, 큰 학번) 튜플의 set - 중복 확인이 즉시 끝남)
+        self.blacklist_pairs = set()
+        self.blacklist_display_pairs = []  # 목록에 표시된 순서 (삭제 시 선택 위치 → 조합)
+        self.history_semesters_var = tk.IntVar(value=0)  # 룸메이트 기록을 피할 최근 학기 수
         # 한 학생에 여러 명을 배려 대상으로 추가하기 위한 임시 저장
         self.blacklist_group_targets = []
         
         # 배정 결과 저장 (나중에 엑셀로 저장하기 위해)
         self.current_room_id = None
         self.current_failed_students = None
+        self.current_selected_factors = None  # 배정에 사용한 factor 리스트
+        self.current_factor_weights = None  # 배정에 사용한 factor 가중치 (비교 모드에서 적용한 경우)
+        self.current_seed = None  # 배정에 사용한 난수 시드 (배정 기록용)
+        self.current_allocation_seconds = None  # 엔진 배정 시간 (초, 배정 기록용)
+        self.current_history_semesters = 0  # 배정할 때 룸메이트 기록을 피한 최근 학기 수
         self.student_name_map = {}  # 학번-이름 매핑 딕셔너리
+        self.search_index = None  # 배정 결과 검색 색인 (학번/이름 → 방/좌석)
+        self.current_quality_report = None  # 배정 품질 보고서 (품질 탭, 엑셀 '배정 품질' 시트)
+        self.search_matches = []  # 현재 검색어에 일치하는 좌석 행 번호
+        self.search_cursor = -1  # Enter로 이동 중인 검색 결과 위치
         
         # Factor 체크박스 변수들
         self.factor_vars = {}
         self.available_factors = []
+        self.factor_ranges = {}  # factor별 (최소값, 최대값)
         
         # 스크롤 가능한 메인 UI 구성
         self.setup_scrollable_ui()
@@ -555,10 +587,54 @@ class DormitoryAllocationGUI:
         )
         browse_button.grid(row=0, column=2)
         
+        self.load_cancel_button = ttk.Button(
+            file_select_frame,
+            text="취소",
+            command=self.cancel_file_load,
+            state="disabled",
+            width=8
+        )
+        self.load_cancel_button.grid(row=0, column=3, padx=(10, 0))
+        
+        # 불러오기 진행 상황 및 명단 요약
+        load_status_frame = ttk.Frame(control_frame)
+        load_status_frame.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E))
+        load_status_frame.columnconfigure(0, weight=1)
+        
+        self.load_progress = ttk.Progressbar(load_status_frame, mode="determinate", maximum=1.0)
+        self.load_progress.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        
+        self.roster_summary_var = tk.StringVar(value="")
+        ttk.Label(
+            load_status_frame,
+            textvariable=self.roster_summary_var,
+            font=(DEFAULT_FONT_SMALL[0], 9)
+        ).grid(row=1, column=0, sticky=tk.W, pady=(8, 0))
+        
+        # 시트 선택 (학년별로 시트를 나눈 통합 문서인 경우)
+        sheet_select_frame = ttk.Frame(load_status_frame)
+        sheet_select_frame.grid(row=2, column=0, sticky=tk.W, pady=(8, 0))
+        
+        ttk.Label(
+            sheet_select_frame,
+            text="시트:",
+            font=(DEFAULT_FONT_SMALL[0], 10)
+        ).grid(row=0, column=0, padx=(0, 10))
+        
+        self.sheet_var = tk.StringVar()
+        self.sheet_combobox = ttk.Combobox(
+            sheet_select_frame,
+            textvariable=self.sheet_var,
+            state="disabled",
+            width=30
+        )
+        self.sheet_combobox.grid(row=0, column=1)
+        self.sheet_combobox.bind("<<ComboboxSelected>>", self._on_sheet_selected)
+        
         # 실행 버튼 영역
         button_frame = ttk.Frame(control_frame)
-        button_frame.grid(row=1, column=0, columnspan=3, pady=(15, 0))
-        
+        button_frame.grid(row=2, column=0, columnspan=3, pady=(15, 0))
+
         self.run_button = ttk.Button(
             button_frame,
             text="▶ 배정 실행",
@@ -566,7 +642,30 @@ class DormitoryAllocationGUI:
             state="disabled",
             width=25
         )
-        self.run_button.pack()
+        self.run_button.grid(row=0, column=0)
+        
+        self.run_cancel_button = ttk.Button(
+            button_frame,
+            text="■ 배정 취소",
+            command=self.cancel_allocation,
+            state="disabled",
+            width=15
+        )
+        self.run_cancel_button.grid(row=0, column=1, padx=(10, 0))
+        
+        # factor 조합/가중치 비교 모드 (여러 변형을 동시에 배정해 보고 하나를 적용)
+        self.compare_button = ttk.Button(
+            button_frame,
+            text="🔬 Factor 비교",
+            command=self.open_compare_window,
+            state="disabled",
+            width=15
+        )
+        self.compare_button.grid(row=0, column=2, padx=(10, 0))
+        
+        # 배정 진행 상황 (채운 방 수, 남은 학생 수, 예상 남은 시간)
+        self.run_progress = ttk.Progressbar(button_frame, mode="determinate", maximum=1.0, length=400)
+        self.run_progress.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(10, 0))
         
         # 블랙리스트 관리 섹션
         blacklist_frame = ttk.LabelFrame(
@@ -655,14 +754,57 @@ class DormitoryAllocationGUI:
         self.blacklist_listbox.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         scrollbar.config(command=self.blacklist_listbox.yview)
         
-        # 삭제 버튼
+        # 삭제 / 파일 가져오기 버튼
+        list_button_frame = ttk.Frame(list_frame)
+        list_button_frame.grid(row=1, column=0, pady=(15, 0))
+        
         delete_button = ttk.Button(
-            list_frame,
+            list_button_frame,
             text="선택 항목 삭제",
             command=self.remove_blacklist_pair,
             width=18
         )
-        delete_button.grid(row=1, column=0, pady=(15, 0))
+        delete_button.grid(row=0, column=0, padx=(0, 10))
+        
+        clear_button = ttk.Button(
+            list_button_frame,
+            text="전체 삭제",
+            command=self.clear_blacklist_pairs,
+            width=12
+        )
+        clear_button.grid(row=0, column=1, padx=(0, 10))
+        
+        import_button = ttk.Button(
+            list_button_frame,
+            text="📂 파일에서 가져오기 (CSV/Excel)",
+            command=self.import_blacklist_file,
+            width=30
+        )
+        import_button.grid(row=0, column=2)
+        
+        # 지난 학기 룸메이트 회피 (배정 기록 기준)
+        history_frame = ttk.Frame(blacklist_frame)
+        history_frame.grid(row=3, column=0, columnspan=4, sticky=tk.W, pady=(15, 0))
+        
+        ttk.Label(
+            history_frame,
+            text="이전 룸메이트와 다시 같은 방 금지: 최근",
+            font=(DEFAULT_FONT_SMALL[0], 10)
+        ).grid(row=0, column=0, padx=(0, 8))
+        
+        ttk.Spinbox(
+            history_frame,
+            from_=0,
+            to=20,
+            width=4,
+            textvariable=self.history_semesters_var
+        ).grid(row=0, column=1, padx=(0, 8))
+        
+        ttk.Label(
+            history_frame,
+            text="학기 (배정 기록 기준, 0이면 현재 룸메이트만 확인)",
+            font=(DEFAULT_FONT_SMALL[0], 9)
+        ).grid(row=0, column=2)
         
         # Factor 선택 섹션
         factor_frame = ttk.LabelFrame(
@@ -723,23 +865,48 @@ class DormitoryAllocationGUI:
         room_frame = ttk.Frame(notebook, padding="20")
         notebook.add(room_frame, text="📋 방 배정 결과")
         room_frame.columnconfigure(0, weight=1)
-        room_frame.rowconfigure(0, weight=1)
+        room_frame.rowconfigure(1, weight=1)
+        
+        # 검색 (학번/이름 입력 즉시 일치하는 좌석 강조, Enter로 다음 결과로 이동)
+        search_frame = ttk.Frame(room_frame)
+        search_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 10))
+        search_frame.columnconfigure(3, weight=1)
+        
+        ttk.Label(search_frame, text="🔍 학번/이름 검색:", font=(DEFAULT_FONT_SMALL[0], 10)).grid(row=0, column=0, padx=(0, 10))
         
-        # 스크롤 가능한 텍스트 영역 (내부 탭은 자체 스크롤 보유)
-        self.room_text = scrolledtext.ScrolledText(
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.update_search())
+        search_entry = ttk.Entry(
+            search_frame,
+            textvariable=self.search_var,
+            width=25,
+            font=(DEFAULT_FONT_SMALL[0], 10)
+        )
+        search_entry.grid(row=0, column=1, padx=(0, 10))
+        search_entry.bind("<Return>", lambda event: self.goto_next_search_match())
+        
+        self.search_filter_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            search_frame,
+            text="일치하는 좌석만 보기",
+            variable=self.search_filter_var,
+            command=self.update_search
+        ).grid(row=0, column=2, padx=(0, 10))
+        
+        self.search_result_var = tk.StringVar(value="")
+        ttk.Label(
+            search_frame,
+            textvariable=self.search_result_var,
+            font=(DEFAULT_FONT_SMALL[0], 9)
+        ).grid(row=0, column=3, sticky=tk.W)
+        
+        # 배정 결과 표 (보이는 행만 그리는 가상 스크롤 표, 헤더 클릭 시 정렬)
+        self.result_table = VirtualResultTable(
             room_frame,
-            wrap=tk.WORD,
-            width=95,
-            height=32,
-            font=(DEFAULT_FONT_SMALL[0], 10),
-            relief=tk.FLAT,
-            borderwidth=1
+            visible_rows=25,
+            font=(DEFAULT_FONT_SMALL[0], 10)
         )
-        try:
-            self.room_text.configure(bg="white")
-        except:
-            pass
-        self.room_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.result_table.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # 탭 2: 실패 목록
         failed_frame = ttk.Frame(notebook, padding="20")
@@ -765,6 +932,27 @@ class DormitoryAllocationGUI:
                 pass
         self.failed_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        # 탭 3: 배정 품질
+        quality_frame = ttk.Frame(notebook, padding="20")
+        notebook.add(quality_frame, text="📊 배정 품질")
+        quality_frame.columnconfigure(0, weight=1)
+        quality_frame.rowconfigure(0, weight=1)
+        
+        self.quality_text = scrolledtext.ScrolledText(
+            quality_frame,
+            wrap=tk.NONE,
+            width=95,
+            height=32,
+            font=(DEFAULT_FONT_SMALL[0], 10),
+            relief=tk.FLAT,
+            borderwidth=1
+        )
+        try:
+            self.quality_text.configure(bg="white")
+        except:
+            pass
+        self.quality_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
         # 상태바
         status_frame = ttk.Frame(self.main_frame)
         status_frame.grid(row=5, column=0, sticky=(tk.W, tk.E), pady=(20, 0))
@@ -791,33 +979,152 @@ class DormitoryAllocationGUI:
         )
         
         if file_path:
+            # 이전 불러오기가 진행 중이면 취소
+            if self.load_task is not None and self.load_task.running:
+                self.load_task.cancel()
+            
             self.selected_file = file_path
+            self.rosters = {}
+            self.roster = None
+            self.sheet_combobox.config(values=[], state="disabled")
+            self.sheet_var.set("")
             filename = os.path.basename(file_path)
             self.file_path_var.set(filename)
-            self.run_button.config(state="normal")
             
-            # Factor 컬럼 감지 및 체크박스 생성
-            self.detect_and_create_factor_checkboxes(file_path)
+            # 명단이 준비될 때까지 배정 실행 불가
+            self.run_button.config(state="disabled")
+            self.compare_button.config(state="disabled")
+            self.load_cancel_button.config(state="normal")
+            self.load_progress["value"] = 0
+            self.roster_summary_var.set("")
+            self.status_var.set(f"파일 불러오는 중: {filename}")
             
-            self.status_var.set(f"✓ 파일 선택됨: {filename} - Factor를 선택하고 배정 실행 버튼을 클릭하세요")
+            # 파일 읽기/factor 감지/요약은 작업 스레드에서 실행 (창이 멈추지 않도록)
+            self.load_task = BackgroundTask(
+                self.root,
+                self._load_worker,
+                file_path,
+                on_progress=self._on_load_progress,
+                on_done=self._on_load_done,
+                on_error=self._on_load_error,
+                on_cancel=self._on_load_cancelled
+            ).start()
+    
+    @staticmethod
+    def _load_worker(file_path, progress_callback=None, cancel_event=None):
+        """작업 스레드에서 실행: 처음 한 번 pandas/numpy/엔진 모듈을 불러온 뒤 명단 읽기"""
+        progress_callback("프로그램 구성 요소 불러오는 중...", None)
+        preload_modules(DEFERRED_MODULES)
+        
+        from roster import RosterLoadCancelled, load_workbook
+        try:
+            return load_workbook(file_path, progress_callback=progress_callback, cancel_event=cancel_event)
+        except RosterLoadCancelled:
+            return None  # cancel_event가 설정되어 있으므로 취소로 처리됨
     
-    def detect_and_create_factor_checkboxes(self, file_path):
-        """엑셀 파일에서 factor 컬럼들을 감지하고 체크박스 생성
+    def cancel_file_load(self):
+        """진행 중인 파일 불러오기 취소"""
+        if self.load_task is not None and self.load_task.running:
+            self.load_task.cancel()
+            self.status_var.set("파일 불러오기 취소 중...")
+    
+    def _on_load_progress(self, message, fraction):
+        if fraction is not None:
+            self.load_progress["value"] = fraction
+        self.status_var.set(message)
+    
+    def _on_load_done(self, rosters):
+        # 그 사이 다른 파일이 선택된 경우 무시
+        first_roster = next(iter(rosters.values()))
+        if first_roster.source != self.selected_file:
+            return
+        
+        self.rosters = rosters
+        self.load_cancel_button.config(state="disabled")
+        self.load_progress["value"] = 1.0
+        
+        # 시트가 여러 개면 시트 선택 가능
+        sheet_names = list(rosters)
+        self.sheet_combobox.config(
+            values=sheet_names,
+            state="readonly" if len(sheet_names) > 1 else "disabled"
+        )
+        self.sheet_var.set(sheet_names[0])
+        self.select_roster_sheet(sheet_names[0])
+    
+    def _on_sheet_selected(self, event=None):
+        sheet_name = self.sheet_var.get()
+        if sheet_name in self.rosters:
+            self.select_roster_sheet(sheet_name)
+    
+    def select_roster_sheet(self, sheet_name):
+        """불러온 시트 중 하나를 배정 대상으로 선택 (파일을 다시 읽지 않음)"""
+        roster = self.rosters[sheet_name]
+        self.roster = roster
+        
+        # 시트가 바뀌면 이전 배정 결과는 더 이상 유효하지 않음
+        self.current_room_id = None
+        self.current_failed_students = None
+        self.save_button.config(state="disabled")
+        self.result_table.clear()
+        self.search_index = None
+        self.update_search()
+        
+        # Factor 체크박스 생성
+        self.create_factor_checkboxes(roster.factor_ranges)
+        
+        summary = roster.summary
+        summary_text = (
+            f"학생 {summary['학생 수']}명 · 방 {summary['방 수']}개 · 빈 좌석 {summary['빈 좌석 수']}개 · "
+            f"이전 룸메이트 보유 {summary['이전 룸메이트 보유 학생 수']}명 · "
+            f"배려 학생 보유 {summary['배려 학생 보유 학생 수']}명"
+        )
+        if summary["중복 학번 수"]:
+            summary_text += f" · ⚠ 중복 학번 {summary['중복 학번 수']}개"
+        if summary["누락된 필수 컬럼"]:
+            summary_text += f" · ⚠ 누락 컬럼: {', '.join(summary['누락된 필수 컬럼'])}"
+        self.roster_summary_var.set(summary_text)
+        
+        # 배정이 실행 중이면 끝날 때까지 배정 버튼은 비활성 (_finish_allocation_task에서 다시 켬)
+        if self.allocation_task is None or not self.allocation_task.running:
+            self.run_button.config(state="normal")
+        self.compare_button.config(state="normal")
+        filename = os.path.basename(roster.source)
+        if len(self.rosters) > 1:
+            filename = f"{filename} [{sheet_name}]"
+        self.status_var.set(f"✓ 파일 선택됨: {filename} - Factor를 선택하고 배정 실행 버튼을 클릭하세요")
+    
+    def _on_load_error(self, error):
+        self.load_cancel_button.config(state="disabled")
+        self.load_progress["value"] = 0
+        messagebox.showerror("오류", f"파일을 불러오는 중 오류가 발생했습니다:\n{str(error)}")
+        self.status_var.set("파일 불러오기 실패")
+    
+    def _on_load_cancelled(self, _result):
+        # 새 파일 불러오기가 시작된 경우에는 상태를 덮어쓰지 않음
+        if self.load_task is not None and self.load_task.running:
+            return
+        self.load_cancel_button.config(state="disabled")
+        self.load_progress["value"] = 0
+        self.selected_file = None
+        self.file_path_var.set("파일을 선택해주세요")
+        self.status_var.set("파일 불러오기가 취소되었습니다")
+    
+    def create_factor_checkboxes(self, factor_ranges):
+        """감지된 factor 컬럼들로 체크박스 생성
         '현재 룸메이트 3' 컬럼 이후의 모든 컬럼 중에서
-        실수 또는 정수형 데이터를 가진 컬럼을 factor로 인식"""
+        실수 또는 정수형 데이터를 가진 컬럼을 factor로 인식 (roster.detect_factor_columns)"""
         try:
             # 기존 체크박스 제거
             for widget in self.factor_checkbox_frame.winfo_children():
                 widget.destroy()
             self.factor_vars.clear()
             self.available_factors.clear()
+            self.factor_ranges.clear()
             
-            # 엑셀 파일 읽기 (데이터 타입 확인을 위해 여러 행 읽기)
-            df = pd.read_excel(file_path)
-            
-            # "현재 룸메이트 3" 컬럼의 인덱스 찾기
-            target_column = "현재 룸메이트 3"
-            if target_column not in df.columns:
+            from roster import FACTOR_ANCHOR_COLUMN
+            target_column = FACTOR_ANCHOR_COLUMN
+            if factor_ranges is None:
                 # "현재 룸메이트 3" 컬럼이 없으면 안내 메시지
                 no_column_label = ttk.Label(
                     self.factor_checkbox_frame,
@@ -828,36 +1135,8 @@ class DormitoryAllocationGUI:
                 no_column_label.grid(row=0, column=0, sticky=tk.W)
                 return
             
-            # "현재 룸메이트 3" 컬럼의 인덱스 찾기
-            target_idx = df.columns.get_loc(target_column)
-            
-            # "현재 룸메이트 3" 이후의 모든 컬럼 확인
-            for col_idx in range(target_idx + 1, len(df.columns)):
-                col_name = df.columns[col_idx]
-                
-                # 해당 컬럼의 데이터 타입 확인
-                col_data = df[col_name].dropna()
-                
-                if len(col_data) == 0:
-                    continue  # 데이터가 없으면 스킵
-                
-                # pandas의 숫자형 타입인지 확인
-                is_numeric = pd.api.types.is_numeric_dtype(df[col_name])
-                
-                # 숫자형이 아니더라도 모든 값이 실수 또는 정수로 변환 가능한지 확인
-                if not is_numeric:
-                    is_numeric = True
-                    for value in col_data:
-                        try:
-                            # 실수 또는 정수로 변환 가능한지 확인
-                            float(value)
-                        except (ValueError, TypeError):
-                            is_numeric = False
-                            break
-                
-                # 실수 또는 정수형 데이터인 경우 factor로 추가
-                if is_numeric:
-                    self.available_factors.append(col_name)
+            self.factor_ranges.update(factor_ranges)
+            self.available_factors.extend(factor_ranges.keys())
             
             if self.available_factors:
                 # 체크박스 생성 (3열로 배치)
@@ -869,9 +1148,11 @@ class DormitoryAllocationGUI:
                     var = tk.BooleanVar(value=True)  # 기본적으로 모두 체크
                     self.factor_vars[factor] = var
                     
+                    # 컬럼 이름과 값 범위 표시 (예: 추위 민감도 (1~5))
+                    col_min, col_max = self.factor_ranges[factor]
                     checkbox = ttk.Checkbutton(
                         self.factor_checkbox_frame,
-                        text=factor,
+                        text=f"{factor} ({col_min:g}~{col_max:g})",
                         variable=var
                     )
                     checkbox.grid(row=row, column=col, sticky=tk.W, padx=15, pady=8)
@@ -895,6 +1176,22 @@ class DormitoryAllocationGUI:
             )
             error_label.grid(row=0, column=0, sticky=tk.W)
     
+    def _check_blacklist_ids(self, *student_ids):
+        """
+        블랙리스트에 추가할 학번 확인 (불러온 명단의 학번 색인 기준)
+        
+        Returns:
+            str: 문제가 있으면 경고 메시지, 없으면 None
+        """
+        for student_id in student_ids:
+            if student_id < 1:
+                return "학번은 1 이상의 숫자여야 합니다."
+        if self.roster is not None:
+            unknown = [str(s) for s, row in zip(student_ids, self.roster.indices_of(list(student_ids)).tolist()) if row < 0]
+            if unknown:
+                return f"명단에 없는 학번입니다: {', '.join(unknown)}"
+        return None
+    
     def add_blacklist_pair(self):
         """블랙리스트 조합 추가
         - 학생 ID 1 한 명에 대해
@@ -907,9 +1204,10 @@ class DormitoryAllocationGUI:
                 return
             student1 = int(student1_str)
             
-            # 기준 학생 범위 체크
-            if student1 < 1 or student1 > 100:
-                messagebox.showwarning("경고", "학생 ID는 1부터 100 사이의 숫자여야 합니다.")
+            # 기준 학생 확인
+            warning = self._check_blacklist_ids(student1)
+            if warning:
+                messagebox.showwarning("경고", warning)
                 return
             
             # + 버튼으로 누적된 대상들이 있으면 그것을 사용,
@@ -928,8 +1226,8 @@ class DormitoryAllocationGUI:
                     # 같은 학생은 스킵
                     continue
                 
-                if student2 < 1 or student2 > 100:
-                    # 범위 밖이면 스킵
+                if self._check_blacklist_ids(student2):
+                    # 명단에 없으면 스킵
                     continue
                 
                 # 정렬하여 중복 체크
@@ -940,7 +1238,7 @@ class DormitoryAllocationGUI:
                     continue
                 
                 # 추가
-                self.blacklist_pairs.append(pair)
+                self.blacklist_pairs.add(pair)
                 added_count += 1
             
             if added_count == 0:
@@ -973,8 +1271,9 @@ class DormitoryAllocationGUI:
             
             student2 = int(student2_str)
             
-            if student2 < 1 or student2 > 100:
-                messagebox.showwarning("경고", "학생 ID는 1부터 100 사이의 숫자여야 합니다.")
+            warning = self._check_blacklist_ids(student2)
+            if warning:
+                messagebox.showwarning("경고", warning)
                 return
             
             # 이미 임시 목록에 있는지 체크
@@ -1002,104 +1301,308 @@ class DormitoryAllocationGUI:
             return
         
         index = selection[0]
-        removed_pair = self.blacklist_pairs.pop(index)
+        removed_pair = self.blacklist_display_pairs[index]
+        self.blacklist_pairs.discard(removed_pair)
         self.update_blacklist_display()
         self.status_var.set(f"블랙리스트 삭제됨: 학생{removed_pair[0]} ↔ 학생{removed_pair[1]} (총 {len(self.blacklist_pairs)}개)")
     
+    def clear_blacklist_pairs(self):
+        """블랙리스트 조합 전체 삭제"""
+        if not self.blacklist_pairs:
+            return
+        if not messagebox.askyesno("확인", f"블랙리스트 조합 {len(self.blacklist_pairs)}개를 모두 삭제할까요?"):
+            return
+        self.blacklist_pairs.clear()
+        self.update_blacklist_display()
+        self.status_var.set("블랙리스트 조합을 모두 삭제했습니다")
+    
+    def import_blacklist_file(self):
+        """CSV/Excel 파일에서 블랙리스트 조합을 한 번에 가져오기 (한 행 = 기준 학번 + 대상 학번들)"""
+        from blacklist_io import BLACKLIST_FILE_TYPES, read_blacklist_file, split_known_pairs
+
+        file_path = filedialog.askopenfilename(
+            title="블랙리스트 파일 선택",
+            filetypes=BLACKLIST_FILE_TYPES
+        )
+        if not file_path:
+            return
+        
+        try:
+            pairs = read_blacklist_file(file_path)
+        except Exception as e:
+            messagebox.showerror("오류", f"블랙리스트 파일을 읽는 중 오류가 발생했습니다:\n{str(e)}")
+            return
+        
+        # 불러온 명단의 학번 색인으로 확인 (명단에 없는 학번이 포함된 조합은 제외)
+        valid_pairs, unknown_ids = split_known_pairs(pairs, self.roster)
+        
+        before = len(self.blacklist_pairs)
+        self.blacklist_pairs.update(map(tuple, valid_pairs.tolist()))
+        added = len(self.blacklist_pairs) - before
+        duplicates = len(valid_pairs) - added
+        
+        # 목록은 가져오기가 끝난 뒤 한 번만 갱신
+        self.update_blacklist_display()
+        
+        message = f"새 조합 {added}개를 추가했습니다. (총 {len(self.blacklist_pairs)}개)"
+        if duplicates:
+            message += f"\n이미 있던 조합 {duplicates}개는 건너뛰었습니다."
+        if len(unknown_ids):
+            preview = ", ".join(str(s) for s in unknown_ids[:10].tolist())
+            if len(unknown_ids) > 10:
+                preview += " ..."
+            message += f"\n명단에 없는 학번 {len(unknown_ids)}개가 포함된 조합 {len(pairs) - len(valid_pairs)}개는 제외했습니다.\n({preview})"
+        messagebox.showinfo("블랙리스트 가져오기", message)
+        self.status_var.set(f"블랙리스트 가져오기 완료: {added}개 추가 (총 {len(self.blacklist_pairs)}개)")
+    
     def update_blacklist_display(self):
-        """블랙리스트 목록 업데이트"""
+        """블랙리스트 목록 업데이트 (항목이 많아도 insert 호출은 한 번)"""
+        self.blacklist_display_pairs = sorted(self.blacklist_pairs)
         self.blacklist_listbox.delete(0, tk.END)
-        for pair in self.blacklist_pairs:
-            self.blacklist_listbox.insert(tk.END, f"학생{pair[0]} ↔ 학생{pair[1]}")
+        if self.blacklist_display_pairs:
+            self.blacklist_listbox.insert(
+                tk.END,
+                *[f"학생{pair[0]} ↔ 학생{pair[1]}" for pair in self.blacklist_display_pairs]
+            )
             
     def run_allocation(self):
-        """배정 알고리즘 실행"""
-        if not self.selected_file:
+        """배정 알고리즘 실행 (작업 스레드에서 실행하고 진행 상황은 큐로 전달받음)"""
+        if not self.selected_file or self.roster is None:
             messagebox.showerror("오류", "파일을 선택해주세요.")
             return
-            
-        if not os.path.exists(self.selected_file):
-            messagebox.showerror("오류", "선택한 파일이 존재하지 않습니다.")
+        
+        if self.allocation_task is not None and self.allocation_task.running:
             return
         
+        # 선택된 factor들 추출
+        selected_factors = []
+        for factor, var in self.factor_vars.items():
+            if var.get():
+                selected_factors.append(factor)
+        
         try:
-            self.status_var.set("배정 중...")
-            self.root.update()
-            
-            # 선택된 factor들 추출
-            selected_factors = []
-            for factor, var in self.factor_vars.items():
-                if var.get():
-                    selected_factors.append(factor)
-            
-            # 배정 알고리즘 실행 (블랙리스트 및 선택된 factor 포함)
-            room_id, failed_students = allocate_rooms(
-                self.selected_file,
-                self.blacklist_pairs,
-                selected_factors if selected_factors else None
+            history_semesters = max(0, int(self.history_semesters_var.get()))
+        except (tk.TclError, ValueError):
+            messagebox.showerror("오류", "이전 룸메이트 회피 학기 수는 0 이상의 정수여야 합니다.")
+            return
+        
+        self.status_var.set("배정 중...")
+        self.run_button.config(state="disabled")
+        self.run_cancel_button.config(state="normal")
+        self.run_progress["value"] = 0
+        
+        # 배정 알고리즘 실행 (미리 불러온 명단, 블랙리스트 및 선택된 factor 포함)
+        self.allocation_task = BackgroundTask(
+            self.root,
+            self._allocation_worker,
+            self.roster,
+            sorted(self.blacklist_pairs),
+            selected_factors if selected_factors else None,
+            history_semesters,
+            on_progress=self._on_allocation_progress,
+            on_done=self._on_allocation_done,
+            on_error=self._on_allocation_error,
+            on_cancel=self._on_allocation_cancelled
+        ).start()
+    
+    @staticmethod
+    def _allocation_worker(roster, blacklist_pairs, selected_factors, history_semesters=0,
+                           progress_callback=None, cancel_event=None):
+        """작업 스레드에서 실행: 엔진 진행 보고를 (메시지, 진행률)로 바꿔서 전달"""
+        from allocation_engine_third_grade import allocate_rooms
+        from quality_report import compute_quality_report
+        from result_search import ResultSearchIndex
+        from result_view import build_result_rows
+        
+        # 최근 학기 룸메이트 기록 (이번 학기 기록은 제외)
+        history_pairs = None
+        if history_semesters > 0:
+            from history_store import previous_roommate_pairs
+            progress_callback(f"최근 {history_semesters}학기 룸메이트 기록 읽는 중...", 0.0)
+            history_pairs = previous_roommate_pairs(history_semesters)
+        
+        # 배정 기록에 남길 수 있도록 시드를 정해서 엔진에 전달 (같은 명단·설정·시드면 같은 결과)
+        seed = rd.randrange(2 ** 31)
+        start_time = time.perf_counter()
+        
+        def on_engine_progress(rooms_filled, total_rooms, students_remaining):
+            fraction = rooms_filled / total_rooms if total_rooms else 1.0
+            elapsed = time.perf_counter() - start_time
+            eta = elapsed / fraction * (1 - fraction) if fraction > 0 else None
+            progress_callback(
+                f"배정 중... 방 {rooms_filled}/{total_rooms} · 남은 학생 {students_remaining}명 · 남은 시간 {format_eta(eta)}",
+                fraction
             )
-            
-            # 엑셀 파일에서 학번-이름 매핑 생성
-            df = pd.read_excel(self.selected_file)
-            if "이름" in df.columns:
-                self.student_name_map = dict(zip(df["학번"], df["이름"]))
-            else:
-                # "이름" 컬럼이 없으면 학번만 사용
-                self.student_name_map = {sid: str(sid) for sid in df["학번"].dropna()}
-            
-            # 배정 결과 저장 (엑셀 저장용)
-            self.current_room_id = room_id
-            self.current_failed_students = failed_students
-            
-            # 결과 표시
-            self.display_results(room_id, failed_students)
-            
-            # 저장 버튼 활성화
-            self.save_button.config(state="normal")
-            
-            self.status_var.set(f"배정 완료! (실패: {len(failed_students)}개) - 엑셀로 저장 가능")
-            
-        except FileNotFoundError:
-            messagebox.showerror("오류", "파일을 찾을 수 없습니다.")
-            self.status_var.set("오류 발생")
-        except Exception as e:
-            messagebox.showerror("오류", f"배정 중 오류가 발생했습니다:\n{str(e)}")
-            self.status_var.set("오류 발생")
-            
-    def display_results(self, room_id, failed_students):
-        """배정 결과를 텍스트 영역에 표시"""
-        # 방 배정 결과 탭 초기화
-        self.room_text.delete(1.0, tk.END)
-        
-        # 방 배정 결과 출력
-        header = "=" * 85
-        self.room_text.insert(tk.END, header + "\n")
-        self.room_text.insert(tk.END, " " * 30 + "최종 방 배정 결과\n")
-        self.room_text.insert(tk.END, header + "\n\n")
-        
-        # 방 배정 결과를 표 형식으로 출력
-        for i, room in enumerate(room_id, start=1):
-            room_info = f"방 {i:2d}번"
-            seats_info = []
-            for seat_name in ["seat1", "seat2", "seat3", "seat4"]:
-                student_id = room[seat_name]
-                seat_num = seat_name.replace("seat", "")
-                if student_id:
-                    # 학번-이름 형식으로 출력
-                    student_name = self.student_name_map.get(student_id, str(student_id))
-                    if student_name != str(student_id):
-                        seats_info.append(f"좌석{seat_num}: {student_id}-{student_name}")
-                    else:
-                        seats_info.append(f"좌석{seat_num}: {student_id}")
-                else:
-                    seats_info.append(f"좌석{seat_num}: 빈자리  ")
-            
-            # 더 읽기 쉬운 형식으로 출력
-            self.room_text.insert(tk.END, f"{room_info:8s} │ {' │ '.join(seats_info)}\n")
-            
-            # 5개 방마다 구분선
-            if i % 5 == 0 and i < len(room_id):
-                self.room_text.insert(tk.END, "-" * 85 + "\n")
+        
+        room_id, failed_students = allocate_rooms(
+            roster,
+            blacklist_pairs,
+            selected_factors,
+            progress_callback=on_engine_progress,
+            cancel_token=cancel_event,
+            rng=rd.Random(seed),
+            history_pairs=history_pairs
+        )
+        allocate_seconds = time.perf_counter() - start_time
+        
+        # 결과 표에 쓸 좌석 단위 배열 (이름 조회, 방 유사도 계산)도 작업 스레드에서 준비
+        progress_callback("결과 표 준비 중...", 1.0)
+        result_rows = build_result_rows(room_id, roster, selected_factors)
+        search_index = ResultSearchIndex(result_rows)
+        quality_report = compute_quality_report(
+            room_id, roster, selected_factors, blacklist_pairs, history_pairs, failed_students,
+            seat_rotation=ALLOCATION_POLICY == "regular"
+        )
+        return (roster, selected_factors, room_id, failed_students, result_rows, search_index, quality_report,
+                seed, allocate_seconds, history_semesters)
+    
+    def cancel_allocation(self):
+        """진행 중인 배정 취소"""
+        if self.allocation_task is not None and self.allocation_task.running:
+            self.allocation_task.cancel()
+            self.status_var.set("배정 취소 중...")
+    
+    def _finish_allocation_task(self):
+        self.run_cancel_button.config(state="disabled")
+        if self.roster is not None:
+            self.run_button.config(state="normal")
+    
+    def _on_allocation_progress(self, message, fraction):
+        if fraction is not None:
+            self.run_progress["value"] = fraction
+        self.status_var.set(message)
+    
+    def _on_allocation_done(self, result):
+        self._finish_allocation_task()
+        (roster, selected_factors, room_id, failed_students, result_rows, search_index, quality_report,
+         seed, allocate_seconds, history_semesters) = result
+        
+        # 배정 중 다른 파일/시트로 바뀐 경우 결과 무시
+        if roster is not self.roster:
+            self.run_progress["value"] = 0
+            self.status_var.set("명단이 변경되어 이전 배정 결과를 무시했습니다")
+            return
+        
+        self.run_progress["value"] = 1.0
+        
+        # 학번-이름 매핑 (명단 배열을 그대로 조회, "이름" 컬럼이 없으면 학번만 사용)
+        self.student_name_map = roster.name_map()
+        
+        # 배정 결과 저장 (엑셀 저장용)
+        self.current_room_id = room_id
+        self.current_failed_students = failed_students
+        self.current_selected_factors = selected_factors
+        self.current_factor_weights = None
+        self.current_seed = seed
+        self.current_allocation_seconds = allocate_seconds
+        self.current_history_semesters = history_semesters
+        
+        # 결과 표시
+        self.display_results(room_id, failed_students, result_rows, search_index, quality_report)
+        
+        # 저장 버튼 활성화
+        self.save_button.config(state="normal")
+        
+        self.status_var.set(f"배정 완료! (실패: {len(failed_students)}개) - 엑셀로 저장 가능")
+    
+    def _on_allocation_error(self, error):
+        self._finish_allocation_task()
+        self.run_progress["value"] = 0
+        messagebox.showerror("오류", f"배정 중 오류가 발생했습니다:\n{str(error)}")
+        self.status_var.set("오류 발생")
+    
+    def _on_allocation_cancelled(self, result):
+        self._finish_allocation_task()
+        self.run_progress["value"] = 0
+        
+        # 엔진은 취소 시점까지 채운 부분 결과를 돌려줌 (현재 결과는 바꾸지 않음)
+        if result is not None:
+            room_id = result[2]
+            filled = sum(1 for room in room_id if all(room.values()))
+            self.status_var.set(f"배정이 취소되었습니다 (취소 시점까지 {filled}/{len(room_id)}개 방 완료)")
+        else:
+            self.status_var.set("배정이 취소되었습니다")
+
+    def open_compare_window(self):
+        """factor 비교 모드 창 열기 (현재 명단/블랙리스트/체크된 factor 기준)"""
+        from compare_view import CompareWindow
+
+        if self.roster is None:
+            messagebox.showerror("오류", "파일을 선택해주세요.")
+            return
+        
+        try:
+            history_semesters = max(0, int(self.history_semesters_var.get()))
+        except (tk.TclError, ValueError):
+            messagebox.showerror("오류", "이전 룸메이트 회피 학기 수는 0 이상의 정수여야 합니다.")
+            return
+        
+        selected_factors = [factor for factor, var in self.factor_vars.items() if var.get()]
+        CompareWindow(
+            self.root,
+            self.roster,
+            ALLOCATION_POLICY,
+            sorted(self.blacklist_pairs),
+            self.available_factors,
+            selected_factors,
+            on_promote=self.promote_compare_result,
+            history_semesters=history_semesters,
+            font=DEFAULT_FONT_SMALL
+        )
+    
+    def promote_compare_result(self, roster, result, history_pairs=None, history_semesters=0):
+        """
+        비교 모드에서 선택한 변형을 현재 배정 결과로 적용 (적용하지 못하면 False)
+        history_pairs: 변형을 배정할 때 피한 지난 학기 룸메이트 조합 (배정 품질 보고서에도 같은 조합 사용)
+        history_semesters: 변형을 배정할 때 룸메이트 기록을 피한 최근 학기 수 (배정 기록용)
+        """
+        if self.allocation_task is not None and self.allocation_task.running:
+            messagebox.showwarning("경고", "배정이 진행 중입니다. 끝난 뒤 다시 적용해주세요.")
+            return False
+        
+        # 비교 창을 연 뒤 다른 파일/시트로 바뀐 경우
+        if roster is not self.roster:
+            messagebox.showwarning("경고", "명단이 변경되어 이 비교 결과는 적용할 수 없습니다.")
+            return False
+        
+        # 변형의 factor로 체크박스 맞추기
+        for factor, var in self.factor_vars.items():
+            var.set(factor in result["factors"])
+        
+        self.student_name_map = self.roster.name_map()
+        self.current_room_id = result["room_id"]
+        self.current_failed_students = result["failed_students"]
+        self.current_selected_factors = result["factors"] or None
+        self.current_factor_weights = result["weights"]
+        self.current_seed = result["seed"]
+        self.current_allocation_seconds = result["seconds"]
+        self.current_history_semesters = history_semesters
+        
+        self.display_results(result["room_id"], result["failed_students"], history_pairs=history_pairs)
+        self.save_button.config(state="normal")
+        self.run_progress["value"] = 1.0
+        self.status_var.set(
+            f"비교 변형 적용됨: {result['spec'] or '(유사도 미사용)'} (실패: {result['failed']}개) - 엑셀로 저장 가능"
+        )
+    
+    def display_results(self, room_id, failed_students, result_rows=None, search_index=None, quality_report=None,
+                        history_pairs=None):
+        """
+        배정 결과를 결과 표, 실패 목록, 배정 품질 탭에 표시
+        (quality_report가 없으면 블랙리스트와 history_pairs(지난 학기 룸메이트 조합)로 여기서 계산)
+        """
+        from quality_report import compute_quality_report, format_quality_report
+        from result_search import ResultSearchIndex
+        from result_view import build_result_rows
+
+        # 방 배정 결과 표 (좌석 단위 배열, 작업 스레드에서 미리 만든 것이 있으면 그대로 사용)
+        if result_rows is None:
+            result_rows = build_result_rows(room_id, self.roster, self.current_selected_factors)
+        self.result_table.set_data(result_rows)
+        
+        # 검색 색인 교체 후 현재 검색어로 다시 검색
+        self.search_index = search_index if search_index is not None else ResultSearchIndex(result_rows)
+        self.update_search()
         
         # 배정 실패 목록 탭 초기화
         self.failed_text.delete(1.0, tk.END)
@@ -1110,17 +1613,71 @@ class DormitoryAllocationGUI:
             self.failed_text.insert(tk.END, f" " * 25 + f"배정 실패 좌석 목록 (총 {len(failed_students)}개)\n")
             self.failed_text.insert(tk.END, header + "\n\n")
             
-            for idx, failed in enumerate(failed_students, start=1):
-                self.failed_text.insert(tk.END, f"  {idx:2d}. {failed}\n")
+            # 한 번에 삽입 (실패 좌석이 많아도 insert 호출은 한 번)
+            failed_lines = [f"  {idx:2d}. {failed}" for idx, failed in enumerate(failed_students, start=1)]
+            self.failed_text.insert(tk.END, "\n".join(failed_lines) + "\n")
         else:
             header = "=" * 85
             self.failed_text.insert(tk.END, header + "\n")
             self.failed_text.insert(tk.END, " " * 30 + "✓ 배정 실패한 좌석이 없습니다!\n")
             self.failed_text.insert(tk.END, " " * 25 + "모든 학생이 성공적으로 배정되었습니다.\n")
             self.failed_text.insert(tk.END, header + "\n")
+        
+        # 배정 품질 탭 (비교 모드에서 적용한 결과처럼 보고서가 없으면 여기서 계산)
+        if quality_report is None:
+            quality_report = compute_quality_report(
+                room_id, self.roster, self.current_selected_factors, sorted(self.blacklist_pairs), history_pairs,
+                failed_students=failed_students, seat_rotation=ALLOCATION_POLICY == "regular"
+            )
+        self.current_quality_report = quality_report
+        self.quality_text.delete(1.0, tk.END)
+        self.quality_text.insert(tk.END, format_quality_report(quality_report) + "\n")
+    
+    def update_search(self):
+        """검색어가 바뀔 때마다 색인을 조회하여 일치하는 좌석 강조/필터"""
+        query = self.search_var.get().strip()
+        
+        if self.search_index is None or not query:
+            self.search_matches = []
+            self.search_cursor = -1
+            self.search_result_var.set("")
+            if self.result_table.rows is not None:
+                self.result_table.set_filter(None)
+                self.result_table.set_highlight([])
+            return
+        
+        matches = self.search_index.search(query)
+        self.search_matches = matches.tolist()
+        self.search_cursor = -1
+        
+        self.result_table.set_filter(matches if self.search_filter_var.get() else None)
+        self.result_table.set_highlight(self.search_matches)
+        
+        if not self.search_matches:
+            self.search_result_var.set("일치하는 학생이 없습니다")
+            return
+        
+        # 일치 건수와 첫 번째 결과의 위치 표시
+        room, seat = self.search_index.room_seat_of(self.search_matches[0])
+        if len(self.search_matches) == 1:
+            self.search_result_var.set(f"{room}번방 좌석{seat}")
+        else:
+            self.search_result_var.set(f"{len(self.search_matches)}건 일치 (첫 번째: {room}번방 좌석{seat}) - Enter: 다음 결과")
+        self.goto_next_search_match()
+    
+    def goto_next_search_match(self):
+        """검색 결과 중 다음 좌석으로 스크롤"""
+        if not self.search_matches:
+            return
+        self.search_cursor = (self.search_cursor + 1) % len(self.search_matches)
+        self.result_table.scroll_to_row(self.search_matches[self.search_cursor])
     
     def save_to_excel(self):
         """배정 결과를 엑셀 파일로 저장"""
+        import pandas as pd
+        from quality_report import quality_report_frames
+        from result_io import FORMAT_BY_EXTENSION
+
         if self.current_room_id is None:
             messagebox.showwarning("경고", "저장할 배정 결과가 없습니다.")
             return
@@ -1132,6 +1689,9 @@ class DormitoryAllocationGUI:
             defaultextension=".xlsx",
             filetypes=[
                 ("Excel files", "*.xlsx"),
+                ("CSV files", "*.csv"),
+                ("JSON Lines files", "*.jsonl"),
+                ("Parquet files", "*.parquet"),
                 ("All files", "*.*")
             ],
             initialfile=default_filename
@@ -1139,6 +1699,11 @@ class DormitoryAllocationGUI:
         
         if not file_path:
             return  # 사용자가 취소한 경우
+
+        # CSV / JSON Lines / Parquet는 서식 없이 좌석 단위 표로 빠르게 저장
+        if os.path.splitext(file_path)[1].lower() in FORMAT_BY_EXTENSION:
+            self.export_result_file(file_path)
+            return
         
         try:
             self.status_var.set("엑셀 파일 저장 중...")
@@ -1212,7 +1777,7 @@ class DormitoryAllocationGUI:
                         len(self.current_room_id) * 4,
                         sum(1 for room in self.current_room_id for seat in room.values() if seat),
                         len(self.current_failed_students),
-                        ", ".join(self.available_factors) if self.available_factors else "없음",
+                        ", ".join(self.current_selected_factors) if self.current_selected_factors else "없음",
                         len(self.blacklist_pairs),
                         "3학년용 (이전 좌석 번호 고려 안함)"
                     ]
@@ -1220,6 +1785,17 @@ class DormitoryAllocationGUI:
                 df_summary = pd.DataFrame(summary_data)
                 df_summary.to_excel(writer, sheet_name='배정 정보', index=False)
                 
+                # 시트 4, 5: 배정 품질 보고서 (요약 + 방 유사도 분포, 방별 품질)
+                quality_sheets = []
+                if self.current_quality_report is not None:
+                    df_quality, df_distribution, df_quality_rooms = quality_report_frames(self.current_quality_report)
+                    df_quality.to_excel(writer, sheet_name='배정 품질', index=False)
+                    df_distribution.to_excel(
+                        writer, sheet_name='배정 품질', index=False, startrow=len(df_quality) + 2
+                    )
+                    df_quality_rooms.to_excel(writer, sheet_name='방별 품질', index=False)
+                    quality_sheets = [writer.sheets['배정 품질'], writer.sheets['방별 품질']]
+                
                 # 시트별 컬럼 너비 조정
                 worksheet_rooms = writer.sheets['방 배정 결과']
                 worksheet_failed = writer.sheets['배정 실패 목록']
@@ -1263,17 +1839,82 @@ class DormitoryAllocationGUI:
                             pass
                     adjusted_width = min(max_length + 2, 50)
                     worksheet_summary.column_dimensions[column_letter].width = adjusted_width
+                
+                # 배정 품질 시트 컬럼 너비 조정
+                for worksheet in quality_sheets:
+                    for column in worksheet.columns:
+                        max_length = max((len(str(cell.value)) for cell in column if cell.value is not None), default=0)
+                        worksheet.column_dimensions[column[0].column_letter].width = min(max_length + 2, 60)
             
             filename = os.path.basename(file_path)
-            self.status_var.set(f"✓ 엑셀 파일 저장 완료: {filename}")
+            history_note = self.record_history()
+            self.status_var.set(f"✓ 엑셀 파일 저장 완료: {filename}{history_note}")
             messagebox.showinfo("저장 완료", f"배정 결과가 성공적으로 저장되었습니다.\n\n파일: {filename}")
             
         except Exception as e:
             messagebox.showerror("오류", f"엑셀 파일 저장 중 오류가 발생했습니다:\n{str(e)}")
             self.status_var.set("엑셀 파일 저장 실패")
 
+    def export_result_file(self, file_path):
+        """배정 결과를 CSV / JSON Lines / Parquet 파일로 저장 (키카드 발급, 기숙사 DB 연동용)"""
+        from result_io import export_result
+
+        try:
+            self.status_var.set("결과 파일 저장 중...")
+            self.root.update()
+
+            row_count = export_result(self.current_room_id, file_path, student_name_map=self.student_name_map)
+
+            filename = os.path.basename(file_path)
+            history_note = self.record_history()
+            self.status_var.set(f"✓ 결과 파일 저장 완료: {filename} ({row_count}개 좌석){history_note}")
+            messagebox.showinfo("저장 완료", f"배정 결과가 성공적으로 저장되었습니다.\n\n파일: {filename}")
+
+        except Exception as e:
+            messagebox.showerror("오류", f"결과 파일 저장 중 오류가 발생했습니다:\n{str(e)}")
+            self.status_var.set("결과 파일 저장 실패")
+    
+    def record_history(self):
+        """
+        저장한 배정 결과를 배정 기록(SQLite)에 추가 (룸메이트/좌석 이력 조회용)
+        
+        Returns:
+            str: 상태 표시줄에 덧붙일 문구 (기록 실패는 저장 자체를 막지 않음)
+        """
+        import sqlite3
+        from allocation_compare import format_variant_spec
+        from history_store import HistoryStore, current_semester, file_sha256
+        
+        try:
+            with HistoryStore() as history:
+                history.record_run(
+                    self.current_room_id,
+                    semester=current_semester(),
+                    source=self.selected_file,
+                    sheet=self.roster.sheet_name if self.roster is not None else None,
+                    input_sha256=file_sha256(self.selected_file) if self.selected_file else None,
+                    policy=ALLOCATION_POLICY,
+                    factors=format_variant_spec(self.current_selected_factors, self.current_factor_weights),
+                    seed=self.current_seed,
+                    params={
+                        "blacklist_pairs": len(self.blacklist_pairs),
+                        "factor_weights": self.current_factor_weights,
+                        "history_semesters": self.current_history_semesters,
+                    },
+                    timings=(
+                        {"allocate_sec": self.current_allocation_seconds}
+                        if self.current_allocation_seconds is not None else None
+                    ),
+                    failed_students=self.current_failed_students
+                )
+        except (sqlite3.Error, OSError) as e:
+            return f" (배정 기록 저장 실패: {e})"
+        return f" · {current_semester()} 배정 기록 저장됨"
+
 
 def main():
+    # 비교 모드의 프로세스 풀이 실행 파일(PyInstaller)에서도 동작하도록
+    multiprocessing.freeze_support()
     root = tk.Tk()
 
     # 로그인/비밀번호 창에서 로그인 성공 시 호출될 콜백
@@ -1283,7 +1924,12 @@ def main():
 
     # 프로그램 시작 시 항상 비밀번호 창을 먼저 띄움
     PasswordWindow(root, on_success=start_main_gui)
-
+    
+    # 시작 시간 측정 모드 (benchmark_startup.py): 비밀번호 창이 그려지면 기록하고 종료
+    report_path = os.environ.get(STARTUP_REPORT_ENV)
+    if report_path:
+        root.after_idle(write_startup_report, root, report_path)
+    
     root.mainloop()
 
 
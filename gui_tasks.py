@@ -0,0 +1,133 @@
+"""
+Tk GUI에서 오래 걸리는 작업을 작업 스레드로 실행하기 위한 도우미
+
+작업 스레드는 Tk 위젯을 직접 건드리지 않고 큐에 이벤트만 넣으며,
+메인 스레드가 root.after로 큐를 주기적으로 비우면서 콜백을 호출합니다.
+"""
+import importlib
+import json
+import queue
+import sys
+import threading
+import time
+
+# 큐를 확인하는 주기 (ms)
+POLL_INTERVAL_MS = 100
+
+# 이 환경 변수에 파일 경로가 있으면 첫 창이 그려진 시각을 기록하고 종료 (benchmark_startup.py)
+STARTUP_REPORT_ENV = "DORMITORY_STARTUP_REPORT"
+
+# 시작 시간 측정 시 이미 불러왔는지 확인할 무거운 모듈
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "roster", "allocation_engine", "allocation_engine_third_grade")
+
+
+def preload_modules(module_names):
+    """
+    무거운 모듈(pandas/numpy 등)을 미리 불러오기 - 작업 스레드에서 호출하면 창이 멈추지 않음
+    이미 불러온 모듈은 바로 넘어가므로 여러 번 호출해도 됨
+    """
+    for name in module_names:
+        importlib.import_module(name)
+
+
+class BackgroundTask:
+    """
+    함수 하나를 작업 스레드에서 실행하고 진행 상황/결과를 Tk 메인 스레드로 전달
+
+    실행할 함수는 progress_callback, cancel_event 키워드 인자를 받아야 합니다.
+    - progress_callback(message, fraction): 진행 상황 보고 (fraction은 0~1 또는 None)
+    - cancel_event: threading.Event, 설정되면 가능한 빨리 작업을 중단
+    """
+
+    def __init__(self, root, func, *args, on_progress=None, on_done=None, on_error=None,
+                 on_cancel=None, cancelled_exceptions=(), **kwargs):
+        self.root = root
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_progress = on_progress
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        # 이 예외들은 오류가 아니라 취소로 처리
+        self.cancelled_exceptions = tuple(cancelled_exceptions)
+
+        self.cancel_event = threading.Event()
+        self.events = queue.Queue()
+        self.thread = None
+        self.finished = False
+
+    def start(self):
+        """작업 스레드 시작 및 큐 확인 예약"""
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.root.after(POLL_INTERVAL_MS, self._poll)
+        return self
+
+    def cancel(self):
+        """작업 취소 요청 (작업 함수가 cancel_event를 확인할 때 중단됨)"""
+        self.cancel_event.set()
+
+    @property
+    def running(self):
+        return self.thread is not None and not self.finished
+
+    def _report(self, message, fraction=None):
+        self.events.put(("progress", (message, fraction)))
+
+    def _run(self):
+        try:
+            result = self.func(
+                *self.args,
+                progress_callback=self._report,
+                cancel_event=self.cancel_event,
+                **self.kwargs
+            )
+        except self.cancelled_exceptions:
+            self.events.put(("cancelled", None))
+        except Exception as e:
+            self.events.put(("error", e))
+        else:
+            if self.cancel_event.is_set():
+                self.events.put(("cancelled", result))
+            else:
+                self.events.put(("done", result))
+
+    def _poll(self):
+        """메인 스레드에서 큐에 쌓인 이벤트 처리"""
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "progress":
+                    # 진행 보고는 최신 것만 의미가 있으므로 쌓여 있으면 마지막 것만 반영
+                    if self.events.qsize() and self.events.queue[0][0] == "progress":
+                        continue
+                    if self.on_progress:
+                        self.on_progress(*payload)
+                    continue
+
+                self.finished = True
+                if kind == "done" and self.on_done:
+                    self.on_done(payload)
+                elif kind == "error" and self.on_error:
+                    self.on_error(payload)
+                elif kind == "cancelled" and self.on_cancel:
+                    self.on_cancel(payload)
+                return
+        except queue.Empty:
+            pass
+
+        self.root.after(POLL_INTERVAL_MS, self._poll)
+
+
+def write_startup_report(root, report_path):
+    """첫 창이 화면에 그려진 시각과 그때까지 불러온 무거운 모듈을 JSON으로 기록한 뒤 창 닫기"""
+    root.update()
+    report = {
+        "first_window_time": time.time(),
+        "window_title": root.title(),
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False)
+    root.destroy()
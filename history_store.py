@@ -0,0 +1,371 @@
+"""
+배정 기록 저장소 (SQLite)
+
+저장한 배정 결과를 로컬 SQLite 데이터베이스에 쌓아 두고
+"A와 B가 같은 방을 쓴 적이 있는지", "이 학생은 어느 방/좌석을 거쳤는지"를 바로 조회합니다.
+좌석 배정 표(assignments)는 (학번, 학기)와 (실행, 방) 인덱스가 있어 여러 해 기록에서도 수 ms 안에 조회됩니다.
+
+같은 학기·같은 명단(파일 이름 + 시트)의 결과를 다시 저장하면 이전 실행은 기록으로만 남고
+룸메이트/좌석 조회에는 마지막 실행만 사용됩니다 (active = 0).
+
+테이블:
+    runs(run_id, created_at, semester, source, sheet, input_sha256, policy, factors, seed,
+         params, timings, students, failed, active)
+    assignments(run_id, semester, student_id, room, seat)   ← 좌석 하나당 한 행
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from result_io import SEATS_PER_ROOM, frame_to_matrix, import_result, rooms_to_matrix
+
+HISTORY_DB_ENV = "DORMITORY_HISTORY_DB"
+HISTORY_DB_NAME = "allocation_history.sqlite3"
+
+# GUI에서 저장한 엑셀 결과 파일의 배정 결과 시트 이름
+RESULT_SHEET_NAME = "방 배정 결과"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    semester TEXT NOT NULL,
+    source TEXT,
+    sheet TEXT,
+    input_sha256 TEXT,
+    policy TEXT,
+    factors TEXT,
+    seed INTEGER,
+    params TEXT,
+    timings TEXT,
+    students INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    semester TEXT NOT NULL,
+    student_id INTEGER NOT NULL,
+    room INTEGER NOT NULL,
+    seat INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_semester ON runs(semester, active);
+CREATE INDEX IF NOT EXISTS idx_assignments_student ON assignments(student_id, semester);
+CREATE INDEX IF NOT EXISTS idx_assignments_semester ON assignments(semester);
+CREATE INDEX IF NOT EXISTS idx_assignments_room ON assignments(run_id, room);
+"""
+
+
+def default_history_path():
+    """
+    기본 기록 파일 경로: 환경 변수 DORMITORY_HISTORY_DB → 프로그램 폴더의 allocation_history.sqlite3
+    (PyInstaller 실행 파일이면 실행 파일 옆)
+    """
+    path = os.environ.get(HISTORY_DB_ENV)
+    if path:
+        return path
+    if getattr(sys, "frozen", False):
+        base_dir = os.path.dirname(sys.executable)
+    else:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, HISTORY_DB_NAME)
+
+
+def current_semester(now=None):
+    """날짜 → 학기 이름 ('2025-1': 1~7월, '2025-2': 8~12월)"""
+    now = now or datetime.now()
+    return f"{now.year}-{1 if now.month < 8 else 2}"
+
+
+def file_sha256(path):
+    """입력 파일 내용 해시 (같은 명단으로 배정한 실행 찾기용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HistoryStore:
+    """
+    배정 기록 SQLite 저장소
+
+    Args:
+        path: 데이터베이스 파일 경로 (None이면 default_history_path(), ":memory:" 가능)
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_history_path()
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ----- 저장 -----
+    def record_run(self, room_id, semester=None, source=None, sheet=None, input_sha256=None, policy=None,
+                   factors=None, seed=None, params=None, timings=None, failed_students=None):
+        """
+        배정 결과 하나를 기록
+
+        Args:
+            room_id: 방 배정 결과 (dict 리스트 또는 (방 수 x 4) 행렬)
+            semester: 학기 이름 (None이면 current_semester())
+            source: 명단 파일 경로 (파일 이름만 저장 - 같은 학기의 같은 명단은 마지막 실행만 유효)
+            sheet: 시트 이름
+            input_sha256: 명단 파일 내용 해시
+            policy: 배정 정책
+            factors: 사용한 factor 문자열 (예: "factor1, factor2*2")
+            seed: 난수 시드 (알 수 없으면 None)
+            params: 그 밖의 설정 (JSON으로 저장)
+            timings: 단계별 시간 (JSON으로 저장)
+            failed_students: 배정 실패 좌석 리스트
+
+        Returns:
+            int: run_id
+        """
+        semester = semester or current_semester()
+        source = os.path.basename(source) if source else None
+        matrix = rooms_to_matrix(room_id)
+        room_index, seat_index = np.nonzero(matrix)
+        student_ids = matrix[room_index, seat_index]
+
+        with self.conn:
+            self.conn.execute(
+                "UPDATE runs SET active = 0 WHERE semester = ? AND source IS ? AND sheet IS ? AND active = 1",
+                (semester, source, sheet)
+            )
+            cursor = self.conn.execute(
+                "INSERT INTO runs (created_at, semester, source, sheet, input_sha256, policy, factors, seed,"
+                " params, timings, students, failed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    semester,
+                    source,
+                    sheet,
+                    input_sha256,
+                    policy,
+                    factors,
+                    seed,
+                    json.dumps(params, ensure_ascii=False) if params is not None else None,
+                    json.dumps(timings) if timings is not None else None,
+                    len(student_ids),
+                    len(failed_students or []),
+                )
+            )
+            run_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO assignments (run_id, semester, student_id, room, seat) VALUES (?, ?, ?, ?, ?)",
+                zip(
+                    [run_id] * len(student_ids),
+                    [semester] * len(student_ids),
+                    student_ids.tolist(),
+                    (room_index + 1).tolist(),
+                    (seat_index + 1).tolist(),
+                )
+            )
+        return run_id
+
+    def import_result_file(self, file_path, semester, sheet=None):
+        """지난 결과 파일(GUI 엑셀 저장 파일 또는 CSV/JSON Lines/Parquet)을 기록으로 가져오기"""
+        matrix = read_result_matrix(file_path)
+        return self.record_run(matrix, semester=semester, source=file_path, sheet=sheet,
+                               input_sha256=file_sha256(file_path), params={"imported": True})
+
+    def delete_run(self, run_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    # ----- 조회 -----
+    def runs(self, semester=None, include_inactive=False):
+        """실행 목록 (최신순) - dict 리스트"""
+        query = "SELECT * FROM runs WHERE 1 = 1"
+        args = []
+        if semester is not None:
+            query += " AND semester = ?"
+            args.append(semester)
+        if not include_inactive:
+            query += " AND active = 1"
+        cursor = self.conn.execute(query + " ORDER BY run_id DESC", args)
+        columns = [c[0] for c in cursor.description]
+        runs = []
+        for row in cursor.fetchall():
+            run = dict(zip(columns, row))
+            for key in ("params", "timings"):
+                if run[key] is not None:
+                    run[key] = json.loads(run[key])
+            runs.append(run)
+        return runs
+
+    def semesters(self):
+        """기록된 학기 목록 (오래된 순)"""
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT semester FROM runs WHERE active = 1 ORDER BY semester"
+        )]
+
+    def recent_semesters(self, count, before=None):
+        """
+        최근 count개 학기 (오래된 순)
+
+        Args:
+            count: 학기 수
+            before: 이 학기보다 이전 학기만 (예: 이번 학기 배정 시 이번 학기 기록은 제외)
+        """
+        semesters = [s for s in self.semesters() if before is None or s < before]
+        return semesters[-count:] if count > 0 else []
+
+    def seat_history(self, student_id):
+        """학생의 학기별 방/좌석 [(학기, run_id, 방 번호, 좌석 번호), ...] (오래된 순)"""
+        return self.conn.execute(
+            "SELECT a.semester, a.run_id, a.room, a.seat FROM assignments a"
+            " JOIN runs r ON r.run_id = a.run_id AND r.active = 1"
+            " WHERE a.student_id = ? ORDER BY a.semester, a.run_id",
+            (int(student_id),)
+        ).fetchall()
+
+    def roommates_of(self, student_id, semesters=None):
+        """학생의 룸메이트 기록 [(학기, 방 번호, 룸메이트 학번), ...] (오래된 순)"""
+        query = (
+            "SELECT a.semester, a.room, b.student_id FROM assignments a"
+            " JOIN runs r ON r.run_id = a.run_id AND r.active = 1"
+            " JOIN assignments b ON b.run_id = a.run_id AND b.room = a.room AND b.student_id != a.student_id"
+            " WHERE a.student_id = ?"
+        )
+        args = [int(student_id)]
+        if semesters is not None:
+            semesters = list(semesters)
+            query += f" AND a.semester IN ({', '.join('?' * len(semesters))})"
+            args += semesters
+        return self.conn.execute(query + " ORDER BY a.semester, b.seat", args).fetchall()
+
+    def roomed_together(self, student_a, student_b):
+        """두 학생이 같은 방을 쓴 학기 목록 (없으면 빈 리스트)"""
+        return sorted({
+            semester for semester, _, roommate in self.roommates_of(student_a) if roommate == int(student_b)
+        })
+
+    def roommate_pairs(self, semesters):
+        """
+        지정한 학기들에 같은 방을 쓴 학생 조합
+
+        Returns:
+            np.ndarray: (작은 학번, 큰 학번) int64 (조합 수 x 2), 중복 제거·정렬됨
+        """
+        semesters = list(semesters)
+        if not semesters:
+            return np.zeros((0, 2), dtype=np.int64)
+        rows = self.conn.execute(
+            "SELECT a.run_id, a.room, a.student_id FROM assignments a"
+            " JOIN runs r ON r.run_id = a.run_id AND r.active = 1"
+            f" WHERE a.semester IN ({', '.join('?' * len(semesters))})",
+            semesters
+        ).fetchall()
+        return room_pairs_from_rows(np.array(rows, dtype=np.int64).reshape(-1, 3))
+
+    def recent_roommate_pairs(self, count, before=None):
+        """최근 count개 학기(before 학기 이전)의 룸메이트 조합 배열"""
+        return self.roommate_pairs(self.recent_semesters(count, before))
+
+
+def read_result_matrix(file_path):
+    """
+    지난 배정 결과 파일 → (방 수 x 4) 학번 행렬
+
+    GUI에서 저장한 엑셀 파일('방 배정 결과' 시트의 좌석N_학번 컬럼), cli.py가 저장한 엑셀 파일(좌석 단위 표)과
+    export_result로 저장한 CSV / JSON Lines / Parquet 파일을 읽습니다.
+    """
+    if os.path.splitext(file_path)[1].lower() in (".xlsx", ".xls"):
+        import pandas as pd
+
+        frame = pd.read_excel(file_path, sheet_name=RESULT_SHEET_NAME)
+        if "좌석 번호" in frame.columns:
+            return frame_to_matrix(frame)
+        columns = [f"좌석{i}_학번" for i in range(1, SEATS_PER_ROOM + 1)]
+        missing = [c for c in columns if c not in frame.columns]
+        if missing:
+            raise ValueError(f"배정 결과 파일이 아닙니다 (컬럼 없음: {', '.join(missing)}): {file_path}")
+        return frame[columns].apply(pd.to_numeric, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+
+    matrix, _ = import_result(file_path)
+    return matrix
+
+
+def result_files_roommate_pairs(file_paths):
+    """지난 결과 파일들에서 같은 방이었던 학생 조합 배열 (중복 제거·정렬)"""
+    parts = [matrix_roommate_pairs(read_result_matrix(path)) for path in file_paths]
+    if not parts:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(parts), axis=0)
+
+
+def previous_roommate_pairs(semester_count=0, result_files=(), history_path=None, before=None):
+    """
+    "최근 K학기 룸메이트와 다시 같은 방 금지"에 쓸 조합 모으기
+
+    Args:
+        semester_count: 배정 기록에서 가져올 최근 학기 수 (0이면 기록 사용 안 함)
+        result_files: 추가로 읽을 지난 결과 파일 경로들
+        history_path: 배정 기록 파일 (None이면 기본 기록 파일)
+        before: 이 학기 이전 기록만 사용 (기본: 이번 학기 - 다시 배정할 때 자기 결과를 피하지 않도록)
+
+    Returns:
+        np.ndarray: (작은 학번, 큰 학번) int64 (조합 수 x 2)
+    """
+    parts = []
+    if semester_count > 0:
+        with HistoryStore(history_path) as store:
+            parts.append(store.recent_roommate_pairs(semester_count, before or current_semester()))
+    if result_files:
+        parts.append(result_files_roommate_pairs(result_files))
+    if not parts:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(parts), axis=0)
+
+
+def room_pairs_from_rows(rows):
+    """
+    (run_id, 방 번호, 학번) 행들 → 같은 방 학생 조합 (작은 학번, 큰 학번) 배열
+
+    방마다 최대 4명이므로 (방 x 4) 행렬로 모은 뒤 좌석 쌍 6가지를 한 번에 만들어 파이썬 루프가 없습니다.
+    """
+    if len(rows) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+
+    _, room_codes = np.unique(rows[:, :2], axis=0, return_inverse=True)
+    room_codes = room_codes.ravel()
+    order = np.argsort(room_codes, kind="stable")
+    room_codes = room_codes[order]
+    student_ids = rows[order, 2]
+
+    starts = np.flatnonzero(np.r_[True, room_codes[1:] != room_codes[:-1]])
+    seat_in_room = np.arange(len(room_codes)) - np.repeat(starts, np.diff(np.r_[starts, len(room_codes)]))
+    keep = seat_in_room < SEATS_PER_ROOM
+    matrix = np.zeros((len(starts), SEATS_PER_ROOM), dtype=np.int64)
+    matrix[room_codes[keep], seat_in_room[keep]] = student_ids[keep]
+    return matrix_roommate_pairs(matrix)
+
+
+def matrix_roommate_pairs(matrix):
+    """(방 수 x 4) 행렬 → 같은 방 학생 조합 (작은 학번, 큰 학번) int64 배열 (중복 제거·정렬)"""
+    matrix = np.asarray(matrix, dtype=np.int64)
+    first, second = np.triu_indices(matrix.shape[1], k=1)
+    a = matrix[:, first].ravel()
+    b = matrix[:, second].ravel()
+    valid = (a != 0) & (b != 0) & (a != b)
+    pairs = np.stack([np.minimum(a[valid], b[valid]), np.maximum(a[valid], b[valid])], axis=1)
+    if len(pairs) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.unique(pairs, axis=0)
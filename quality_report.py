@@ -0,0 +1,231 @@
+"""
+배정 품질 보고서
+
+방 배정 행렬(방 수 x 4)을 한 번에 numpy 연산으로 훑어서 다음을 계산합니다.
+    - 방별/전체 방 유사도 (평균, 최소, 분포)
+    - 좌석 교대 준수율 (이전 복도 자리(1,4) → 창가(2,3), 창가 → 복도)
+    - 조건 위반 수 (현재 룸메이트, 배려 학생, 블랙리스트, 지난 학기 룸메이트와 같은 방,
+      중복 배정, 명단에 없는 학번, 배정되지 않은 학생)
+좌석 교대와 같은 방 금지 관계는 verifier.py와 같은 함수로 판정하므로 두 보고서의 위반 수가 항상 같습니다.
+
+엑셀 저장 시 '배정 품질' / '방별 품질' 시트와 GUI의 배정 품질 탭에 사용합니다.
+"""
+import math
+
+import numpy as np
+
+from result_io import SEATS_PER_ROOM, rooms_to_matrix
+from similarity_engine import room_pair_similarities
+from verifier import same_room_conflicts, seat_rotation_flags
+
+# 방 유사도 분포 구간 (0.0~1.0을 10칸)
+SIMILARITY_BINS = np.linspace(0.0, 1.0, 11)
+
+# 조건 위반 항목 (키, 표시 이름)
+VIOLATION_LABELS = [
+    ("current_roommate", "현재 룸메이트와 같은 방"),
+    ("avoid_student", "배려 학생과 같은 방"),
+    ("blacklist", "블랙리스트 조합이 같은 방"),
+    ("history", "지난 학기 룸메이트와 같은 방"),
+    ("duplicate", "두 번 이상 배정된 학생"),
+    ("unknown", "명단에 없는 학번"),
+    ("unassigned", "배정되지 않은 학생"),
+]
+
+
+def compute_quality_report(room_id, roster, selected_factors=None, blacklist_pairs=None, history_pairs=None,
+                           failed_students=None, seat_rotation=True):
+    """
+    배정 품질 보고서 계산
+
+    Args:
+        room_id: 방 배정 결과 (dict 리스트 또는 행렬)
+        roster: CompiledRoster
+        selected_factors: 방 유사도 평가에 사용할 factor 리스트 (없으면 유사도 항목은 NaN)
+        blacklist_pairs: 배정에 사용한 블랙리스트 조합
+        history_pairs: 배정에 사용한 지난 학기 룸메이트 조합
+        failed_students: 배정 실패 좌석 리스트
+        seat_rotation: 좌석 교대 정책을 쓰는 배정인지 (3학년용은 False - 준수율은 참고용으로만 계산)
+
+    Returns:
+        dict: summary (전체 지표), distribution (구간별 방 수), rooms (방별 배열), violations (항목별 수)
+    """
+    matrix = rooms_to_matrix(room_id)
+    num_rooms = len(matrix)
+    occupied = matrix != 0
+    members_per_room = occupied.sum(axis=1)
+    assigned_ids = matrix[occupied]
+
+    # 방 유사도
+    room_similarity = np.full(num_rooms, np.nan)
+    used_factors, feature_matrix = roster.factor_matrix(selected_factors)
+    rows = roster.indices_of(matrix)
+    rows[~occupied] = -1
+    if used_factors and num_rooms:
+        room_similarity = room_pair_similarities(feature_matrix, rows)
+    scored = room_similarity[~np.isnan(room_similarity)]
+
+    def stat(func):
+        return float(func(scored)) if len(scored) else math.nan
+
+    counts, _ = np.histogram(scored, bins=SIMILARITY_BINS)
+
+    # 좌석 교대 (이전 좌석 번호가 있는 학생만)
+    seat_numbers = np.broadcast_to(np.arange(1, SEATS_PER_ROOM + 1), matrix.shape)
+    known = rows >= 0
+    previous = np.zeros(matrix.shape, dtype=np.int8)
+    previous[known] = roster.seat_codes[rows[known]]
+    checked, rotated = seat_rotation_flags(previous, seat_numbers)
+    rotation_total = int(checked.sum())
+    rotation_ok = int(rotated.sum())
+    room_rotation_total = checked.sum(axis=1)
+    room_rotation_ok = rotated.sum(axis=1)
+
+    # 조건 위반 (검증기와 같은 규칙)
+    room_of = np.full(roster.num_students, -1, dtype=np.int64)
+    room_of[rows[known]] = np.nonzero(known)[0]
+    room_violations = np.zeros(num_rooms, dtype=np.int64)
+    violations = {}
+    for key, (low, _) in same_room_conflicts(roster, room_of, blacklist_pairs, history_pairs).items():
+        violations[key] = int(len(low))
+        np.add.at(room_violations, room_of[low], 1)
+
+    unique_ids, id_counts = np.unique(assigned_ids, return_counts=True)
+    violations["duplicate"] = int((id_counts > 1).sum())
+    violations["unknown"] = int((roster.indices_of(unique_ids) < 0).sum())
+    violations["unassigned"] = int((~np.isin(roster.ids, unique_ids)).sum())
+
+    summary = {
+        "rooms": num_rooms,
+        "seats": int(matrix.size),
+        "assigned": int(len(assigned_ids)),
+        "empty_seats": int(matrix.size - len(assigned_ids)),
+        "failed_seats": len(failed_students or []),
+        "factors": list(used_factors),
+        "scored_rooms": int(len(scored)),
+        "mean_similarity": stat(np.mean),
+        "min_similarity": stat(np.min),
+        "max_similarity": stat(np.max),
+        "similarity_percentiles": {
+            p: (float(np.percentile(scored, p)) if len(scored) else math.nan) for p in (10, 25, 50, 75, 90)
+        },
+        "seat_rotation_policy": bool(seat_rotation),
+        "seat_rotation_checked": rotation_total,
+        "seat_rotation_ok": rotation_ok,
+        "seat_rotation_rate": rotation_ok / rotation_total if rotation_total else math.nan,
+        "violations_total": int(sum(violations.values())),
+    }
+
+    return {
+        "summary": summary,
+        "distribution": {
+            "bins": SIMILARITY_BINS.tolist(),
+            "counts": counts.tolist(),
+        },
+        "rooms": {
+            "room": np.arange(1, num_rooms + 1),
+            "members": members_per_room,
+            "similarity": room_similarity,
+            "seat_rotation_checked": room_rotation_total,
+            "seat_rotation_ok": room_rotation_ok,
+            "violations": room_violations,
+        },
+        "violations": violations,
+    }
+
+
+def _fmt(value, digits=3):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "-"
+    return f"{value:.{digits}f}"
+
+
+def _rotation_text(summary):
+    if not summary["seat_rotation_checked"]:
+        return "-"
+    text = (f"{summary['seat_rotation_rate'] * 100:.1f}% "
+            f"({summary['seat_rotation_ok']}/{summary['seat_rotation_checked']}명)")
+    if not summary["seat_rotation_policy"]:
+        text += " - 이 배정은 좌석 교대 정책을 사용하지 않음 (참고용)"
+    return text
+
+
+def summary_items(report):
+    """보고서 → [(항목, 내용), ...] (엑셀 시트/GUI 탭 공통)"""
+    summary = report["summary"]
+    percentiles = summary["similarity_percentiles"]
+    items = [
+        ("총 방 수", summary["rooms"]),
+        ("배정된 학생 수", summary["assigned"]),
+        ("빈 좌석 수", summary["empty_seats"]),
+        ("배정 실패 좌석 수", summary["failed_seats"]),
+        ("유사도 평가 Factor", ", ".join(summary["factors"]) if summary["factors"] else "없음"),
+        ("평균 방 유사도", _fmt(summary["mean_similarity"])),
+        ("최소 방 유사도", _fmt(summary["min_similarity"])),
+        ("최대 방 유사도", _fmt(summary["max_similarity"])),
+        ("방 유사도 10/25/50/75/90%", " / ".join(_fmt(percentiles[p]) for p in (10, 25, 50, 75, 90))),
+        ("좌석 교대 준수율", _rotation_text(summary)),
+        ("조건 위반 합계", summary["violations_total"]),
+    ]
+    items += [(f"  - {label}", report["violations"][key]) for key, label in VIOLATION_LABELS]
+    return items
+
+
+def distribution_items(report):
+    """보고서 → [(유사도 구간, 방 수), ...]"""
+    bins = report["distribution"]["bins"]
+    return [
+        (f"{bins[i]:.1f} ~ {bins[i + 1]:.1f}", count)
+        for i, count in enumerate(report["distribution"]["counts"])
+    ]
+
+
+def quality_report_frames(report):
+    """
+    엑셀 저장용 DataFrame
+
+    Returns:
+        tuple: (요약 DataFrame, 유사도 분포 DataFrame, 방별 DataFrame)
+    """
+    import pandas as pd
+
+    summary_df = pd.DataFrame(summary_items(report), columns=["항목", "내용"])
+    summary_df["내용"] = summary_df["내용"].astype(str)
+    distribution_df = pd.DataFrame(distribution_items(report), columns=["방 유사도 구간", "방 수"])
+
+    rooms = report["rooms"]
+    rooms_df = pd.DataFrame({
+        "방 번호": rooms["room"],
+        "인원": rooms["members"],
+        "방 유사도": np.round(rooms["similarity"], 4),
+        "좌석 교대 대상": rooms["seat_rotation_checked"],
+        "좌석 교대 준수": rooms["seat_rotation_ok"],
+        "조건 위반": rooms["violations"],
+    })
+    return summary_df, distribution_df, rooms_df
+
+
+def format_quality_report(report, bar_width=40):
+    """GUI 탭에 표시할 보고서 문자열"""
+    lines = []
+    label_width = max(len(label) for label, _ in summary_items(report))
+    for label, value in summary_items(report):
+        lines.append(f"  {label.ljust(label_width)}  {value}")
+
+    lines.append("")
+    lines.append("  방 유사도 분포")
+    distribution = distribution_items(report)
+    max_count = max([count for _, count in distribution] + [1])
+    for label, count in distribution:
+        bar = "█" * int(round(count / max_count * bar_width))
+        lines.append(f"  {label}  {bar} {count}")
+
+    rooms = report["rooms"]
+    flagged = np.flatnonzero(rooms["violations"] > 0)
+    if len(flagged):
+        lines.append("")
+        lines.append(f"  조건 위반이 있는 방 ({len(flagged)}개)")
+        shown = flagged[:50].tolist()
+        lines.append("  " + ", ".join(f"{rooms['room'][i]}번방" for i in shown)
+                     + (" ..." if len(flagged) > len(shown) else ""))
+    return "\n".join(lines)
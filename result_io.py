@@ -0,0 +1,238 @@
+"""
+배정 결과 내보내기/불러오기 (CSV, JSON Lines, Parquet)
+
+방 배정 결과(room_id: [{"seat1": 학번, ...}, ...])를 (방 수 x 4) 정수 행렬로 바꾼 뒤
+한 행 = 한 좌석인 표 형태로 저장합니다. 셀 단위 파이썬 루프 없이 numpy/pandas 연산만 사용하므로
+수만 좌석도 1초 이내에 저장/불러오기가 가능합니다.
+
+저장 컬럼: 방 번호, 좌석 번호, 학번, 이름 (빈자리는 학번이 비어 있음)
+"""
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+SEAT_NAMES = ["seat1", "seat2", "seat3", "seat4"]
+SEATS_PER_ROOM = len(SEAT_NAMES)
+
+# 확장자 → 포맷 이름
+FORMAT_BY_EXTENSION = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".json": "jsonl",
+    ".parquet": "parquet",
+}
+
+
+def rooms_to_matrix(room_id):
+    """
+    방 배정 결과(dict 리스트)를 (방 수 x 4) 정수 행렬로 변환 (빈자리는 0)
+
+    Args:
+        room_id: 방 배정 결과 [{"seat1": 학번, "seat2": "", ...}, ...]
+
+    Returns:
+        np.ndarray: int64 행렬
+    """
+    if isinstance(room_id, np.ndarray):
+        return room_id.astype(np.int64, copy=False)
+    if not room_id:
+        return np.zeros((0, SEATS_PER_ROOM), dtype=np.int64)
+
+    frame = pd.DataFrame.from_records(room_id, columns=SEAT_NAMES)
+    frame = frame.apply(pd.to_numeric, errors="coerce")
+    return frame.fillna(0).to_numpy(dtype=np.int64)
+
+
+def matrix_to_rooms(matrix):
+    """
+    (방 수 x 4) 정수 행렬을 기존 방 배정 결과 형식(dict 리스트)으로 변환 (0은 빈자리 "")
+
+    Args:
+        matrix: 방 배정 행렬
+
+    Returns:
+        list: [{"seat1": 학번, ...}, ...]
+    """
+    matrix = np.asarray(matrix, dtype=np.int64)
+    cells = matrix.astype(object)
+    cells[matrix == 0] = ""
+    return [dict(zip(SEAT_NAMES, row)) for row in cells.tolist()]
+
+
+def result_to_frame(room_id, student_name_map=None):
+    """
+    방 배정 결과를 한 행 = 한 좌석인 DataFrame으로 변환
+
+    Args:
+        room_id: 방 배정 결과 (dict 리스트 또는 행렬)
+        student_name_map: 학번-이름 매핑 딕셔너리 (없으면 이름 컬럼은 빈 값)
+
+    Returns:
+        pd.DataFrame: 방 번호, 좌석 번호, 학번, 이름 컬럼
+    """
+    matrix = rooms_to_matrix(room_id)
+    num_rooms = matrix.shape[0]
+
+    flat_ids = matrix.reshape(-1)
+    student_ids = pd.array(flat_ids, dtype="Int64")
+    student_ids[flat_ids == 0] = pd.NA
+
+    frame = pd.DataFrame({
+        "방 번호": np.repeat(np.arange(1, num_rooms + 1, dtype=np.int32), SEATS_PER_ROOM),
+        "좌석 번호": np.tile(np.arange(1, SEATS_PER_ROOM + 1, dtype=np.int8), num_rooms),
+        "학번": student_ids,
+    })
+
+    if student_name_map is not None and hasattr(student_name_map, "lookup"):
+        # CompiledRoster 이름 매핑은 배열 단위로 한 번에 조회
+        frame["이름"] = pd.array(student_name_map.lookup(flat_ids), dtype="string")
+    elif student_name_map:
+        names = pd.Series(student_ids).map(student_name_map)
+        frame["이름"] = names.astype("string")
+    else:
+        frame["이름"] = pd.array([pd.NA] * len(frame), dtype="string")
+
+    return frame
+
+
+def frame_to_matrix(frame):
+    """
+    한 행 = 한 좌석인 DataFrame을 (방 수 x 4) 행렬로 변환
+
+    Args:
+        frame: 방 번호, 좌석 번호, 학번 컬럼을 가진 DataFrame
+
+    Returns:
+        np.ndarray: int64 행렬 (빈자리 0)
+    """
+    for col in ("방 번호", "좌석 번호", "학번"):
+        if col not in frame.columns:
+            raise ValueError(f"'{col}' 컬럼을 찾을 수 없습니다.")
+
+    if len(frame) == 0:
+        return np.zeros((0, SEATS_PER_ROOM), dtype=np.int64)
+
+    rooms = pd.to_numeric(frame["방 번호"], errors="coerce").to_numpy()
+    seats = pd.to_numeric(frame["좌석 번호"], errors="coerce").to_numpy()
+    ids = pd.to_numeric(frame["학번"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+    if np.isnan(rooms).any() or np.isnan(seats).any():
+        raise ValueError("방 번호/좌석 번호에 비어 있거나 숫자가 아닌 값이 있습니다.")
+    rooms = rooms.astype(np.int64)
+    seats = seats.astype(np.int64)
+    if rooms.min() < 1 or seats.min() < 1 or seats.max() > SEATS_PER_ROOM:
+        raise ValueError("방 번호/좌석 번호 범위가 올바르지 않습니다.")
+
+    matrix = np.zeros((int(rooms.max()), SEATS_PER_ROOM), dtype=np.int64)
+    filled = ~np.isnan(ids)
+    matrix[rooms[filled] - 1, seats[filled] - 1] = ids[filled].astype(np.int64)
+    return matrix
+
+
+def detect_format(file_path, fmt=None):
+    """파일 확장자로부터 포맷 이름(csv/jsonl/parquet)을 결정"""
+    if fmt:
+        fmt = fmt.lower()
+        if fmt == "json":
+            fmt = "jsonl"
+        if fmt not in ("csv", "jsonl", "parquet"):
+            raise ValueError(f"지원하지 않는 포맷입니다: {fmt}")
+        return fmt
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in FORMAT_BY_EXTENSION:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {ext}")
+    return FORMAT_BY_EXTENSION[ext]
+
+
+def export_result(room_id, file_path, fmt=None, student_name_map=None):
+    """
+    배정 결과를 CSV / JSON Lines / Parquet 파일로 저장
+
+    Args:
+        room_id: 방 배정 결과 (dict 리스트 또는 행렬)
+        file_path: 저장할 파일 경로
+        fmt: "csv", "jsonl", "parquet" 중 하나 (None이면 확장자로 판단)
+        student_name_map: 학번-이름 매핑 딕셔너리
+
+    Returns:
+        int: 저장된 좌석(행) 수
+    """
+    fmt = detect_format(file_path, fmt)
+    frame = result_to_frame(room_id, student_name_map)
+
+    if fmt == "csv":
+        # 엑셀에서 한글이 깨지지 않도록 BOM 포함
+        frame.to_csv(file_path, index=False, encoding="utf-8-sig")
+    elif fmt == "jsonl":
+        frame.to_json(file_path, orient="records", lines=True, force_ascii=False)
+    else:
+        try:
+            frame.to_parquet(file_path, index=False)
+        except ImportError as e:
+            raise ImportError("Parquet 저장에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+
+    return len(frame)
+
+
+def result_bytes(room_id, fmt, student_name_map=None):
+    """
+    배정 결과를 파일로 저장하지 않고 CSV / JSON Lines / Parquet 바이트로 변환 (다운로드 응답용)
+
+    Args:
+        room_id: 방 배정 결과 (dict 리스트 또는 행렬)
+        fmt: "csv", "jsonl", "parquet" 중 하나
+        student_name_map: 학번-이름 매핑 딕셔너리
+
+    Returns:
+        bytes: 파일 내용
+    """
+    fmt = detect_format("", fmt)
+    frame = result_to_frame(room_id, student_name_map)
+
+    if fmt == "csv":
+        return frame.to_csv(index=False).encode("utf-8-sig")
+    if fmt == "jsonl":
+        return frame.to_json(orient="records", lines=True, force_ascii=False).encode("utf-8")
+
+    buffer = io.BytesIO()
+    try:
+        frame.to_parquet(buffer, index=False)
+    except ImportError as e:
+        raise ImportError("Parquet 저장에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+    return buffer.getvalue()
+
+
+def import_result(file_path, fmt=None):
+    """
+    export_result로 저장한 배정 결과를 불러오기 (재실행 시 초기값 또는 결과 비교용)
+
+    Args:
+        file_path: 불러올 파일 경로
+        fmt: "csv", "jsonl", "parquet" 중 하나 (None이면 확장자로 판단)
+
+    Returns:
+        tuple: (matrix, student_name_map) - (방 수 x 4) 행렬과 학번-이름 매핑
+    """
+    fmt = detect_format(file_path, fmt)
+
+    if fmt == "csv":
+        frame = pd.read_csv(file_path, encoding="utf-8-sig")
+    elif fmt == "jsonl":
+        frame = pd.read_json(file_path, orient="records", lines=True)
+    else:
+        try:
+            frame = pd.read_parquet(file_path)
+        except ImportError as e:
+            raise ImportError("Parquet 불러오기에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)") from e
+
+    matrix = frame_to_matrix(frame)
+
+    student_name_map = {}
+    if "이름" in frame.columns:
+        named = frame[frame["학번"].notna() & frame["이름"].notna()]
+        student_name_map = dict(zip(named["학번"].astype(np.int64), named["이름"].astype(str)))
+
+    return matrix, student_name_map
@@ -0,0 +1,94 @@
+"""
+배정 결과 검색 색인 (학번/이름 → 방/좌석)
+
+배정이 끝나면 한 번만 색인을 만들어 두고, 검색어를 입력할 때마다 색인만 조회합니다.
+- 해시 색인: 학번/이름이 정확히 일치하는 좌석 (dict 조회)
+- 접두사 색인: 학번/이름이 검색어로 시작하는 좌석 (정렬 배열 + 이진 탐색)
+따라서 명단 크기와 관계없이 한 글자 입력할 때마다 즉시 결과를 얻을 수 있습니다.
+"""
+import numpy as np
+
+# 접두사 검색 상한 (이 문자보다 큰 문자로 시작하는 한글/영문 이름은 없음)
+_PREFIX_END = "￿"
+
+
+class ResultSearchIndex:
+    """
+    build_result_rows 결과(좌석 단위 배열)에 대한 학번/이름 색인
+
+    검색 결과는 좌석 행 번호(rows 인덱스) 배열이며, 방/좌석은 room_seat_of로 얻습니다.
+    """
+
+    def __init__(self, rows):
+        self.rooms = np.asarray(rows["room"])
+        self.seats = np.asarray(rows["seat"])
+
+        student_ids = np.asarray(rows["student_id"], dtype=np.int64)
+        filled = np.flatnonzero(student_ids != 0)  # 빈자리는 색인하지 않음
+
+        id_keys = student_ids[filled].astype(str)
+        names = np.asarray(rows["name"], dtype=object)[filled]
+        name_keys = np.array([str(name).strip() for name in names], dtype=str) if len(filled) else np.zeros(0, dtype=str)
+
+        # 해시 색인: 학번은 한 좌석, 이름은 동명이인이 있을 수 있으므로 여러 좌석
+        self.id_index = dict(zip(student_ids[filled].tolist(), filled.tolist()))
+        self.name_index = {}
+        for name, row in zip(name_keys.tolist(), filled.tolist()):
+            if name:
+                self.name_index.setdefault(name, []).append(row)
+
+        # 접두사 색인: 정렬된 키 배열과 그에 대응하는 좌석 행 번호
+        id_order = np.argsort(id_keys, kind="stable")
+        self._sorted_id_keys = id_keys[id_order]
+        self._sorted_id_rows = filled[id_order]
+        self._max_id_length = int(np.char.str_len(id_keys).max()) if len(id_keys) else 0
+
+        name_order = np.argsort(name_keys, kind="stable")
+        self._sorted_name_keys = name_keys[name_order]
+        self._sorted_name_rows = filled[name_order]
+
+    def __len__(self):
+        return len(self.id_index)
+
+    @staticmethod
+    def _prefix_rows(sorted_keys, sorted_rows, prefix):
+        start = np.searchsorted(sorted_keys, prefix, side="left")
+        end = np.searchsorted(sorted_keys, prefix + _PREFIX_END, side="left")
+        return sorted_rows[start:end]
+
+    def find_student(self, student_id):
+        """학번이 정확히 일치하는 좌석 행 번호 (없으면 -1)"""
+        return self.id_index.get(int(student_id), -1)
+
+    def find_name(self, name):
+        """이름이 정확히 일치하는 좌석 행 번호 리스트 (동명이인 포함)"""
+        return list(self.name_index.get(str(name).strip(), []))
+
+    def search(self, query):
+        """
+        학번 또는 이름으로 좌석 검색
+
+        Args:
+            query: 검색어 - 숫자면 학번, 그 외에는 이름 (모두 앞부분 일치)
+
+        Returns:
+            np.ndarray: 일치하는 좌석 행 번호 (방/좌석 순서로 정렬)
+        """
+        query = str(query).strip()
+        if not query:
+            return np.zeros(0, dtype=np.int64)
+
+        if query.isdigit():
+            # 가장 긴 학번만큼 입력했으면 더 긴 일치가 없으므로 해시 조회로 끝냄
+            if len(query) >= self._max_id_length:
+                row = self.id_index.get(int(query), -1)
+                return np.array([row] if row >= 0 else [], dtype=np.int64)
+            matches = self._prefix_rows(self._sorted_id_keys, self._sorted_id_rows, query)
+        else:
+            matches = self._prefix_rows(self._sorted_name_keys, self._sorted_name_rows, query)
+
+        return np.sort(np.asarray(matches, dtype=np.int64))
+
+    def room_seat_of(self, row_index):
+        """좌석 행 번호 → (방 번호, 좌석 번호)"""
+        return int(self.rooms[row_index]), int(self.seats[row_index])
@@ -0,0 +1,296 @@
+"""
+배정 결과 표 (가상 스크롤 ttk.Treeview)
+
+좌석 수만큼 Treeview 항목을 만들지 않고, 화면에 보이는 행 수만큼만 항목을 만들어 두고
+스크롤할 때 해당 위치의 데이터로 내용을 바꿔 끼웁니다. 따라서 방이 수만 개여도
+표시/스크롤/정렬이 즉시 이루어집니다.
+
+프로그램 시작 시 창이 바로 뜨도록 numpy/pandas는 결과를 처음 표시할 때 불러옵니다.
+"""
+import math
+import sys
+import tkinter as tk
+from tkinter import ttk
+
+# (컬럼 키, 헤더 텍스트, 폭)
+RESULT_COLUMNS = [
+    ("room", "방", 80),
+    ("seat", "좌석", 70),
+    ("student_id", "학번", 140),
+    ("name", "이름", 160),
+    ("similarity", "방 유사도", 110),
+]
+
+
+def build_result_rows(room_id, roster=None, selected_factors=None):
+    """
+    방 배정 결과를 표에 표시할 좌석 단위 배열로 변환 (한 행 = 한 좌석)
+
+    Args:
+        room_id: 방 배정 결과 (dict 리스트 또는 행렬)
+        roster: CompiledRoster - 이름/유사도 계산용 (없으면 학번만 표시)
+        selected_factors: 유사도 계산에 사용한 factor 리스트 (없으면 유사도 표시 안 함)
+
+    Returns:
+        dict: {"room", "seat", "student_id", "name", "similarity"} 각각 길이 = 좌석 수인 배열
+    """
+    import numpy as np
+    from result_io import SEATS_PER_ROOM, rooms_to_matrix
+    from similarity_engine import room_pair_similarities
+
+    matrix = rooms_to_matrix(room_id)
+    num_rooms = matrix.shape[0]
+    student_ids = matrix.reshape(-1)
+
+    names = np.full(len(student_ids), "", dtype=object)
+    room_similarity = np.full(num_rooms, np.nan)
+
+    if roster is not None:
+        names_array = roster.names_for(student_ids)
+        names = np.asarray(names_array.fillna(""), dtype=object)
+
+        used_factors, feature_matrix = roster.factor_matrix(selected_factors)
+        if used_factors:
+            member_rows = roster.indices_of(matrix)
+            member_rows[matrix == 0] = -1
+            room_similarity = room_pair_similarities(feature_matrix, member_rows)
+
+    return {
+        "room": np.repeat(np.arange(1, num_rooms + 1, dtype=np.int32), SEATS_PER_ROOM),
+        "seat": np.tile(np.arange(1, SEATS_PER_ROOM + 1, dtype=np.int8), num_rooms),
+        "student_id": student_ids,
+        "name": names,
+        "similarity": np.repeat(room_similarity, SEATS_PER_ROOM),
+    }
+
+
+class VirtualResultTable(ttk.Frame):
+    """
+    보이는 행만 그리는 배정 결과 표
+    - 헤더 클릭: 해당 컬럼으로 정렬 (다시 클릭하면 역순)
+    - set_highlight: 특정 행 강조 표시 (검색 결과 등)
+    - set_filter: 특정 행만 표시 (검색 결과 필터)
+    """
+
+    def __init__(self, parent, visible_rows=25, font=None):
+        super().__init__(parent)
+        self.visible_rows = visible_rows
+
+        self.rows = None
+        self.sorted_order = ()  # 정렬 순서 (rows의 인덱스 배열)
+        self.order = self.sorted_order  # 표시 순서 (필터 적용 후)
+        self.filter_mask = None  # 표시할 행 (None이면 전체)
+        self.offset = 0
+        self.sort_column = None
+        self.sort_descending = False
+        self.highlighted = set()
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+
+        style = ttk.Style()
+        if font is not None:
+            try:
+                style.configure("Result.Treeview", font=font, rowheight=max(22, font[1] * 2 + 4))
+                style.configure("Result.Treeview.Heading", font=(font[0], font[1], "bold"))
+            except Exception:
+                pass
+
+        column_keys = [key for key, _, _ in RESULT_COLUMNS]
+        self.tree = ttk.Treeview(
+            self,
+            columns=column_keys,
+            show="headings",
+            height=visible_rows,
+            selectmode="browse",
+            style="Result.Treeview"
+        )
+        for key, heading, width in RESULT_COLUMNS:
+            self.tree.heading(key, text=heading, command=lambda k=key: self.sort_by(k))
+            anchor = tk.W if key == "name" else tk.CENTER
+            self.tree.column(key, width=width, anchor=anchor, stretch=True)
+        self.tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        try:
+            self.tree.tag_configure("highlight", background="#fff59d")
+            self.tree.tag_configure("empty", foreground="gray")
+        except Exception:
+            pass
+
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+
+        # 보이는 행 수만큼만 항목 생성
+        self.items = [self.tree.insert("", tk.END, values=("",) * len(column_keys)) for _ in range(visible_rows)]
+
+        # 마우스 휠 (표 위에서는 표만 스크롤)
+        if sys.platform == "darwin":
+            self.tree.bind("<MouseWheel>", lambda e: self._scroll_units(-1 * e.delta))
+        elif sys.platform == "win32":
+            self.tree.bind("<MouseWheel>", lambda e: self._scroll_units(int(-1 * (e.delta / 120)) * 3))
+        else:
+            self.tree.bind("<Button-4>", lambda e: self._scroll_units(-3))
+            self.tree.bind("<Button-5>", lambda e: self._scroll_units(3))
+        self.tree.bind("<Prior>", lambda e: self._scroll_units(-self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self._scroll_units(self.visible_rows))
+
+        self._render()
+
+    # ----- 데이터 -----
+    @property
+    def total_rows(self):
+        return len(self.order)
+
+    def set_data(self, rows):
+        """build_result_rows 결과를 표에 설정"""
+        import numpy as np
+
+        self.rows = rows
+        self.sorted_order = np.arange(len(rows["room"]), dtype=np.int64)
+        self.filter_mask = None
+        self.offset = 0
+        self.highlighted = set()
+        if self.sort_column is not None:
+            self._apply_sort()
+        self._apply_filter()
+        self._render()
+
+    def clear(self):
+        self.rows = None
+        self.sorted_order = ()
+        self.order = self.sorted_order
+        self.filter_mask = None
+        self.offset = 0
+        self.highlighted = set()
+        self._render()
+
+    def sort_by(self, column):
+        """컬럼 기준 정렬 (같은 컬럼을 다시 누르면 역순)"""
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+
+        # 헤더에 정렬 방향 표시
+        for key, heading, _ in RESULT_COLUMNS:
+            arrow = ""
+            if key == self.sort_column:
+                arrow = " ▼" if self.sort_descending else " ▲"
+            self.tree.heading(key, text=heading + arrow)
+
+        if self.rows is not None:
+            self._apply_sort()
+            self._apply_filter()
+            self.offset = 0
+            self._render()
+
+    def _apply_sort(self):
+        import numpy as np
+
+        values = self.rows[self.sort_column]
+        if self.sort_column == "similarity":
+            # 유사도 없는 방(NaN)은 항상 맨 뒤
+            values = np.where(np.isnan(values), -np.inf if self.sort_descending else np.inf, values)
+
+        # 값의 순위로 바꾼 뒤 정렬 (같은 값이면 방/좌석 순서 유지)
+        _, ranks = np.unique(values, return_inverse=True)
+        if self.sort_descending:
+            ranks = -ranks
+        self.sorted_order = np.lexsort((np.arange(len(ranks)), ranks)).astype(np.int64)
+
+    def _apply_filter(self):
+        if self.filter_mask is None:
+            self.order = self.sorted_order
+        else:
+            self.order = self.sorted_order[self.filter_mask[self.sorted_order]]
+
+    def set_filter(self, row_indices):
+        """해당 행만 표시 (None이면 전체 표시)"""
+        import numpy as np
+
+        if self.rows is None:
+            return
+        if row_indices is None:
+            self.filter_mask = None
+        else:
+            self.filter_mask = np.zeros(len(self.rows["room"]), dtype=bool)
+            self.filter_mask[np.asarray(row_indices, dtype=np.int64)] = True
+        self._apply_filter()
+        self.offset = 0
+        self._render()
+
+    def row_position(self, row_index):
+        """rows 인덱스가 현재 정렬 순서에서 몇 번째인지 (없으면 -1)"""
+        import numpy as np
+
+        positions = np.flatnonzero(self.order == row_index)
+        return int(positions[0]) if len(positions) else -1
+
+    def scroll_to_row(self, row_index):
+        """해당 행이 보이도록 스크롤"""
+        position = self.row_position(row_index)
+        if position < 0:
+            return
+        if position < self.offset or position >= self.offset + self.visible_rows:
+            self.offset = min(max(0, position - self.visible_rows // 2), self._max_offset())
+        self._render()
+
+    def set_highlight(self, row_indices):
+        """강조 표시할 행 설정 (rows 인덱스 집합)"""
+        self.highlighted = set(int(i) for i in row_indices)
+        self._render()
+
+    # ----- 스크롤/그리기 -----
+    def _max_offset(self):
+        return max(0, self.total_rows - self.visible_rows)
+
+    def _scroll_units(self, units):
+        self.offset = min(max(0, self.offset + int(units)), self._max_offset())
+        self._render()
+        return "break"
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.offset = int(float(args[0]) * self.total_rows)
+            self.offset = min(max(0, self.offset), self._max_offset())
+            self._render()
+        elif action == "scroll":
+            amount, what = int(args[0]), args[1]
+            step = self.visible_rows if what == "pages" else 1
+            self._scroll_units(amount * step)
+
+    def _format_row(self, index):
+        rows = self.rows
+        student_id = int(rows["student_id"][index])
+        similarity = rows["similarity"][index]
+        return (
+            f"{int(rows['room'][index])}번방",
+            f"좌석{int(rows['seat'][index])}",
+            str(student_id) if student_id else "빈자리",
+            rows["name"][index] if student_id else "",
+            f"{similarity:.3f}" if not math.isnan(similarity) else "-",
+        )
+
+    def _render(self):
+        """현재 offset부터 보이는 행 수만큼 항목 내용 갱신"""
+        blank = ("",) * len(RESULT_COLUMNS)
+        for i, item in enumerate(self.items):
+            position = self.offset + i
+            if self.rows is None or position >= self.total_rows:
+                self.tree.item(item, values=blank, tags=())
+                continue
+            index = int(self.order[position])
+            tags = []
+            if index in self.highlighted:
+                tags.append("highlight")
+            if not self.rows["student_id"][index]:
+                tags.append("empty")
+            self.tree.item(item, values=self._format_row(index), tags=tags)
+
+        if self.total_rows:
+            first = self.offset / self.total_rows
+            last = min(1.0, (self.offset + self.visible_rows) / self.total_rows)
+        else:
+            first, last = 0.0, 1.0
+        self.scrollbar.set(first, last)
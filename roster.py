@@ -0,0 +1,554 @@
+"""
+학생 명단(엑셀) 읽기 및 분석 유틸리티
+"""
+import hashlib
+import os
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+# factor 컬럼은 이 컬럼 이후에 위치
+FACTOR_ANCHOR_COLUMN = "현재 룸메이트 3"
+
+ROOMMATE_COLUMNS = ["현재 룸메이트 1", "현재 룸메이트 2", "현재 룸메이트 3"]
+
+# factor 감지 시 먼저 확인할 표본 행 수
+FACTOR_SAMPLE_ROWS = 200
+
+
+def _classify_column(values):
+    """
+    컬럼 값들이 숫자형인지 판정
+
+    Returns:
+        tuple: (판정, 최소값, 최대값)
+            판정은 True(숫자형), False(숫자형 아님), None(값이 없어 판단 불가)
+    """
+    if pd.api.types.is_datetime64_any_dtype(values) or pd.api.types.is_timedelta64_dtype(values):
+        return False, None, None
+
+    non_null = values.dropna()
+    if len(non_null) == 0:
+        return None, None, None
+
+    if pd.api.types.is_bool_dtype(non_null) or not pd.api.types.is_numeric_dtype(non_null):
+        # 문자열로 저장된 숫자("3", "4.5")도 허용, 하나라도 변환 불가하면 숫자형 아님
+        numeric = pd.to_numeric(non_null.astype(str).str.strip(), errors="coerce")
+        if numeric.isna().any():
+            return False, None, None
+    else:
+        numeric = non_null
+
+    return True, float(numeric.min()), float(numeric.max())
+
+
+def detect_factor_columns(source, sample_rows=FACTOR_SAMPLE_ROWS):
+    """
+    '현재 룸메이트 3' 컬럼 이후의 숫자형 컬럼(factor)을 감지
+
+    헤더와 앞쪽 표본 행만 읽어서 판정하고, 표본에 값이 하나도 없어
+    판단이 애매한 컬럼만 전체 행을 다시 확인합니다.
+
+    Args:
+        source: xlsx 파일 경로 또는 DataFrame
+        sample_rows: 먼저 확인할 표본 행 수
+
+    Returns:
+        dict: {컬럼명: (최소값, 최대값)} - 컬럼 순서 유지.
+              '현재 룸메이트 3' 컬럼이 없으면 None
+              (최소/최대값은 판정에 사용한 행 기준이며, 정확한 값은 전체 명단에서 계산)
+    """
+    if isinstance(source, pd.DataFrame):
+        sample = source.head(sample_rows)
+    else:
+        sample = pd.read_excel(source, nrows=sample_rows)
+
+    if FACTOR_ANCHOR_COLUMN not in sample.columns:
+        return None
+
+    anchor_idx = sample.columns.get_loc(FACTOR_ANCHOR_COLUMN)
+    candidate_columns = list(sample.columns[anchor_idx + 1:])
+    sample_is_complete = len(sample) < sample_rows
+
+    factor_ranges = {}
+    ambiguous_columns = []
+    for col in candidate_columns:
+        is_numeric, col_min, col_max = _classify_column(sample[col])
+        if is_numeric is None:
+            if not sample_is_complete:
+                ambiguous_columns.append(col)
+            continue
+        if is_numeric:
+            factor_ranges[col] = (col_min, col_max)
+
+    # 표본만으로 판단할 수 없는 컬럼은 해당 컬럼만 전체 행을 읽어 확인
+    if ambiguous_columns:
+        if isinstance(source, pd.DataFrame):
+            full = source[ambiguous_columns]
+        else:
+            full = pd.read_excel(source, usecols=ambiguous_columns)
+        for col in ambiguous_columns:
+            is_numeric, col_min, col_max = _classify_column(full[col])
+            if is_numeric:
+                factor_ranges[col] = (col_min, col_max)
+
+    # 원래 컬럼 순서대로 정렬
+    return {col: factor_ranges[col] for col in candidate_columns if col in factor_ranges}
+
+
+class RosterLoadCancelled(Exception):
+    """명단 불러오기가 사용자에 의해 취소됨"""
+
+
+def summarize_feasibility(df):
+    """
+    배정 가능 여부를 미리 확인하기 위한 명단 요약
+
+    Args:
+        df: 학생 명단 DataFrame
+
+    Returns:
+        dict: 학생 수, 방 수, 빈 좌석 수, 중복 학번 수, 조건 보유 학생 수 등
+    """
+    if "학번" not in df.columns:
+        raise ValueError("'학번' 컬럼을 찾을 수 없습니다.")
+
+    student_ids = pd.to_numeric(df["학번"], errors="coerce").dropna()
+    num_students = len(student_ids)
+    num_rooms = (num_students + 3) // 4
+
+    roommate_columns = [c for c in ROOMMATE_COLUMNS if c in df.columns]
+    avoid_columns = [c for c in df.columns if str(c).replace(" ", "").startswith("배려학생")]
+
+    def count_with_values(columns):
+        if not columns:
+            return 0
+        values = df[columns].apply(pd.to_numeric, errors="coerce")
+        return int((values.fillna(0) != 0).any(axis=1).sum())
+
+    return {
+        "학생 수": num_students,
+        "방 수": num_rooms,
+        "빈 좌석 수": num_rooms * 4 - num_students,
+        "중복 학번 수": int(student_ids.duplicated().sum()),
+        "학번 누락 행 수": int(len(df) - num_students),
+        "이전 룸메이트 보유 학생 수": count_with_values(roommate_columns),
+        "배려 학생 보유 학생 수": count_with_values(avoid_columns),
+        "누락된 필수 컬럼": [c for c in ROOMMATE_COLUMNS if c not in df.columns],
+    }
+
+
+def _id_array(values):
+    """학번 컬럼을 정수 배열로 변환 (int32에 들어가면 int32, 아니면 int64)"""
+    values = pd.to_numeric(values, errors="coerce").fillna(0).to_numpy(dtype=np.int64)
+    if len(values) == 0 or (values.min() >= np.iinfo(np.int32).min and values.max() <= np.iinfo(np.int32).max):
+        return values.astype(np.int32)
+    return values
+
+
+def _id_matrix(df, columns):
+    """학번을 담은 여러 컬럼을 (학생 수 x 컬럼 수) 정수 행렬로 변환 (빈칸/NaN은 0)"""
+    if not columns:
+        return np.zeros((len(df), 0), dtype=np.int32)
+    values = df[columns].apply(pd.to_numeric, errors="coerce").fillna(0)
+    return np.column_stack([_id_array(values[col]) for col in columns])
+
+
+class RosterNameMap(Mapping):
+    """
+    학번 → 이름 조회용 읽기 전용 매핑 (dict 사본을 만들지 않고 CompiledRoster 배열을 그대로 사용)
+    """
+
+    def __init__(self, roster):
+        self._roster = roster
+
+    def __getitem__(self, student_id):
+        name = self._roster.name_of(student_id)
+        if name is None:
+            raise KeyError(student_id)
+        return name
+
+    def __iter__(self):
+        roster = self._roster
+        if roster.names is None:
+            return iter(())
+        has_name = np.asarray(roster.names.codes) >= 0
+        return iter(roster.ids[has_name].tolist())
+
+    def lookup(self, student_ids):
+        """학번 배열 → 이름 배열 (한 번에 조회, 없으면 NA)"""
+        return self._roster.names_for(student_ids)
+
+    def __len__(self):
+        if self._roster.names is None:
+            return 0
+        return int((np.asarray(self._roster.names.codes) >= 0).sum())
+
+
+class ConflictGraph:
+    """
+    같은 방 금지 관계 (CSR 희소 인접 구조)
+
+    학번 x인 학생이 방에 들어오면 blocked_rows(x)에 있는 행의 학생들은 그 방 후보에서 빠집니다.
+    엔진은 방 구성원이 바뀔 때만 blocked 표시를 갱신하므로, 금지 관계가 아무리 많아도
+    후보 한 명을 확인하는 비용은 배열 조회 한 번입니다.
+
+    Attributes:
+        member_ids: 금지 관계가 있는 학번 (정렬, 중복 없음)
+        indptr: member_ids[i]의 대상 행은 rows[indptr[i]:indptr[i + 1]]
+        rows: 대상 학생 행 번호 (int32)
+    """
+
+    def __init__(self, member_ids, indptr, rows):
+        self.member_ids = member_ids
+        self.indptr = indptr
+        self.rows = rows
+
+    @classmethod
+    def from_edges(cls, member_ids, rows):
+        """(방에 들어온 학번, 제외할 행 번호) 간선 배열로 생성 (중복 간선 제거)"""
+        member_ids = np.asarray(member_ids, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(member_ids):
+            edges = np.unique(np.stack([member_ids, rows], axis=1), axis=0)
+            member_ids, rows = edges[:, 0], edges[:, 1]
+        keys, starts = np.unique(member_ids, return_index=True)
+        indptr = np.append(starts, len(member_ids)).astype(np.int64)
+        return cls(keys, indptr, rows.astype(np.int32))
+
+    @property
+    def num_edges(self):
+        return len(self.rows)
+
+    @property
+    def nbytes(self):
+        return self.member_ids.nbytes + self.indptr.nbytes + self.rows.nbytes
+
+    def blocked_rows(self, student_id):
+        """학번 student_id와 같은 방에 배정하면 안 되는 학생 행 번호 배열"""
+        pos = int(np.searchsorted(self.member_ids, student_id))
+        if pos < len(self.member_ids) and self.member_ids[pos] == student_id:
+            return self.rows[self.indptr[pos]:self.indptr[pos + 1]]
+        return self.rows[:0]
+
+
+class CompiledRoster:
+    """
+    배정 실행 전에 미리 분석해 둔 학생 명단 (배정에 필요한 컬럼만 압축된 형태로 보관)
+
+    Attributes:
+        ids: 학번 (int32, 범위를 넘으면 int64) - 원본 행 순서, 학번 없는 행은 제외
+        names: 이름 (pd.Categorical, '이름' 컬럼이 없으면 None)
+        seat_codes: 현재 좌석 번호 (int8, 없으면 0)
+        prev_roommates: 현재 룸메이트 1~3 학번 (학생 수 x 3, 없으면 0)
+        avoid_students: 배려 학생 학번 (학생 수 x 배려 학생 컬럼 수, 없으면 0)
+        factor_names: factor 컬럼 이름 리스트
+        factors: factor 값 (float32, 학생 수 x factor 수, 빈칸은 NaN)
+        factor_ranges: {factor 컬럼명: (최소값, 최대값)} ('현재 룸메이트 3' 컬럼이 없으면 None)
+        summary: summarize_feasibility 결과
+        source: 원본 파일 경로
+        sheet_name: 원본 시트 이름 (여러 시트 통합 문서에서 불러온 경우)
+    """
+
+    def __init__(self, df, factor_ranges, source=None, extra_factor_columns=(), sheet_name=None):
+        self.summary = summarize_feasibility(df)
+        self.source = source
+        self.sheet_name = sheet_name
+
+        # 학번이 없는 행은 배정 대상이 아니므로 제외
+        id_values = pd.to_numeric(df["학번"], errors="coerce")
+        df = df.loc[id_values.notna()]
+        self.ids = _id_array(df["학번"])
+
+        if "이름" in df.columns:
+            self.names = pd.Categorical(df["이름"].astype("string"))
+        else:
+            self.names = None
+
+        if "현재 좌석 번호" in df.columns:
+            seats = pd.to_numeric(df["현재 좌석 번호"], errors="coerce").fillna(0).to_numpy(dtype=np.float64, copy=True)
+            seats[(seats < 0) | (seats > 127)] = 0
+            self.seat_codes = seats.astype(np.int8)
+        else:
+            self.seat_codes = np.zeros(len(df), dtype=np.int8)
+
+        roommate_columns = [c for c in ROOMMATE_COLUMNS if c in df.columns]
+        self.prev_roommates = _id_matrix(df, roommate_columns)
+        self.avoid_columns = [c for c in df.columns if str(c).replace(" ", "").startswith("배려학생")]
+        self.avoid_students = _id_matrix(df, self.avoid_columns)
+
+        # factor: 감지된 컬럼 + 추가로 요청된 컬럼
+        factor_names = list(factor_ranges or {})
+        factor_names += [c for c in extra_factor_columns if c in df.columns and c not in factor_names]
+        self.factor_names = factor_names
+        if factor_names:
+            self.factors = df[factor_names].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+        else:
+            self.factors = np.zeros((len(df), 0), dtype=np.float32)
+
+        # 전체 행 기준의 정확한 factor 값 범위
+        if factor_ranges is None:
+            self.factor_ranges = None
+        else:
+            self.factor_ranges = {}
+            for j, name in enumerate(factor_names):
+                column = self.factors[:, j]
+                if np.isnan(column).all():
+                    self.factor_ranges[name] = factor_ranges.get(name, (np.nan, np.nan))
+                else:
+                    self.factor_ranges[name] = (float(np.nanmin(column)), float(np.nanmax(column)))
+
+        # 학번 → 행 번호 조회용 정렬 인덱스 (중복 학번은 첫 번째 행 사용)
+        self._sorted_order = np.argsort(self.ids, kind="stable").astype(np.int32)
+        self._sorted_ids = self.ids[self._sorted_order]
+
+    @property
+    def num_students(self):
+        return len(self.ids)
+
+    @property
+    def content_hash(self):
+        """학번·factor 값 기준 명단 내용 해시 (같은 내용이면 파일이 달라도 같음 - 유사도 캐시 키)"""
+        if getattr(self, "_content_hash", None) is None:
+            digest = hashlib.sha256()
+            digest.update(self.ids.tobytes())
+            digest.update("\x1f".join(map(str, self.factor_names)).encode("utf-8"))
+            digest.update(np.ascontiguousarray(self.factors).tobytes())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def index_of(self, student_id):
+        """학번에 해당하는 행 번호 (없으면 -1)"""
+        pos = int(np.searchsorted(self._sorted_ids, student_id))
+        if pos < len(self._sorted_ids) and self._sorted_ids[pos] == student_id:
+            return int(self._sorted_order[pos])
+        return -1
+
+    def indices_of(self, student_ids):
+        """학번 배열에 해당하는 행 번호 배열 (없으면 -1)"""
+        student_ids = np.asarray(student_ids)
+        pos = np.searchsorted(self._sorted_ids, student_ids)
+        pos = np.minimum(pos, max(len(self._sorted_ids) - 1, 0))
+        if len(self._sorted_ids) == 0:
+            return np.full(student_ids.shape, -1, dtype=np.int64)
+        found = self._sorted_ids[pos] == student_ids
+        return np.where(found, self._sorted_order[pos], -1)
+
+    def name_of(self, student_id):
+        """학번에 해당하는 이름 (이름이 없으면 None)"""
+        if self.names is None:
+            return None
+        row = self.index_of(student_id)
+        if row < 0:
+            return None
+        code = self.names.codes[row]
+        if code < 0:
+            return None
+        return self.names.categories[code]
+
+    def names_for(self, student_ids):
+        """
+        학번 배열에 해당하는 이름 배열 (없으면 NA)
+
+        Returns:
+            pd.arrays.StringArray
+        """
+        rows = self.indices_of(student_ids)
+        if self.names is None:
+            return pd.array([pd.NA] * len(rows), dtype="string")
+        codes = np.where(rows >= 0, np.asarray(self.names.codes)[np.maximum(rows, 0)], -1)
+        return pd.array(pd.Categorical.from_codes(codes, categories=self.names.categories), dtype="string")
+
+    def name_map(self):
+        """학번 → 이름 매핑 (dict 사본 없이 조회)"""
+        return RosterNameMap(self)
+
+    def factor_matrix(self, factor_names):
+        """
+        선택된 factor들의 값 행렬 (float32, 학생 수 x 선택 factor 수)
+        명단에 없는 factor는 무시
+
+        Returns:
+            tuple: (사용된 factor 이름 리스트, 값 행렬)
+        """
+        used = [name for name in (factor_names or []) if name in self.factor_names]
+        columns = [self.factor_names.index(name) for name in used]
+        return used, self.factors[:, columns]
+
+    def conflict_sets(self, blacklist_pairs=None):
+        """
+        학생별로 같은 방에 배정하면 안 되는 학번 집합 생성
+        (현재 룸메이트 + 배려 학생 + 블랙리스트 상대, 조건이 있는 학생만 포함)
+
+        Args:
+            blacklist_pairs: 블랙리스트 조합 리스트 [(학생1, 학생2), ...] - 양방향으로 적용
+
+        Returns:
+            dict: {행 번호: 학번 set}
+        """
+        combined = np.hstack([self.prev_roommates, self.avoid_students])
+        conflicts = {}
+        for row in np.flatnonzero((combined != 0).any(axis=1)).tolist():
+            conflicts[row] = {v for v in combined[row].tolist() if v != 0}
+
+        # 블랙리스트는 양방향으로 추가
+        partners = {}
+        for student1, student2 in blacklist_pairs or []:
+            student1, student2 = int(student1), int(student2)
+            if student1 == student2:
+                continue
+            partners.setdefault(student1, set()).add(student2)
+            partners.setdefault(student2, set()).add(student1)
+        if partners:
+            keys = list(partners)
+            for student_id, row in zip(keys, self.indices_of(keys).tolist()):
+                if row >= 0:
+                    conflicts.setdefault(row, set()).update(partners[student_id])
+
+        return conflicts
+
+    def conflict_graph(self, blacklist_pairs=None, history_pairs=None):
+        """
+        같은 방 금지 관계를 CSR 구조로 생성 (엔진 후보 확인용, 모든 관계를 양방향으로 적용)
+
+        Args:
+            blacklist_pairs: 블랙리스트 조합 리스트 또는 (n x 2) 배열 - 양방향으로 적용
+            history_pairs: 지난 학기 룸메이트 조합 (n x 2) 배열 - 양방향으로 적용
+
+        Returns:
+            ConflictGraph: 학번 → 그 학생과 같은 방이 되면 안 되는 행 번호들
+        """
+        member_parts = []
+        row_parts = []
+
+        # 현재 룸메이트 + 배려 학생: 행 r의 학생과 학번 v는 같은 방 불가 (어느 한쪽 명단에만 적혀 있어도 양방향)
+        combined = np.hstack([self.prev_roommates, self.avoid_students])
+        rows, columns = np.nonzero(combined)
+        listed_ids = combined[rows, columns]
+        member_parts.append(listed_ids)
+        row_parts.append(rows)
+        listed_rows = self.indices_of(listed_ids)
+        found = listed_rows >= 0
+        member_parts.append(self.ids[rows[found]])
+        row_parts.append(listed_rows[found])
+
+        # 블랙리스트 / 룸메이트 기록: 양방향 (명단에 있는 학생만)
+        for pairs in (blacklist_pairs, history_pairs):
+            if pairs is None or len(pairs) == 0:
+                continue
+            pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+            pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+            for a, b in ((0, 1), (1, 0)):
+                target_rows = self.indices_of(pairs[:, a])
+                found = target_rows >= 0
+                member_parts.append(pairs[found, b])
+                row_parts.append(target_rows[found])
+
+        member_ids = np.concatenate(member_parts)
+        rows = np.concatenate(row_parts)
+
+        # 명단에 없는 학번은 방에 들어올 일이 없으므로 제외
+        in_roster = self.indices_of(member_ids) >= 0
+        return ConflictGraph.from_edges(member_ids[in_roster], rows[in_roster])
+
+    def memory_report(self):
+        """
+        구성 요소별 메모리 사용량 (bytes)
+
+        Returns:
+            dict: {구성 요소: 바이트 수, ..., "합계": 전체 바이트 수}
+        """
+        report = {
+            "학번": self.ids.nbytes,
+            "이름": 0,
+            "현재 좌석 번호": self.seat_codes.nbytes,
+            "현재 룸메이트": self.prev_roommates.nbytes,
+            "배려 학생": self.avoid_students.nbytes,
+            "factor": self.factors.nbytes,
+            "학번 인덱스": self._sorted_order.nbytes + self._sorted_ids.nbytes,
+        }
+        if self.names is not None:
+            report["이름"] = int(self.names.codes.nbytes + self.names.categories.memory_usage(deep=True))
+        report["합계"] = sum(report.values())
+        return report
+
+
+def load_roster(file_path, progress_callback=None, cancel_event=None):
+    """
+    엑셀 명단 읽기 → factor 감지 → 배정 가능 여부 요약을 한 번에 수행
+    (GUI에서는 작업 스레드에서 호출)
+
+    Args:
+        file_path: xlsx 파일 경로
+        progress_callback: progress_callback(message, fraction) 진행 상황 보고 함수
+        cancel_event: threading.Event - 설정되면 다음 단계로 넘어가기 전에 중단
+
+    Returns:
+        CompiledRoster
+    """
+    def report(message, fraction):
+        if cancel_event is not None and cancel_event.is_set():
+            raise RosterLoadCancelled()
+        if progress_callback is not None:
+            progress_callback(message, fraction)
+
+    report("엑셀 파일 읽는 중...", 0.0)
+    df = pd.read_excel(file_path)
+
+    report("Factor 컬럼 감지 중...", 0.7)
+    factor_ranges = detect_factor_columns(df)
+
+    report("명단 압축 및 배정 가능 여부 확인 중...", 0.85)
+    roster = CompiledRoster(df, factor_ranges, source=file_path)
+    del df
+
+    report("불러오기 완료", 1.0)
+    return roster
+
+
+def load_workbook(file_path, progress_callback=None, cancel_event=None):
+    """
+    통합 문서의 모든 시트를 한 번에 읽어 시트별 명단으로 분석
+    (학년별로 시트를 나눠 둔 파일을 시트마다 따로 읽지 않도록 파일은 한 번만 열어서 파싱)
+
+    '학번' 컬럼이 있는 시트만 명단으로 인식합니다.
+    CSV/Parquet 파일은 파일 이름을 시트 이름으로 하는 시트 하나로 취급합니다.
+
+    Args:
+        file_path: xlsx, csv, parquet 파일 경로
+        progress_callback: progress_callback(message, fraction) 진행 상황 보고 함수
+        cancel_event: threading.Event - 설정되면 다음 시트로 넘어가기 전에 중단
+
+    Returns:
+        dict: {시트 이름: CompiledRoster} - 통합 문서의 시트 순서 유지
+    """
+    def report(message, fraction):
+        if cancel_event is not None and cancel_event.is_set():
+            raise RosterLoadCancelled()
+        if progress_callback is not None:
+            progress_callback(message, fraction)
+
+    report("엑셀 파일 읽는 중...", 0.0)
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".csv":
+        sheets = {os.path.splitext(os.path.basename(file_path))[0]: pd.read_csv(file_path, encoding="utf-8-sig")}
+    elif ext == ".parquet":
+        sheets = {os.path.splitext(os.path.basename(file_path))[0]: pd.read_parquet(file_path)}
+    else:
+        sheets = pd.read_excel(file_path, sheet_name=None)
+
+    roster_sheets = [name for name, df in sheets.items() if "학번" in df.columns]
+    if not roster_sheets:
+        raise ValueError("'학번' 컬럼이 있는 시트를 찾을 수 없습니다.")
+
+    rosters = {}
+    for i, sheet_name in enumerate(roster_sheets):
+        report(f"'{sheet_name}' 시트 분석 중... ({i + 1}/{len(roster_sheets)})", 0.7 + 0.3 * i / len(roster_sheets))
+        df = sheets.pop(sheet_name)
+        factor_ranges = detect_factor_columns(df)
+        rosters[sheet_name] = CompiledRoster(df, factor_ranges, source=file_path, sheet_name=sheet_name)
+        del df
+
+    report("불러오기 완료", 1.0)
+    return rosters
@@ -0,0 +1,253 @@
+"""
+학생 간 유사도 캐시
+
+같은 명단·같은 factor로 하루에도 여러 번 다시 배정하므로, 유사도를 매번 다시 계산하지 않도록
+(명단 내용 해시, factor, 가중치, 거리 방식)별로 유사도 표를 만들어 두고 재사용합니다.
+
+factor 값은 1~5 척도라 서로 다른 factor 값 조합(프로필)의 수가 학생 수보다 훨씬 적으므로
+학생 x 학생 행렬 대신 "프로필 x 프로필" 유사도 표와 학생별 프로필 번호만 저장합니다.
+(factor 3개면 학생이 몇 명이든 표는 최대 125 x 125)
+
+- 메모리: 최근에 쓴 표부터 남기는 LRU (전체 크기 제한)
+- 디스크 (선택): cache_dir 또는 환경 변수 DORMITORY_SIMILARITY_CACHE_DIR에 .npy로 저장하고
+  memmap으로 열어서 다른 프로세스(재시작 작업, 다음 실행)도 계산 없이 사용
+
+유사도 값은 similarity_engine.room_similarity_scores와 같은 식·같은 순서로 계산하므로
+캐시를 써도 배정 결과는 바뀌지 않습니다.
+"""
+import collections
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+SIMILARITY_CACHE_DIR_ENV = "DORMITORY_SIMILARITY_CACHE_DIR"
+SIMILARITY_METRIC = "euclidean"
+
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # 메모리 캐시 전체 크기
+MAX_TABLE_BYTES = 128 * 1024 * 1024  # 표 하나의 최대 크기 (넘으면 캐시 없이 직접 계산)
+BUILD_BLOCK_ROWS = 256  # 표를 만들 때 한 번에 계산할 프로필 수 (중간 배열 크기 제한)
+
+
+class SimilarityTable:
+    """
+    프로필 x 프로필 유사도 표
+
+    Attributes:
+        codes: 학생 행 번호 → 프로필 번호 (int32)
+        matrix: 프로필 간 유사도 (float64, np.memmap일 수 있음)
+    """
+
+    def __init__(self, codes, matrix):
+        self.codes = codes
+        self.matrix = matrix
+
+    @property
+    def num_profiles(self):
+        return len(self.matrix)
+
+    @property
+    def nbytes(self):
+        # memmap은 디스크에 있으므로 메모리 캐시 크기에는 학생별 프로필 번호만 계산
+        matrix_bytes = 0 if isinstance(self.matrix, np.memmap) else self.matrix.nbytes
+        return self.codes.nbytes + matrix_bytes
+
+    def room_scores(self, member_rows, candidate_rows):
+        """
+        후보 학생별 방 평균 유사도 (room_similarity_scores와 같은 값)
+
+        Args:
+            member_rows: 방 구성원 행 번호들
+            candidate_rows: 후보 학생 행 번호 배열
+
+        Returns:
+            np.ndarray: 후보별 평균 유사도 점수 (후보 수,)
+        """
+        member_codes = self.codes[np.asarray(member_rows, dtype=np.int64)]
+        candidate_codes = self.codes[candidate_rows]
+        return self.matrix[np.ix_(candidate_codes, member_codes)].mean(axis=1)
+
+
+def feature_profiles(feature_matrix):
+    """
+    학생 특성 행렬 → 서로 다른 factor 값 조합(프로필)과 학생별 프로필 번호
+
+    Returns:
+        tuple: (프로필 행렬 (프로필 수 x 특성 수), 학생 행 번호 → 프로필 번호 (int32))
+    """
+    features = np.asarray(feature_matrix, dtype=np.float64)
+    features = np.where(np.isnan(features), 3.0, features)  # 1~5 척도의 중간값
+    profiles, codes = np.unique(features, axis=0, return_inverse=True)
+    return profiles, codes.ravel().astype(np.int32)
+
+
+def build_similarity_table(feature_matrix, weights=None, out=None, profiles=None):
+    """
+    factor 값 행렬로 유사도 표 생성
+
+    Args:
+        feature_matrix: 학생 특성 행렬 (학생 수 x 특성 수)
+        weights: factor별 가중치 배열 (None이면 모두 1.0)
+        out: 결과를 쓸 배열 생성 함수 out(shape) (디스크 memmap 등, None이면 메모리)
+        profiles: 이미 계산한 feature_profiles(feature_matrix) 결과 (None이면 여기서 계산)
+
+    Returns:
+        SimilarityTable
+    """
+    profiles, codes = profiles if profiles is not None else feature_profiles(feature_matrix)
+
+    num_profiles, num_features = profiles.shape
+    matrix = out((num_profiles, num_profiles)) if out is not None else np.empty((num_profiles, num_profiles))
+
+    if weights is None:
+        max_distance = np.sqrt(num_features * (5 - 1) ** 2)
+    else:
+        max_distance = np.sqrt(np.sum(weights) * (5 - 1) ** 2)
+
+    if max_distance == 0:
+        matrix[:] = 1.0
+    else:
+        for start in range(0, num_profiles, BUILD_BLOCK_ROWS):
+            block = profiles[start:start + BUILD_BLOCK_ROWS]
+            squared = (block[:, None, :] - profiles[None, :, :]) ** 2
+            if weights is not None:
+                squared = squared * weights
+            distances = np.sqrt(squared.sum(axis=2))
+            matrix[start:start + len(block)] = np.clip(1.0 - distances / max_distance, 0.0, 1.0)
+
+    return SimilarityTable(codes, matrix)
+
+
+def similarity_cache_key(roster, factor_names, weights=None, metric=SIMILARITY_METRIC):
+    """(명단 내용 해시, factor, 가중치, 거리 방식) → 캐시 키 문자열"""
+    payload = {
+        "roster": roster.content_hash,
+        "factors": list(factor_names),
+        "weights": None if weights is None else [float(w) for w in weights],
+        "metric": metric,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class SimilarityCache:
+    """
+    유사도 표 캐시 (메모리 LRU + 선택적 디스크 memmap)
+
+    Args:
+        max_bytes: 메모리 캐시 전체 크기 제한
+        cache_dir: 디스크 캐시 폴더 (None이면 환경 변수 DORMITORY_SIMILARITY_CACHE_DIR, 없으면 메모리만)
+        max_table_bytes: 표 하나의 최대 크기 (factor 값이 연속값이라 프로필이 너무 많으면 캐시하지 않음)
+    """
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, cache_dir=None, max_table_bytes=MAX_TABLE_BYTES):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir if cache_dir is not None else os.environ.get(SIMILARITY_CACHE_DIR_ENV)
+        self.max_table_bytes = max_table_bytes
+        self._tables = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._tables)
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+            self._bytes = 0
+
+    def get(self, roster, factor_names, feature_matrix, weights=None, metric=SIMILARITY_METRIC):
+        """
+        유사도 표 조회 (없으면 디스크 → 새로 계산 순서로 준비)
+
+        Args:
+            roster: CompiledRoster (내용 해시를 키로 사용)
+            factor_names: 유사도 계산에 사용하는 factor 리스트
+            feature_matrix: 그 factor들의 값 행렬 (roster.factor_matrix 결과)
+            weights: factor별 가중치 배열 (None이면 모두 1.0)
+            metric: 거리 방식 (현재 "euclidean"만 지원)
+
+        Returns:
+            SimilarityTable 또는 None (표가 너무 커서 캐시하지 않는 경우 - 직접 계산해야 함)
+        """
+        if metric != SIMILARITY_METRIC:
+            raise ValueError(f"지원하지 않는 유사도 방식입니다: {metric}")
+
+        key = similarity_cache_key(roster, factor_names, weights, metric)
+        with self._lock:
+            table = self._tables.get(key)
+            if table is not None:
+                self._tables.move_to_end(key)
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        table = self._load(key) if self.cache_dir else None
+        if table is None:
+            table = self._build(key, feature_matrix, weights)
+            if table is None:
+                return None
+
+        with self._lock:
+            if key not in self._tables:
+                self._tables[key] = table
+                self._bytes += table.nbytes
+            while self._bytes > self.max_bytes and len(self._tables) > 1:
+                _, evicted = self._tables.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return table
+
+    def _paths(self, key):
+        return (os.path.join(self.cache_dir, f"{key}.codes.npy"),
+                os.path.join(self.cache_dir, f"{key}.matrix.npy"))
+
+    def _load(self, key):
+        codes_path, matrix_path = self._paths(key)
+        if not (os.path.exists(codes_path) and os.path.exists(matrix_path)):
+            return None
+        try:
+            return SimilarityTable(np.load(codes_path), np.load(matrix_path, mmap_mode="r"))
+        except (OSError, ValueError):
+            return None  # 쓰다 만 파일 등 - 새로 계산
+
+    def _build(self, key, feature_matrix, weights):
+        # 프로필은 한 번만 구해서 표 크기 확인과 표 생성에 같이 사용 (학생 수만큼의 행 정렬이 가장 비쌈)
+        profiles = feature_profiles(feature_matrix)
+        num_profiles = len(profiles[0])
+        if num_profiles * num_profiles * 8 > self.max_table_bytes:
+            return None
+
+        if not self.cache_dir:
+            return build_similarity_table(feature_matrix, weights, profiles=profiles)
+
+        # 디스크에 임시 이름으로 쓰고 다 쓴 뒤 이름을 바꿔서, 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 함
+        os.makedirs(self.cache_dir, exist_ok=True)
+        codes_path, matrix_path = self._paths(key)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp.npy"
+
+        def disk_matrix(shape):
+            return np.lib.format.open_memmap(matrix_path + suffix, mode="w+", dtype=np.float64, shape=shape)
+
+        table = build_similarity_table(feature_matrix, weights, out=disk_matrix, profiles=profiles)
+        table.matrix.flush()
+        del table.matrix
+        np.save(codes_path + suffix, table.codes)
+        os.replace(codes_path + suffix, codes_path)
+        os.replace(matrix_path + suffix, matrix_path)
+        return SimilarityTable(table.codes, np.load(matrix_path, mmap_mode="r"))
+
+
+# 프로세스 전체에서 공유하는 기본 캐시 (재시작 작업이 같은 작업 프로세스에서 실행되면 그대로 재사용)
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def default_similarity_cache():
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SimilarityCache()
+        return _default_cache
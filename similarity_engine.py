@@ -81,3 +81,118 @@ def get_student_features(df, student_id, feature_columns):
     
     return features
 
+
+
+def factor_weight_vector(factor_names, factor_weights=None):
+    """
+    factor별 가중치를 factor 순서에 맞춘 배열로 변환
+
+    Args:
+        factor_names: 유사도 계산에 사용하는 factor 리스트
+        factor_weights: {factor: 가중치} 딕셔너리 (없는 factor는 1.0, None이면 가중치 없음)
+
+    Returns:
+        np.ndarray 또는 None: factor별 가중치 (모두 1.0이면 None)
+    """
+    if not factor_weights or not factor_names:
+        return None
+
+    weights = np.array([float(factor_weights.get(name, 1.0)) for name in factor_names])
+    if (weights < 0).any() or np.isnan(weights).any():
+        raise ValueError("factor 가중치는 0 이상의 숫자여야 합니다.")
+    if (weights == 1.0).all():
+        return None
+    return weights
+
+
+def room_similarity_scores(room_members_features, candidates_features, weights=None):
+    """
+    여러 후보 학생의 방 평균 유사도 점수를 한 번에 계산
+    (calculate_room_similarity_score와 같은 점수를 numpy 벡터 연산으로 계산)
+
+    Args:
+        room_members_features: 방 구성원들의 특성 행렬 (구성원 수 x 특성 수)
+        candidates_features: 후보 학생들의 특성 행렬 (후보 수 x 특성 수)
+        weights: factor별 가중치 배열 (None이면 모두 1.0 - 가중 유클리드 거리 사용)
+
+    Returns:
+        np.ndarray: 후보별 평균 유사도 점수 (후보 수,)
+    """
+    members = np.asarray(room_members_features, dtype=np.float64)
+    candidates = np.asarray(candidates_features, dtype=np.float64)
+    if members.ndim == 1:
+        members = members.reshape(1, -1)
+
+    if len(members) == 0:
+        return np.full(len(candidates), 0.5)  # 방이 비어있으면 중간 점수 반환
+
+    # NaN 값 처리 (1~5 척도의 중간값)
+    members = np.where(np.isnan(members), 3.0, members)
+    candidates = np.where(np.isnan(candidates), 3.0, candidates)
+
+    num_features = candidates.shape[1]
+    if weights is None:
+        max_distance = np.sqrt(num_features * (5 - 1) ** 2)
+    else:
+        max_distance = np.sqrt(np.sum(weights) * (5 - 1) ** 2)
+    if max_distance == 0:
+        return np.ones(len(candidates))
+
+    # (후보 수 x 구성원 수) 거리 행렬
+    squared = (candidates[:, None, :] - members[None, :, :]) ** 2
+    if weights is not None:
+        squared = squared * weights
+    distances = np.sqrt(squared.sum(axis=2))
+    similarities = np.clip(1.0 - distances / max_distance, 0.0, 1.0)
+
+    return similarities.mean(axis=1)
+
+
+def room_pair_similarities(feature_matrix, member_rows, weights=None):
+    """
+    방마다 구성원들 사이의 평균 유사도를 한 번에 계산 (모든 방을 numpy 벡터 연산으로 처리)
+
+    Args:
+        feature_matrix: 학생 특성 행렬 (학생 수 x 특성 수)
+        member_rows: 방별 구성원의 행 번호 (방 수 x 좌석 수), 빈자리는 -1
+        weights: factor별 가중치 배열 (None이면 모두 1.0)
+
+    Returns:
+        np.ndarray: 방별 구성원 쌍의 평균 유사도 (방 수,) - 구성원이 2명 미만이면 NaN
+    """
+    features = np.asarray(feature_matrix, dtype=np.float64)
+    member_rows = np.asarray(member_rows, dtype=np.int64)
+    num_rooms, num_seats = member_rows.shape
+    num_features = features.shape[1] if features.ndim == 2 else 0
+
+    result = np.full(num_rooms, np.nan)
+    if num_rooms == 0 or num_features == 0:
+        return result
+
+    # NaN 값 처리 (1~5 척도의 중간값)
+    features = np.where(np.isnan(features), 3.0, features)
+    present = member_rows >= 0
+    room_features = features[np.where(present, member_rows, 0)]  # (방 수, 좌석 수, 특성 수)
+
+    if weights is None:
+        max_distance = np.sqrt(num_features * (5 - 1) ** 2)
+    else:
+        max_distance = np.sqrt(np.sum(weights) * (5 - 1) ** 2)
+    if max_distance == 0:
+        return result
+
+    squared = (room_features[:, :, None, :] - room_features[:, None, :, :]) ** 2
+    if weights is not None:
+        squared = squared * weights
+    distances = np.sqrt(squared.sum(axis=3))
+    similarities = np.clip(1.0 - distances / max_distance, 0.0, 1.0)
+
+    # 서로 다른 두 구성원 쌍(i < j)만 평균
+    upper = np.triu(np.ones((num_seats, num_seats), dtype=bool), k=1)
+    pair_mask = present[:, :, None] & present[:, None, :] & upper
+    pair_counts = pair_mask.sum(axis=(1, 2))
+    pair_sums = np.where(pair_mask, similarities, 0.0).sum(axis=(1, 2))
+
+    has_pairs = pair_counts > 0
+    result[has_pairs] = pair_sums[has_pairs] / pair_counts[has_pairs]
+    return result
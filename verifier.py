@@ -0,0 +1,327 @@
+"""
+배정 결과 검증기
+
+배정 엔진과 별개로, 명단과 배정 결과(결과 파일 또는 방 x 4 행렬)만 보고 규칙을 지켰는지 확인합니다.
+엔진을 바꾸거나 결과를 손으로 고친 뒤에도 모든 규칙이 지켜졌는지 증명할 수 있도록
+발견 사항을 기계가 읽을 수 있는 dict(JSON)로 돌려줍니다.
+
+검사 항목 (rule):
+    error   duplicate        같은 학생이 두 좌석 이상에 배정됨
+    error   unknown          명단에 없는 학번이 배정됨
+    error   unplaced         명단의 학생이 배정되지 않음
+    error   current_roommate 현재 룸메이트와 같은 방 (어느 한쪽 명단에만 적혀 있어도 해당)
+    error   avoid_student    배려 학생과 같은 방
+    error   blacklist        블랙리스트 조합이 같은 방
+    error   history          지난 학기 룸메이트와 같은 방
+    warning seat_rotation    이전 복도 자리(1,4) → 창가(2,3), 창가 → 복도로 바뀌지 않음 (좌석 교대 정책일 때만)
+
+학생 행 → 방 번호 배열을 한 번 만든 뒤 금지 관계 간선마다 양쪽 방 번호만 비교하므로
+학생 수 + 금지 관계 수에 비례하는 시간에 끝납니다.
+
+사용 예:
+    python verifier.py 명단.xlsx 결과.csv --blacklist 배려학생.csv --json findings.json
+    종료 코드: 0 위반 없음, 1 입력 오류, 2 error 위반 있음
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from result_io import SEATS_PER_ROOM, rooms_to_matrix
+
+HALLWAY_SEATS = (1, 4)
+WINDOW_SEATS = (2, 3)
+
+ERROR = "error"
+WARNING = "warning"
+
+# 규칙 → 심각도 (보고 순서)
+RULES = {
+    "duplicate": ERROR,
+    "unknown": ERROR,
+    "unplaced": ERROR,
+    "current_roommate": ERROR,
+    "avoid_student": ERROR,
+    "blacklist": ERROR,
+    "history": ERROR,
+    "seat_rotation": WARNING,
+}
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_VIOLATIONS = 2
+
+
+def _finding(rule, student_id, room=None, seat=None, other_id=None, detail=None):
+    finding = {"rule": rule, "severity": RULES[rule], "student_id": int(student_id)}
+    if room is not None:
+        finding["room"] = int(room)
+    if seat is not None:
+        finding["seat"] = int(seat)
+    if other_id is not None:
+        finding["other_id"] = int(other_id)
+    if detail is not None:
+        finding["detail"] = detail
+    return finding
+
+
+def _roster_edges(roster, id_columns):
+    """명단 컬럼(현재 룸메이트/배려 학생)의 (학생 행, 상대 학번) 간선"""
+    rows, columns = np.nonzero(id_columns)
+    return rows, id_columns[rows, columns]
+
+
+def _pair_edges(roster, pairs):
+    """(학번, 학번) 조합 → (학생 행, 상대 학번) 간선 (명단에 있는 쪽 기준, 조합당 한 번)"""
+    if pairs is None or len(pairs) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    pairs = np.unique(np.stack([pairs.min(axis=1), pairs.max(axis=1)], axis=1), axis=0)
+    rows = roster.indices_of(pairs[:, 0])
+    found = rows >= 0
+    return rows[found], pairs[found, 1]
+
+
+def same_room_conflicts(roster, room_of, blacklist_pairs=None, history_pairs=None):
+    """
+    같은 방에 배정된 금지 관계 학생 쌍 (검증기와 배정 품질 보고서 공통)
+
+    모든 관계는 엔진의 conflict_graph와 같이 양방향 - 현재 룸메이트/배려 학생은
+    두 학생 중 한쪽 명단에만 적혀 있어도 위반이고, 서로 적혀 있으면 한 번만 셉니다.
+
+    Args:
+        roster: CompiledRoster
+        room_of: 학생 행 → 배정된 방 번호 (0부터, 미배정 -1)
+        blacklist_pairs: 블랙리스트 조합 (학번, 학번)
+        history_pairs: 지난 학기 룸메이트 조합 (학번, 학번)
+
+    Returns:
+        dict: {규칙: (행 번호 배열, 상대 행 번호 배열)} - current_roommate, avoid_student, blacklist, history
+            (행 번호가 작은 쪽이 먼저)
+    """
+    edge_sources = {
+        "current_roommate": _roster_edges(roster, roster.prev_roommates),
+        "avoid_student": _roster_edges(roster, roster.avoid_students),
+        "blacklist": _pair_edges(roster, blacklist_pairs),
+        "history": _pair_edges(roster, history_pairs),
+    }
+    conflicts = {}
+    for rule, (rows, other_ids) in edge_sources.items():
+        other_rows = roster.indices_of(other_ids)
+        valid = (other_rows >= 0) & (other_rows != rows)
+        rows, other_rows = rows[valid], other_rows[valid]
+        same_room = (room_of[rows] >= 0) & (room_of[rows] == room_of[other_rows])
+        rows, other_rows = rows[same_room], other_rows[same_room]
+
+        # 양쪽 명단에 서로 적혀 있으면 한 번만 보고
+        low = np.minimum(rows, other_rows)
+        high = np.maximum(rows, other_rows)
+        if len(low):
+            _, first = np.unique(np.stack([low, high], axis=1), axis=0, return_index=True)
+            first.sort()
+            low, high = low[first], high[first]
+        conflicts[rule] = (low, high)
+    return conflicts
+
+
+def seat_rotation_flags(previous, seats):
+    """
+    좌석 교대 확인 (검증기와 배정 품질 보고서 공통)
+
+    Args:
+        previous: 이전 좌석 번호 배열 (0 = 없음)
+        seats: 같은 모양의 현재 좌석 번호 배열 (1~4)
+
+    Returns:
+        tuple: (교대 대상 bool 배열 - 이전 좌석이 있음, 교대함 bool 배열 - 복도 ↔ 창가로 바뀜)
+    """
+    was_hallway = np.isin(previous, HALLWAY_SEATS)
+    was_window = np.isin(previous, WINDOW_SEATS)
+    rotated = (was_hallway & np.isin(seats, WINDOW_SEATS)) | (was_window & np.isin(seats, HALLWAY_SEATS))
+    return was_hallway | was_window, rotated
+
+
+def verify_assignment(roster, room_id, blacklist_pairs=None, history_pairs=None, seat_rotation=True,
+                      max_findings=None):
+    """
+    배정 결과가 규칙을 지켰는지 검증
+
+    Args:
+        roster: CompiledRoster
+        room_id: 방 배정 결과 (dict 리스트 또는 (방 수 x 4) 행렬)
+        blacklist_pairs: 블랙리스트 조합 (학번, 학번)
+        history_pairs: 지난 학기 룸메이트 조합 (학번, 학번)
+        seat_rotation: 좌석 교대 정책 검사 여부 (3학년용 배정은 False)
+        max_findings: 규칙별로 findings에 담을 최대 개수 (None이면 전부, counts는 항상 전체 수)
+
+    Returns:
+        dict: {
+            "ok": error 위반이 없으면 True,
+            "counts": {규칙: 위반 수},
+            "errors": error 위반 합계, "warnings": warning 합계,
+            "rooms": 방 수, "students": 명단 학생 수, "placed": 배정된 좌석 수,
+            "findings": [{"rule", "severity", "student_id", "room", "seat", "other_id"}, ...]
+        }
+    """
+    matrix = rooms_to_matrix(room_id)
+    if matrix.ndim != 2 or (matrix.size and matrix.shape[1] != SEATS_PER_ROOM):
+        raise ValueError(f"배정 결과는 (방 수 x {SEATS_PER_ROOM}) 형태여야 합니다: {matrix.shape}")
+
+    counts = {rule: 0 for rule in RULES}
+    findings = {rule: [] for rule in RULES}
+
+    def report(rule, items):
+        counts[rule] += len(items)
+        limit = len(items) if max_findings is None else max(0, max_findings - len(findings[rule]))
+        findings[rule].extend(items[:limit])
+
+    room_index, seat_index = np.nonzero(matrix)
+    placed_ids = matrix[room_index, seat_index]
+    placed_rows = roster.indices_of(placed_ids)
+
+    # 명단에 없는 학번
+    unknown = np.flatnonzero(placed_rows < 0)
+    report("unknown", [
+        _finding("unknown", placed_ids[i], room_index[i] + 1, seat_index[i] + 1) for i in unknown.tolist()
+    ])
+
+    # 학생 행 → 배정된 방 (한 번 세면서 중복 배정 확인)
+    known = placed_rows >= 0
+    rows_known = placed_rows[known]
+    place_counts = np.bincount(rows_known, minlength=roster.num_students)
+    duplicate_rows = np.flatnonzero(place_counts > 1)
+    if len(duplicate_rows):
+        is_duplicate = np.isin(placed_rows, duplicate_rows)
+        report("duplicate", [
+            _finding("duplicate", placed_ids[i], room_index[i] + 1, seat_index[i] + 1)
+            for i in np.flatnonzero(is_duplicate).tolist()
+        ])
+
+    room_of = np.full(roster.num_students, -1, dtype=np.int64)
+    seat_of = np.zeros(roster.num_students, dtype=np.int64)
+    room_of[rows_known] = room_index[known]
+    seat_of[rows_known] = seat_index[known] + 1
+
+    # 배정되지 않은 학생
+    report("unplaced", [_finding("unplaced", roster.ids[r]) for r in np.flatnonzero(room_of < 0).tolist()])
+
+    # 같은 방 금지 관계
+    conflicts = same_room_conflicts(roster, room_of, blacklist_pairs, history_pairs)
+    for rule, (low, high) in conflicts.items():
+        report(rule, [
+            _finding(rule, roster.ids[a], room_of[a] + 1, seat_of[a], other_id=roster.ids[b])
+            for a, b in zip(low.tolist(), high.tolist())
+        ])
+
+    # 좌석 교대 (이전 좌석 번호가 있는 학생만)
+    if seat_rotation:
+        previous = roster.seat_codes.astype(np.int64)
+        checked, rotated = seat_rotation_flags(previous, seat_of)
+        not_rotated = (room_of >= 0) & checked & ~rotated
+        report("seat_rotation", [
+            _finding("seat_rotation", roster.ids[r], room_of[r] + 1, seat_of[r],
+                     detail=f"이전 좌석 {int(previous[r])} → {int(seat_of[r])}")
+            for r in np.flatnonzero(not_rotated).tolist()
+        ])
+
+    errors = sum(n for rule, n in counts.items() if RULES[rule] == ERROR)
+    warnings = sum(n for rule, n in counts.items() if RULES[rule] == WARNING)
+    return {
+        "ok": errors == 0,
+        "counts": counts,
+        "errors": errors,
+        "warnings": warnings,
+        "rooms": int(len(matrix)),
+        "students": int(roster.num_students),
+        "placed": int(len(placed_ids)),
+        "findings": [item for rule in RULES for item in findings[rule]],
+    }
+
+
+def format_findings(result, limit=20):
+    """검증 결과 요약 문자열 (명령줄 출력용)"""
+    lines = [
+        f"검증 {'통과' if result['ok'] else '실패'}: 방 {result['rooms']}개, 배정 좌석 {result['placed']}개 / 학생 {result['students']}명, "
+        f"error {result['errors']}건, warning {result['warnings']}건"
+    ]
+    for rule, count in result["counts"].items():
+        if count:
+            lines.append(f"  {RULES[rule]:7s} {rule}: {count}건")
+    for finding in result["findings"][:limit]:
+        where = f"{finding['room']}번방 좌석{finding['seat']}" if "room" in finding else "미배정"
+        other = f" ↔ {finding['other_id']}" if "other_id" in finding else ""
+        detail = f" ({finding['detail']})" if "detail" in finding else ""
+        lines.append(f"    - [{finding['rule']}] {finding['student_id']}{other} @ {where}{detail}")
+    if len(result["findings"]) > limit:
+        lines.append(f"    ... 외 {len(result['findings']) - limit}건")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="배정 결과 검증 (명단 + 결과 파일)",
+        epilog="종료 코드: 0 위반 없음, 1 입력 오류, 2 error 위반 있음"
+    )
+    parser.add_argument("roster", help="학생 명단 파일 (xlsx, csv, parquet)")
+    parser.add_argument("result", help="배정 결과 파일 (GUI/명령줄 엑셀, csv, jsonl, parquet)")
+    parser.add_argument("--sheet", help="명단 시트 이름 (여러 시트 통합 문서인 경우)")
+    parser.add_argument("--policy", choices=["regular", "third_grade"], default="regular",
+                        help="third_grade면 좌석 교대는 검사하지 않음")
+    parser.add_argument("--blacklist", help="블랙리스트 조합 파일 (CSV/Excel)")
+    parser.add_argument("--avoid-history", type=int, default=0, metavar="K", help="배정 기록의 최근 K학기 룸메이트도 검사")
+    parser.add_argument("--avoid-results", nargs="+", default=[], metavar="FILE", help="지난 결과 파일의 룸메이트도 검사")
+    parser.add_argument("--history", metavar="DB", help="배정 기록 파일 (기본: 기본 기록 파일)")
+    parser.add_argument("--semester", help="이 학기 이전 기록만 사용 (기본: 이번 학기)")
+    parser.add_argument("--json", dest="json_path", help="발견 사항을 저장할 JSON 파일 (-이면 표준 출력)")
+    parser.add_argument("--max-findings", type=int, default=None, help="규칙별 최대 발견 사항 수")
+    args = parser.parse_args(argv)
+
+    try:
+        from history_store import previous_roommate_pairs, read_result_matrix
+        from roster import load_workbook
+
+        rosters = load_workbook(args.roster)
+        if args.sheet:
+            if args.sheet not in rosters:
+                raise ValueError(f"명단에 없는 시트입니다: {args.sheet}")
+            roster = rosters[args.sheet]
+        elif len(rosters) == 1:
+            roster = next(iter(rosters.values()))
+        else:
+            raise ValueError(f"시트가 여러 개입니다. --sheet로 지정해주세요: {', '.join(rosters)}")
+
+        matrix = read_result_matrix(args.result)
+
+        blacklist_pairs = None
+        if args.blacklist:
+            from blacklist_io import read_blacklist_file
+            blacklist_pairs = read_blacklist_file(args.blacklist)
+
+        history_pairs = None
+        if args.avoid_history or args.avoid_results:
+            history_pairs = previous_roommate_pairs(args.avoid_history, args.avoid_results, args.history, args.semester)
+
+        result = verify_assignment(
+            roster, matrix, blacklist_pairs, history_pairs,
+            seat_rotation=args.policy == "regular", max_findings=args.max_findings
+        )
+    except (ValueError, OSError, ImportError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if args.json_path == "-":
+        json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print(format_findings(result))
+        if args.json_path:
+            with open(args.json_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+
+    return EXIT_OK if result["ok"] else EXIT_VIOLATIONS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
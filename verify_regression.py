@@ -0,0 +1,92 @@
+"""
+배정 결과 검증 회귀 시험 (엔진 결과가 검증기를 통과하는지 확인)
+
+조건이 빽빽한 명단(현재 룸메이트·배려 학생 비율이 높은 명단)을 create_test_data.generate_roster로 만들어
+두 정책 모두 cli.py --verify와 같은 방식으로 배정·검증하고, 모든 실행이 종료 코드 0이어야 통과입니다.
+엔진의 금지 관계와 verifier.py의 규칙이 어긋나면 (예: 한 방향으로만 막는 관계) 여기서 잡힙니다.
+
+사용 예:
+    python verify_regression.py                          # 기본: 4000명, 정책 2개 x (조건만 / 유사도)
+    python verify_regression.py -n 8000 --seeds 0,1,2 --avoid-rate 0.7
+
+종료 코드: 0 모든 실행이 검증 통과, 1 실행 오류, 2 검증 실패 또는 배정 실패가 있는 실행 있음
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import cli
+from allocation_compare import ENGINE_MODULES
+from create_test_data import generate_roster, write_roster
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_FAILED = 2
+
+DEFAULT_STUDENTS = 4000
+DEFAULT_AVOID_COLUMNS = 4
+DEFAULT_AVOID_RATE = 0.5
+DEFAULT_ROOMMATE_RATE = 0.9
+
+# 유사도 배정 실행에 사용할 factor ("" = 조건만 보고 채우기)
+FACTOR_SPECS = ["", "factor1, factor2, factor3"]
+
+
+def run_case(roster_path, policy, factors, seed, output_dir):
+    """명단 하나를 cli.py --verify로 배정·검증하고 종료 코드 반환"""
+    argv = [roster_path, "--policy", policy, "--seed", str(seed), "--verify", "-q", "-o", output_dir]
+    if factors:
+        argv += ["--factors", factors]
+    return cli.main(argv)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="배정 결과 검증 회귀 시험",
+        epilog="종료 코드: 0 모두 통과, 1 실행 오류, 2 검증 실패 있음"
+    )
+    parser.add_argument("-n", "--students", type=int, default=DEFAULT_STUDENTS,
+                        help=f"학생 수 (기본 {DEFAULT_STUDENTS})")
+    parser.add_argument("--seeds", default="0", help="명단·배정 시드 (쉼표 구분, 기본 0)")
+    parser.add_argument("--avoid-columns", type=int, default=DEFAULT_AVOID_COLUMNS,
+                        help=f"배려 학생 컬럼 수 (기본 {DEFAULT_AVOID_COLUMNS})")
+    parser.add_argument("--avoid-rate", type=float, default=DEFAULT_AVOID_RATE,
+                        help=f"배려 학생 컬럼별 값이 있는 비율 (기본 {DEFAULT_AVOID_RATE})")
+    parser.add_argument("--roommate-rate", type=float, default=DEFAULT_ROOMMATE_RATE,
+                        help=f"지난 학기 방이 있는 학생 비율 (기본 {DEFAULT_ROOMMATE_RATE})")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="verify_regression_")
+    failures = []
+    try:
+        seeds = [int(value) for value in args.seeds.split(",") if value.strip()]
+        for seed in seeds:
+            roster_path = os.path.join(work_dir, f"dense_{seed}.csv")
+            write_roster(generate_roster(
+                args.students, seed=seed, num_factors=3, avoid_columns=args.avoid_columns,
+                avoid_rate=args.avoid_rate, roommate_rate=args.roommate_rate
+            ), roster_path)
+
+            for policy in sorted(ENGINE_MODULES):
+                for factors in FACTOR_SPECS:
+                    exit_code = run_case(roster_path, policy, factors, seed, os.path.join(work_dir, "out"))
+                    label = f"시드 {seed}, {policy}, factor {factors or '없음'}"
+                    print(f"{label}: {'통과' if exit_code == cli.EXIT_OK else f'실패 (종료 코드 {exit_code})'}")
+                    if exit_code != cli.EXIT_OK:
+                        failures.append(label)
+    except (ValueError, OSError, ImportError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if failures:
+        print(f"검증 실패 {len(failures)}건: {'; '.join(failures)}", file=sys.stderr)
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())